@@ -0,0 +1,133 @@
+"""
+Before/after benchmark for the HTML parse paths of the HTTP scrapers.
+
+"before" is the original html.parser + per-field find() extraction, kept here as a reference;
+"after" is each scraper's current parse function (lxml + SoupStrainer + single-pass fields).
+Both must produce identical output on every page, otherwise the benchmark fails.
+
+Pages come from recorded HTTP fixtures (SCRAPER_TRANSPORT=record) when there are any,
+otherwise from the synthetic samples in benchmarks/samples/.
+
+    python -m benchmarks.parse_paths [--repeat 20]
+"""
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+from bs4 import BeautifulSoup
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from fetch import fast_parse, replay
+from fetch.linkedin import parse_job_cards as linkedin_parse
+from fetch.unjobs import parse_listing_page as unjobs_parse
+from fetch.ziprecruiter import parse_job_cards as ziprecruiter_parse
+
+SAMPLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "samples")
+
+# ✅ Reference parsers: the extraction code as it was before the fast path
+
+def linkedin_before(html):
+    soup = BeautifulSoup(html, "html.parser")
+    cards = []
+    for job_card in soup.find_all("div", class_="base-search-card"):
+        href_tag = job_card.find("a", class_="base-card__full-link")
+        title_tag = job_card.find("span", class_="sr-only")
+        company_tag = job_card.find("h4", class_="base-search-card__subtitle")
+        location_tag = job_card.find("span", class_="job-search-card__location")
+        salary_tag = job_card.find("span", class_="job-search-card__salary-info")
+        date_tag = job_card.find("time", class_="job-search-card__listdate")
+        cards.append({
+            "url": href_tag["href"].split("?")[0] if href_tag and "href" in href_tag.attrs else None,
+            "title": title_tag.get_text(strip=True) if title_tag else "N/A",
+            "company": company_tag.get_text(strip=True) if company_tag else "N/A",
+            "location": location_tag.get_text(strip=True) if location_tag else "N/A",
+            "salary": salary_tag.get_text(strip=True) if salary_tag else "Not Provided",
+            "date": date_tag["datetime"] if date_tag and date_tag.has_attr("datetime") else None,
+            "date_text": date_tag.get_text(strip=True).lower() if date_tag else None,
+        })
+    return cards
+
+def unjobs_before(html):
+    soup = BeautifulSoup(html, "html.parser")
+    absolute = lambda url: url if url.startswith("https://") else "https://unjobs.org" + url
+    listings = [{"title": a.text.strip(), "url": absolute(a["href"])} for a in soup.select("a.jtitle")]
+    next_button = soup.select_one("a.ts")
+    return {"listings": listings, "next": absolute(next_button["href"]) if next_button else None}
+
+def ziprecruiter_before(html):
+    soup = BeautifulSoup(html, "html.parser")
+    cards = []
+    for job_card in soup.find_all("article", class_="job_result"):
+        title_tag = job_card.find("a", class_="job_title")
+        company_tag = job_card.find("div", class_="company_name")
+        location_tag = job_card.find("div", class_="location")
+        salary_tag = job_card.find("div", class_="salary")
+        cards.append({
+            "title": title_tag.get_text(strip=True) if title_tag else "N/A",
+            "url": title_tag["href"] if title_tag else "#",
+            "company": company_tag.get_text(strip=True) if company_tag else "N/A",
+            "location": location_tag.get_text(strip=True) if location_tag else "N/A",
+            "salary": salary_tag.get_text(strip=True) if salary_tag else "Not Provided",
+        })
+    return cards
+
+# source → (fixture host, before, after)
+SOURCES = {
+    "linkedin": ("www.linkedin.com", linkedin_before, linkedin_parse),
+    "unjobs": ("unjobs.org", unjobs_before, unjobs_parse),
+    "ziprecruiter": ("www.ziprecruiter.com", ziprecruiter_before, ziprecruiter_parse),
+}
+
+def load_pages(source, host):
+    """Recorded HTTP bodies for `host`, falling back to the bundled sample page."""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(replay.FIXTURE_DIR, host, "http-*.json"))):
+        with open(path, encoding="utf-8") as f:
+            fixture = json.load(f)
+        if fixture.get("status") == 200:
+            pages.append(fixture["body"])
+    if pages:
+        return pages, "recorded"
+
+    with open(os.path.join(SAMPLES_DIR, f"{source}.html"), encoding="utf-8") as f:
+        return [f.read()], "sample"
+
+def best_time(parser, pages, repeat):
+    """Fastest of `repeat` runs over all pages, in milliseconds per page."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for html in pages:
+            parser(html)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000 / len(pages)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"⚙️ Fast path parser: {fast_parse.PARSER}")
+    failed = False
+
+    for source, (host, before, after) in SOURCES.items():
+        pages, origin = load_pages(source, host)
+
+        if any(before(html) != after(html) for html in pages):
+            print(f"❌ {source}: fast path output differs from the reference parser")
+            failed = True
+            continue
+
+        before_ms = best_time(before, pages, args.repeat)
+        after_ms = best_time(after, pages, args.repeat)
+        print(
+            f"📊 {source:<13} {len(pages)} {origin} page(s): "
+            f"{before_ms:7.2f} ms → {after_ms:6.2f} ms per page ({before_ms / after_ms:.1f}x)"
+        )
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
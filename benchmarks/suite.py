@@ -0,0 +1,199 @@
+"""
+Parse + filter benchmark for every scraper, checked against a stored baseline.
+
+Each source's saved pages go through the same card parsing and filtering the scraper runs
+(parse_job_cards / filter_job_cards and friends), with no network, browser or storage.
+Reports jobs/sec (cards through parse + filter) and peak traced memory per source.
+
+Pages come from recorded fixtures (SCRAPER_TRANSPORT=record) when there are any,
+otherwise from the samples in benchmarks/samples/.
+
+    python -m benchmarks.suite                     # report, compared with benchmarks/baseline.json
+    python -m benchmarks.suite --check             # exit 1 on a regression beyond --tolerance
+    python -m benchmarks.suite --update-baseline   # store this machine's numbers as the baseline
+"""
+import gc
+import os
+import sys
+import glob
+import json
+import time
+import platform
+import argparse
+import tracemalloc
+from datetime import datetime
+from contextlib import redirect_stdout
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import metrics
+from fetch import fast_parse, replay, linkedin, unjobs, ziprecruiter, ifyoucould, workable
+
+SAMPLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "samples")
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# ✅ Bump when what's measured changes; older baselines are then ignored
+FORMAT_VERSION = 1
+
+# ✅ Date filters run as of this day (when the samples and recordings were made), not the calendar,
+#    so the cards and jobs counted can only change when the parsing or filtering does
+TODAY = datetime(2026, 10, 18)
+
+def _linkedin_filter(cards):
+    state = linkedin._new_search_state(today=TODAY)
+    linkedin._collect_page_jobs(cards, "benchmark", state, max_jobs=len(cards), max_per_title=len(cards))
+    return state["jobs"]
+
+# source → (fixture host, fixture kind, parse, filter, cards in a parse result)
+SOURCES = {
+    "linkedin": ("www.linkedin.com", "http", linkedin.parse_job_cards, _linkedin_filter, len),
+    "unjobs": ("unjobs.org", "http", unjobs.parse_listing_page,
+               lambda page: unjobs.filter_listings(page["listings"]), lambda page: len(page["listings"])),
+    "ziprecruiter": ("www.ziprecruiter.com", "http", ziprecruiter.parse_job_cards,
+                     lambda cards: ziprecruiter.filter_job_cards(cards, max_jobs=len(cards)), len),
+    "ifyoucould": ("www.ifyoucouldjobs.com", "page", ifyoucould.parse_job_cards, ifyoucould.filter_job_cards, len),
+    "workable": ("jobs.workable.com", "page", workable.parse_job_cards,
+                 lambda cards: workable.filter_job_cards(cards, "benchmark"), len),
+}
+
+def load_pages(source, host, kind):
+    """Recorded page bodies for `host`, falling back to the bundled sample page."""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(replay.FIXTURE_DIR, host, f"{kind}-*.json"))):
+        with open(path, encoding="utf-8") as f:
+            fixture = json.load(f)
+        if fixture.get("status", 200) == 200:
+            pages.append(fixture["body"])
+    if pages:
+        return pages, "recorded"
+
+    with open(os.path.join(SAMPLES_DIR, f"{source}.html"), encoding="utf-8") as f:
+        return [f.read()], "sample"
+
+def calibrate(repeat=5):
+    """Milliseconds for a fixed pure-Python workload, so baselines from another machine can be scaled."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        words = {}
+        for i in range(200_000):
+            key = f"job-{i % 997}"
+            words[key] = words.get(key, 0) + len(key.upper())
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def run_once(parse, keep, count, pages):
+    """One pass of parse + filter over every page. Returns (cards, jobs kept)."""
+    cards = jobs = 0
+    for html in pages:
+        parsed = parse(html)
+        cards += count(parsed)
+        jobs += len(keep(parsed))
+    return cards, jobs
+
+def measure(source, repeat):
+    host, kind, parse, keep, count = SOURCES[source]
+    pages, origin = load_pages(source, host, kind)
+
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):  # ✅ Filters print per job; keep them quiet
+        cards, jobs = run_once(parse, keep, count, pages)  # ✅ Warm-up (imports, regex and selector caches)
+
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run_once(parse, keep, count, pages)
+            best = min(best, time.perf_counter() - start)
+
+        gc.collect()  # ✅ Otherwise the peak depends on when the last pass's garbage happens to be collected
+        tracemalloc.start()
+        run_once(parse, keep, count, pages)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "origin": origin,
+        "pages": len(pages),
+        "cards": cards,
+        "jobs": jobs,
+        "ms_per_page": round(best * 1000 / len(pages), 3),
+        "jobs_per_sec": round(cards / best, 1),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+def load_baseline(path=BASELINE_PATH):
+    try:
+        with open(path, encoding="utf-8") as f:
+            baseline = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return baseline if baseline.get("version") == FORMAT_VERSION else None
+
+def compare(source, result, baseline, calibration_ms, tolerance):
+    """(message, regressed) for one source against the baseline."""
+    expected = (baseline or {}).get("sources", {}).get(source)
+    if not expected:
+        return "no baseline", False
+    if (expected["origin"], expected["pages"]) != (result["origin"], result["pages"]):
+        return f"baseline is from {expected['pages']} {expected['origin']} page(s), not comparable", False
+    if baseline.get("parser") != fast_parse.PARSER:
+        return f"baseline used the {baseline.get('parser')} parser, not comparable", False
+    if (expected["cards"], expected["jobs"]) != (result["cards"], result["jobs"]):
+        # ✅ Same pages, different output: parsing or filtering changed, so the timings don't compare either
+        return (f"baseline kept {expected['jobs']} of {expected['cards']} cards, not comparable "
+                f"(update the baseline if the change is intended)"), True
+
+    # ✅ Scale the baseline throughput by how fast this machine is relative to the baseline's
+    speed = baseline["calibration_ms"] / calibration_ms
+    expected_jps = expected["jobs_per_sec"] * speed
+    throughput = result["jobs_per_sec"] / expected_jps - 1
+    memory = result["peak_kb"] / expected["peak_kb"] - 1 if expected["peak_kb"] else 0.0
+
+    regressed = throughput < -tolerance or memory > tolerance
+    return f"{throughput:+.0%} jobs/sec, {memory:+.0%} peak memory vs baseline", regressed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--tolerance", type=float, default=0.3, help="allowed slowdown / memory growth (0.3 = 30%%)")
+    parser.add_argument("--check", action="store_true", help="exit 1 if any source regressed")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--sources", nargs="*", default=list(SOURCES), choices=list(SOURCES))
+    args = parser.parse_args()
+
+    metrics.ENABLED = False  # ✅ Measure the parsers, not the counters
+    calibration_ms = calibrate()
+    baseline = load_baseline()
+    print(f"⚙️ Parser: {fast_parse.PARSER}, calibration {calibration_ms:.1f} ms "
+          f"(baseline {baseline['calibration_ms']:.1f} ms)" if baseline else
+          f"⚙️ Parser: {fast_parse.PARSER}, calibration {calibration_ms:.1f} ms (no baseline)")
+
+    results = {}
+    regressed = []
+    for source in args.sources:
+        result = results[source] = measure(source, args.repeat)
+        message, worse = compare(source, result, baseline, calibration_ms, args.tolerance)
+        print(
+            f"{'❌' if worse else '📊'} {source:<13} {result['pages']} {result['origin']} page(s), "
+            f"{result['cards']} cards → {result['jobs']} jobs: {result['jobs_per_sec']:>9,.0f} jobs/sec, "
+            f"{result['ms_per_page']:7.2f} ms/page, peak {result['peak_kb']:,.0f} KB ({message})"
+        )
+        if worse:
+            regressed.append(source)
+
+    if args.update_baseline:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": FORMAT_VERSION,
+                "parser": fast_parse.PARSER,
+                "python": platform.python_version(),
+                "calibration_ms": round(calibration_ms, 2),
+                "sources": results,
+            }, f, indent=2)
+            f.write("\n")
+        print(f"💾 Baseline written to {BASELINE_PATH}")
+
+    if regressed:
+        print(f"❌ Regressed beyond {args.tolerance:.0%}: {', '.join(regressed)}")
+    sys.exit(1 if args.check and regressed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -1,44 +1,43 @@
 import os
 import json
 from dotenv import load_dotenv
-import firebase_admin
-from firebase_admin import credentials
 
 # ✅ Load environment variables from .env file (for local development)
 load_dotenv()
 
+# ✅ Storage backend: "firestore" (default) or "sqlite" (local file, no Firebase needed)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "firestore").lower()
+SQLITE_PATH = os.getenv("SQLITE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "jobs.sqlite3"))
+
+# ✅ Credentials are only checked when something needs them (see firebase_credentials_file / require_email),
+#    so scraping, dry runs and the SQLite backend start without any secrets set
+
 # ✅ Handle Firebase Credentials (from GitHub Secrets OR .env file)
-firebase_json = os.getenv("FIREBASE_CREDENTIALS_JSON")
+def firebase_credentials_file():
+    """Path to the Firebase service-account file, written from FIREBASE_CREDENTIALS_JSON if that's set."""
+    firebase_json = os.getenv("FIREBASE_CREDENTIALS_JSON")
 
-if firebase_json:
-    try:
-        # ✅ Convert JSON string back to dictionary
-        firebase_credentials = json.loads(firebase_json)
+    if firebase_json:
+        try:
+            # ✅ Convert JSON string back to dictionary
+            firebase_credentials = json.loads(firebase_json)
+        except json.JSONDecodeError:
+            raise ValueError("❌ Invalid format in FIREBASE_CREDENTIALS_JSON. Check your GitHub Secrets.")
 
         # ✅ Write the credentials to a temporary file
         firebase_credentials_path = "/tmp/firebase_credentials.json"
         with open(firebase_credentials_path, "w") as f:
             json.dump(firebase_credentials, f)
+        return firebase_credentials_path
 
-    except json.JSONDecodeError:
-        raise ValueError("❌ Invalid format in FIREBASE_CREDENTIALS_JSON. Check your GitHub Secrets.")
-
-else:
     firebase_credentials_path = os.getenv("FIREBASE_CREDENTIALS_PATH")
-
-if not firebase_credentials_path:
-    raise ValueError("❌ FIREBASE_CREDENTIALS_PATH is missing! Please set it in your .env file or GitHub Secrets.")
-
-# ✅ Initialize Firebase
-if not firebase_admin._apps:
-    cred = credentials.Certificate(firebase_credentials_path)
-    firebase_admin.initialize_app(cred)
+    if not firebase_credentials_path:
+        raise ValueError("❌ FIREBASE_CREDENTIALS_PATH is missing! Please set it in your .env file or GitHub Secrets.")
+    return firebase_credentials_path
 
 # ✅ Load Email Credentials
 EMAIL_ADDRESS = os.getenv("EMAIL_ADDRESS")
 EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")
-if not EMAIL_ADDRESS or not EMAIL_PASSWORD:
-    raise ValueError("❌ EMAIL_ADDRESS or EMAIL_PASSWORD is missing! Check your .env file or GitHub Secrets.")
 
 # ✅ SMTP details
 SMTP_SERVER = "smtp.gmail.com"
@@ -61,7 +60,15 @@ JOB_KEYWORDS = [
 # ✅ Default Location
 LOCATION = os.getenv("LOCATION", "London")
 
+# ✅ Local state (HTTP cache etc.) – persisted between runs by the workflow cache
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"))
+
 # ✅ Recipient Email
 RECIPIENT_EMAIL = os.getenv("RECIPIENT_EMAIL")
-if not RECIPIENT_EMAIL:
-    raise ValueError("❌ RECIPIENT_EMAIL is missing! Make sure it's set in your .env file or GitHub Secrets.")
\ No newline at end of file
+
+def require_email():
+    """Raise if the SMTP credentials or recipient are missing (called before sending, not at import)."""
+    if not EMAIL_ADDRESS or not EMAIL_PASSWORD:
+        raise ValueError("❌ EMAIL_ADDRESS or EMAIL_PASSWORD is missing! Check your .env file or GitHub Secrets.")
+    if not RECIPIENT_EMAIL:
+        raise ValueError("❌ RECIPIENT_EMAIL is missing! Make sure it's set in your .env file or GitHub Secrets.")
\ No newline at end of file
@@ -0,0 +1,121 @@
+import os
+import sys
+import signal
+import threading
+import schedule
+import config
+import metrics
+from fetch import http_client
+from fetch.run_scrapers import component_stats, selected_sources
+
+# ✅ Long-running mode (python main.py --daemon): each source on its own schedule, in one warm process.
+#    The Firestore client, HTTP connection pools, chromedriver and idle Chrome sessions carry over
+#    between cycles instead of being rebuilt by a cold start every time.
+
+# ✅ Minutes between runs per source (override one with SCHEDULE_<SOURCE>, e.g. SCHEDULE_LINKEDIN=30)
+INTERVALS = {
+    "linkedin": 60,
+    "unjobs": 360,
+    "workable": 360,
+    "ziprecruiter": 360,
+    "ifyoucould": 1440,
+    "glassdoor": 1440,
+}
+# ✅ Each wait is drawn from interval ± JITTER, so requests don't land on the same minute every time
+JITTER = float(os.getenv("SCHEDULE_JITTER", 0.1))
+# ✅ Send the digest after every cycle (DAEMON_EMAIL=0 to leave that to email_service/send_email.py)
+EMAIL = os.getenv("DAEMON_EMAIL", "1") != "0"
+# ✅ How often the scheduler loop wakes to check for due sources and shutdown requests
+TICK = 1.0
+
+_stop = threading.Event()
+_lock = threading.Lock()
+_due = set()  # Sources whose timer has fired, waiting for the next cycle
+_running = set()  # Sources in the cycle that's running now
+
+def interval(source):
+    """Minutes between runs of `source`."""
+    return float(os.getenv(f"SCHEDULE_{source.upper()}", INTERVALS.get(source, 360)))
+
+def _mark_due(source):
+    """Scheduler job: queue `source` for the next cycle, unless it's already queued or still running."""
+    with _lock:
+        if source in _running:
+            print(f"⏭️ {source} is still running from the last cycle. Skipping this run.")
+            metrics.inc("daemon_skipped_total", source=source)
+        else:
+            _due.add(source)
+
+def _cycle(job_cycle, sources, email):
+    """One job cycle for `sources` (worker thread), then email and a metrics report."""
+    print(f"\n⏰ Daemon cycle: {', '.join(sources)}")
+    try:
+        job_cycle(sources=sources, keep_warm=True)
+        if email:
+            from email_service.send_email import send_email
+            with metrics.timer("stage_seconds", stage="email"):
+                send_email()
+        metrics.inc("daemon_cycles_total")
+    except Exception as e:
+        print(f"❌ Daemon cycle failed: {e}")
+        metrics.inc("daemon_cycle_errors_total")
+    finally:
+        with _lock:
+            _running.clear()
+        metrics.write("daemon", extra={"sources": sources, "components": component_stats()})
+
+def _request_stop(signum, frame):
+    print(f"\n🛑 {signal.Signals(signum).name} received. Finishing the current cycle, then exiting "
+          f"(send it again to stop now).")
+    _stop.set()
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+def _shutdown(worker):
+    """Wait for the running cycle, then release the resources kept warm between cycles."""
+    if worker and worker.is_alive():
+        print("⏳ Waiting for the running cycle to finish...")
+        worker.join()
+
+    browser_pool = sys.modules.get("fetch.browser_pool")
+    if browser_pool:
+        browser_pool.shutdown()
+    http_client.close()
+    print("👋 Daemon stopped.")
+
+def run(job_cycle, sources=None, email=EMAIL):
+    """
+    Run job_cycle(sources=[...], keep_warm=True) for every source once, then for each source again
+    on its own interval (with jitter) until SIGINT / SIGTERM. Cycles never overlap: sources that come
+    due during a cycle run in the next one, and a source whose timer fires while it's still running is skipped.
+    """
+    sources = selected_sources(sources)
+    if email:
+        config.require_email()  # ✅ Fail at start-up, not after the first cycle's scraping
+
+    scheduler = schedule.Scheduler()
+    for source in sources:
+        seconds = interval(source) * 60
+        low, high = int(seconds * (1 - JITTER)), max(1, int(seconds * (1 + JITTER)))
+        scheduler.every(max(1, low)).to(high).seconds.do(_mark_due, source)
+        print(f"🗓️ {source}: every {interval(source):g} min (± {JITTER:.0%})")
+
+    signal.signal(signal.SIGINT, _request_stop)
+    signal.signal(signal.SIGTERM, _request_stop)
+
+    _due.update(sources)  # ✅ Everything runs once at start-up
+    worker = None
+    while not _stop.is_set():
+        scheduler.run_pending()
+        with _lock:
+            start = bool(_due) and not (worker and worker.is_alive())
+            if start:
+                batch = [source for source in sources if source in _due]
+                _due.clear()
+                _running.update(batch)
+        if start:
+            worker = threading.Thread(target=_cycle, args=(job_cycle, batch, email), name="daemon-cycle")
+            worker.start()
+        _stop.wait(TICK)
+
+    _shutdown(worker)
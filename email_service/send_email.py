@@ -1,45 +1,68 @@
 import os
+import sys
+import time
 import hashlib
 import smtplib
-import firebase_admin
-from firebase_admin import credentials, firestore
+from datetime import datetime
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from dotenv import load_dotenv
 from collections import defaultdict
 
+# ✅ Ensure script finds `config.py` and `store/` when run as email_service/send_email.py
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from store.backend import get_backend
+import config
+import metrics
+
 # ✅ Load environment variables
 load_dotenv()
 
-# ✅ Get Firebase credentials path
-FIREBASE_CREDENTIALS_PATH = os.getenv("FIREBASE_CREDENTIALS_PATH")
-
-if not FIREBASE_CREDENTIALS_PATH:
-    raise ValueError("❌ Missing FIREBASE_CREDENTIALS_PATH in environment variables. Please set it in the .env file.")
-
-# ✅ Prevent multiple Firebase initializations
-if not firebase_admin._apps:
-    cred = credentials.Certificate(FIREBASE_CREDENTIALS_PATH)
-    firebase_admin.initialize_app(cred)
-
-# ✅ Initialize Firestore
-db = firestore.client()
-
 def generate_document_id(url):
     """Generate a Firestore-safe document ID from a job URL using hashing."""
     return hashlib.md5(url.encode()).hexdigest()
 
 def get_unsent_jobs():
-    """Retrieve unsent jobs from Firestore."""
-    jobs_collection = db.collection("jobs_compiled").stream()
-    unsent_jobs = [job.to_dict() for job in jobs_collection if not job.to_dict().get("sent", False)]
-    return unsent_jobs
+    """Retrieve unsent jobs from the configured backend, oldest first (each with its document "id")."""
+    backend = get_backend()
+    with metrics.timer("storage_seconds", backend=backend.name, op="unsent_jobs"):
+        jobs = backend.unsent_jobs()
+    metrics.inc("storage_reads_total", len(jobs), backend=backend.name, op="unsent_jobs")
+    return jobs
+
+def backfill_sent_flag():
+    """
+    One-off migration: give documents stored before `sent` was always written an explicit
+    `sent: False`, so the server-side unsent query can see them. Safe to run more than once.
+    """
+    updated = get_backend().backfill_sent_flag()
+    print(f"✅ Backfilled 'sent' on {updated} jobs.")
 
-def mark_jobs_as_sent(jobs):
-    """Update Firestore to mark jobs as sent."""
-    for job in jobs:
-        doc_id = generate_document_id(job["url"])
-        db.collection("jobs_compiled").document(doc_id).update({"sent": True})  # ✅ Mark as sent
+# ✅ Outbox: one record per digest email, so a crash can never cause the same jobs to be emailed twice
+
+def create_digest(jobs):
+    """
+    Write the outbox record for a digest before it is emailed.
+    The ID is derived from the job IDs, so the same set of jobs always maps to the same digest.
+    """
+    job_ids = sorted(job.get("id") or generate_document_id(job["url"]) for job in jobs)
+    digest_id = hashlib.md5("\n".join(job_ids).encode()).hexdigest()
+    get_backend().create_digest(digest_id, job_ids, datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"))
+    return digest_id
+
+def mark_jobs_as_sent(digest_id):
+    """Flip `sent` on every job in a digest (batched, resumable), then close the digest."""
+    backend = get_backend()
+    with metrics.timer("storage_seconds", backend=backend.name, op="mark_sent"):
+        count = backend.mark_sent(digest_id)
+    metrics.inc("storage_writes_total", count, backend=backend.name, op="mark_sent")
+    print(f"✅ Marked {count} jobs as sent (digest {digest_id[:8]}).")
+
+def finish_pending_digests():
+    """Complete the updates of digests that were emailed (or may have been) by an interrupted run."""
+    for digest_id in get_backend().pending_digests():
+        print(f"🔁 Finishing interrupted digest {digest_id[:8]} without resending it...")
+        mark_jobs_as_sent(digest_id)
 
 def get_source_platform(url):
     """Extracts job platform based on the URL."""
@@ -58,11 +81,17 @@ def get_source_platform(url):
 
 def send_email():
     """Send job listings via Gmail SMTP with formatted output, grouped by platform and company."""
+    # ✅ Jobs from an interrupted run's digest were already emailed: mark them before querying
+    finish_pending_digests()
+
     jobs = get_unsent_jobs()
     if not jobs:
         print("❌ No new jobs found. Skipping email.")
         return
 
+    # ✅ Only needed once there's something to send; raises before a digest is recorded
+    config.require_email()
+
     jobs_by_platform = defaultdict(lambda: defaultdict(list))
     for job in jobs:
         platform = get_source_platform(job["url"])
@@ -98,16 +127,37 @@ def send_email():
     msg["Subject"] = subject
     msg.attach(MIMEText(body, "html"))
 
+    # ✅ Outbox first: record → send → flip, so a crash after sending can't lead to a resend
+    digest_id = create_digest(jobs)
+
+    smtp_started = time.perf_counter()
     try:
         server = smtplib.SMTP(os.getenv("SMTP_SERVER"), int(os.getenv("SMTP_PORT")))
         server.starttls()
         server.login(os.getenv("EMAIL_ADDRESS"), os.getenv("EMAIL_PASSWORD"))
         server.sendmail(os.getenv("EMAIL_ADDRESS"), os.getenv("RECIPIENT_EMAIL"), msg.as_string())
-        server.quit()
         print("✅ Email sent successfully!")
-        mark_jobs_as_sent(jobs)
     except Exception as e:
         print(f"❌ Error sending email: {e}")
+        metrics.observe("smtp_seconds", time.perf_counter() - smtp_started, outcome="failed")
+        get_backend().discard_digest(digest_id)  # ✅ Not sent: jobs go in the next digest
+        return
+
+    try:
+        server.quit()
+    except smtplib.SMTPException:
+        pass  # ✅ Already delivered; a failed goodbye mustn't cause a resend
+    metrics.observe("smtp_seconds", time.perf_counter() - smtp_started, outcome="sent")
+    metrics.inc("emails_sent_total")
+    metrics.inc("jobs_emailed_total", len(jobs))
+
+    get_backend().mark_digest_emailed(digest_id, datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"))
+    mark_jobs_as_sent(digest_id)
 
 if __name__ == "__main__":
-    send_email()
\ No newline at end of file
+    if "--backfill" in sys.argv:
+        backfill_sent_flag()
+    else:
+        with metrics.timer("stage_seconds", stage="email"):
+            send_email()
+        metrics.write("email")
\ No newline at end of file
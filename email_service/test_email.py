@@ -9,6 +9,7 @@ import config
 def send_test_email():
     subject = "Test Email from Job Finder Bot"
     body = "Hello! This is a test email to check if the job bot email system is working."
+    config.require_email()
 
     msg = MIMEText(body)
     msg["Subject"] = subject
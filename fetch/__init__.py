@@ -1,11 +1,45 @@
-from .glassdoor import *
-from .ifyoucould import *
-from .linkedin import *
-from .unjobs import *
-from .workable import *
-from .ziprecruiter import *
-from .run_scrapers import run_scrapers  # ✅ Import run_scrapers here
+import importlib
 
-JOB_SOURCES = ["glassdoor", "ifyoucould", "linkedin", "unjobs", "workable", "ziprecruiter"]
+# ✅ Every source: name → (module, batch scraper, streaming generator or None).
+#    Nothing is imported here: a scraper's module (and Selenium, for browser sources) loads when it's first used.
+REGISTRY = {
+    "glassdoor": ("glassdoor", "fetch_glassdoor_jobs", None),
+    "ifyoucould": ("ifyoucould", "fetch_ifyoucould_jobs", "iter_ifyoucould_jobs"),
+    "linkedin": ("linkedin", "fetch_all_linkedin_jobs_concurrently", "iter_linkedin_jobs"),
+    "unjobs": ("unjobs", "fetch_unjobs", "iter_unjobs"),
+    "workable": ("workable", "fetch_workable_jobs", "iter_workable_jobs"),
+    "ziprecruiter": ("ziprecruiter", "fetch_all_ziprecruiter_jobs", None),
+}
 
-__all__ = ["fetch_glassdoor_jobs", "ifyoucould", "linkedin", "unjobs", "workable", "ziprecruiter", "run_scrapers"]
\ No newline at end of file
+JOB_SOURCES = list(REGISTRY)
+
+# ✅ Sources that drive Chrome; the rest are plain HTTP
+BROWSER_SOURCES = {"glassdoor", "ifyoucould", "workable"}
+HTTP_SOURCES = [source for source in JOB_SOURCES if source not in BROWSER_SOURCES]
+
+def load(source):
+    """Import (once) and return the scraper module for `source`."""
+    if source not in REGISTRY:
+        raise ValueError(f"❌ Unknown job source '{source}'. Choose from: {', '.join(JOB_SOURCES)}")
+    return importlib.import_module(f"{__name__}.{REGISTRY[source][0]}")
+
+def scraper(source):
+    """The source's batch scraper: a no-argument function returning a list of jobs."""
+    return getattr(load(source), REGISTRY[source][1])
+
+def stream(source):
+    """The source's streaming generator; sources without one yield their batch results."""
+    generator = REGISTRY[source][2]
+    if generator:
+        return getattr(load(source), generator)
+    batch = scraper(source)
+    return lambda: iter(batch())
+
+def __getattr__(name):
+    # ✅ Keeps `from fetch import fetch_glassdoor_jobs` working without importing every scraper up front
+    for source, (_, batch, generator) in REGISTRY.items():
+        if name in (batch, generator):
+            return getattr(load(source), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+__all__ = ["JOB_SOURCES", "BROWSER_SOURCES", "HTTP_SOURCES", "load", "scraper", "stream"]
@@ -0,0 +1,161 @@
+import os
+import atexit
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from webdriver_manager.chrome import ChromeDriverManager
+from fetch import deadline, replay
+
+try:
+    import psutil  # ✅ Optional: only needed for the RSS ceiling
+except ImportError:
+    psutil = None
+
+# ✅ Pool limits (tuned for small CI runners)
+POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", 2))  # Chrome instances alive at once
+MAX_PAGES_PER_DRIVER = int(os.getenv("BROWSER_MAX_PAGES", 25))  # Recycle after this many leases
+MAX_RSS_MB = int(os.getenv("BROWSER_MAX_RSS_MB", 1024))  # Recycle once Chrome's process tree passes this
+
+_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(POOL_SIZE)
+_idle = []  # Drivers ready to be leased
+_page_counts = {}  # id(driver) → pages served
+_driver_path = None
+
+def _chrome_options():
+    """Headless Chrome options shared by every scraper."""
+    options = Options()
+    options.add_argument("--headless")  # Run in background
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_argument("--disable-blink-features=CSSPaintAPI")
+    return options
+
+def _chromedriver_path():
+    """Install (or locate) chromedriver once per process."""
+    global _driver_path
+    with _lock:
+        if _driver_path is None:
+            _driver_path = ChromeDriverManager().install()
+        return _driver_path
+
+def _launch():
+    if replay.replaying():
+        driver = replay.ReplayDriver()  # ✅ Serves recorded page sources, no Chrome needed
+        _page_counts[id(driver)] = 0
+        return driver
+
+    print("🚀 Launching Chrome Browser...")
+    driver = webdriver.Chrome(service=Service(_chromedriver_path()), options=_chrome_options())
+    _page_counts[id(driver)] = 0
+    return driver
+
+def _retire(driver):
+    _page_counts.pop(id(driver), None)
+    try:
+        driver.quit()
+    except Exception as e:
+        print(f"⚠️ Error while closing Chrome: {e}")
+
+def rss_mb(driver):
+    """Resident memory of chromedriver plus all Chrome processes under it (None without psutil)."""
+    if psutil is None:
+        return None
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        processes = [root] + root.children(recursive=True)
+        return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+    except (psutil.Error, AttributeError):
+        return None
+
+def _alive(driver):
+    """False if the driver's Chrome session has gone away (e.g. while idle between daemon cycles)."""
+    try:
+        driver.current_url
+        return True
+    except Exception:
+        return False
+
+def _should_recycle(driver):
+    if _page_counts.get(id(driver), 0) >= MAX_PAGES_PER_DRIVER:
+        print(f"♻️ Recycling Chrome after {MAX_PAGES_PER_DRIVER} pages.")
+        return True
+
+    memory = rss_mb(driver)
+    if memory is not None and memory > MAX_RSS_MB:
+        print(f"♻️ Recycling Chrome at {memory:.0f} MB RSS (limit {MAX_RSS_MB} MB).")
+        return True
+
+    return False
+
+@contextmanager
+def lease():
+    """
+    Borrow a Chrome driver for one page. Blocks while POOL_SIZE drivers are busy.
+    The driver is returned to the pool afterwards, or quit if it errored or is due for recycling.
+    """
+    _slots.acquire()
+    with _lock:
+        driver = _idle.pop() if _idle else None
+
+    try:
+        if driver is not None and not _alive(driver):
+            print("♻️ Idle Chrome session is gone. Launching a new one.")
+            _retire(driver)
+            driver = None
+        if driver is None:
+            driver = _launch()
+        yield driver
+    except Exception:
+        if driver is not None:
+            _retire(driver)  # ✅ Don't hand a possibly broken session to the next scraper
+        raise
+    else:
+        _page_counts[id(driver)] = _page_counts.get(id(driver), 0) + 1
+        if _should_recycle(driver):
+            _retire(driver)
+        else:
+            with _lock:
+                _idle.append(driver)
+    finally:
+        _slots.release()
+
+def map_pages(task, items):
+    """
+    Run task(driver, item) for every item across the pool, POOL_SIZE at a time.
+    Yields each task's result in input order as soon as it is ready; items that
+    fail, or start after the caller's deadline, yield an empty list.
+    """
+    def run(item):
+        if deadline.expired():
+            return []
+        try:
+            with lease() as driver:
+                return task(driver, item)
+        except Exception as e:
+            print(f"⚠️ Browser task for '{item}' failed: {e}")
+            return []
+
+    executor = ThreadPoolExecutor(max_workers=POOL_SIZE, thread_name_prefix="browser")
+    try:
+        futures = [executor.submit(deadline.propagate(run), item) for item in items]
+        for future in futures:
+            yield future.result()
+    finally:
+        # ✅ Not `with`: its shutdown(wait=True) would scrape every queued page after the caller stopped early
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def shutdown():
+    """Quit every idle driver (call once the run is over)."""
+    with _lock:
+        drivers = list(_idle)
+        _idle.clear()
+    for driver in drivers:
+        _retire(driver)
+
+atexit.register(shutdown)
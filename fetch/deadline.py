@@ -0,0 +1,58 @@
+import time
+import threading
+
+# ✅ Per-worker state (each source runs in its own thread under run_scrapers)
+_state = threading.local()
+
+def start(seconds, results):
+    """Arm a wall-clock deadline for the current worker and register its results list."""
+    _state.deadline = time.monotonic() + seconds if seconds else None
+    _state.results = results
+
+def clear():
+    """Disarm the deadline for the current worker."""
+    _state.deadline = None
+    _state.results = None
+
+def expired():
+    """Return True once the current worker has run past its deadline."""
+    deadline = getattr(_state, "deadline", None)
+    return deadline is not None and time.monotonic() >= deadline
+
+def remaining():
+    """Seconds left before the deadline (None when no deadline is armed)."""
+    deadline = getattr(_state, "deadline", None)
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+def results_list():
+    """
+    Return the list a scraper should collect its jobs into.
+    Under run_scrapers this is shared with the coordinator so partial results
+    survive a deadline; standalone runs just get a fresh list.
+    """
+    results = getattr(_state, "results", None)
+    return results if results is not None else []
+
+def capped(seconds):
+    """Clamp a delay so it never runs past the current worker's deadline."""
+    left = remaining()
+    return seconds if left is None else min(seconds, left)
+
+def sleep(seconds):
+    """time.sleep() that never sleeps past the current worker's deadline."""
+    time.sleep(capped(seconds))
+
+def propagate(fn):
+    """Wrap fn so it runs under the calling worker's deadline when executed on another thread."""
+    inherited = getattr(_state, "deadline", None)
+
+    def wrapper(*args, **kwargs):
+        _state.deadline = inherited
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _state.deadline = None
+
+    return wrapper
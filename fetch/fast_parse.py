@@ -0,0 +1,51 @@
+from importlib.util import find_spec
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+
+# ✅ lxml's C parser is several times faster than html.parser; BeautifulSoup imports it itself
+PARSER = "lxml" if find_spec("lxml") is not None else "html.parser"
+
+def _has_class(wanted):
+    """
+    SoupStrainer sees the raw class attribute while parsing ("base-card base-search-card ..."),
+    so match on its tokens the way find(class_=...) does on the built tree.
+    """
+    wanted = {wanted} if isinstance(wanted, str) else set(wanted)
+    return lambda value: value is not None and not wanted.isdisjoint(
+        value.split() if isinstance(value, str) else value
+    )
+
+def soup_for(html, *strainer_args, **strainer_kwargs):
+    """
+    Parse only the parts of `html` matching SoupStrainer(*args, **kwargs) (e.g. the job cards),
+    using lxml when it's installed. `class_` may be a class name or a list of them.
+    """
+    if "class_" in strainer_kwargs:
+        strainer_kwargs["class_"] = _has_class(strainer_kwargs["class_"])
+    strainer = SoupStrainer(*strainer_args, **strainer_kwargs) if strainer_args or strainer_kwargs else None
+    return BeautifulSoup(html, PARSER, parse_only=strainer)
+
+def first_matches(root, wanted):
+    """
+    Find several fields in one walk over `root`'s subtree.
+    `wanted` maps field → (tag name, css class); returns field → first matching Tag (or None),
+    exactly what root.find(name, class_=css_class) would return for each field.
+    """
+    by_name = {}
+    for field, (name, css_class) in wanted.items():
+        by_name.setdefault(name, []).append((field, css_class))
+
+    found = dict.fromkeys(wanted)
+    missing = len(wanted)
+
+    for tag in root.descendants:
+        if not isinstance(tag, Tag) or tag.name not in by_name:
+            continue
+        classes = tag.get("class") or ()
+        for field, css_class in by_name[tag.name]:
+            if found[field] is None and css_class in classes:
+                found[field] = tag
+                missing -= 1
+        if not missing:
+            break
+
+    return found
@@ -0,0 +1,36 @@
+import os
+
+try:
+    import numpy  # ✅ rapidfuzz's cdist returns a numpy matrix
+    from rapidfuzz import fuzz, process
+except ImportError:
+    numpy = process = None
+    from Levenshtein import ratio  # ✅ Fallback: same normalised InDel ratio, one pair at a time
+
+WORKERS = int(os.getenv("FUZZY_WORKERS", -1))  # Threads for cdist (-1 = all cores)
+
+def best_keywords(titles, keywords):
+    """
+    Score every title against every keyword (case-insensitive Levenshtein ratio, 0-1)
+    and return [(best keyword, score)] in title order. With rapidfuzz the whole
+    titles × keywords matrix is computed in one multi-threaded cdist call.
+    """
+    if not titles or not keywords:
+        return [(None, 0.0) for _ in titles]
+
+    if process is not None:
+        scores = process.cdist(titles, keywords, scorer=fuzz.ratio, processor=str.lower, workers=WORKERS)
+        best = scores.argmax(axis=1)
+        return [
+            (keywords[column], float(scores[row, column]) / 100)
+            for row, column in zip(range(len(titles)), best)
+        ]
+
+    results = []
+    lowered = [keyword.lower() for keyword in keywords]
+    for title in titles:
+        title = title.lower()
+        scores = [ratio(keyword, title) for keyword in lowered]
+        column = scores.index(max(scores))  # ✅ First best keyword on ties, like argmax
+        results.append((keywords[column], scores[column]))
+    return results
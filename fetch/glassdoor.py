@@ -1,55 +1,73 @@
 # fetch/glassdoor.py
-import time
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
+from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
-from webdriver_manager.chrome import ChromeDriverManager
-from Levenshtein import ratio
 import sys
 import os
+import time
 from urllib.parse import quote
 
 # ✅ Ensure Python finds config.py in the project root
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import config  # Contains JOB_KEYWORDS, etc.
+import metrics
+from fetch import deadline, browser_pool, readiness, replay, fuzzy_match, query_planner
 
 BASE_URL = (
     "https://www.glassdoor.co.uk/Job/london-england-{query}-jobs-SRCH_IL."
     "0,14_IC2671300_KO{start},{end}.htm?fromAge=7"
 )
+JOB_CARD_SELECTOR = "div.jobCard.JobCard_jobCardContent__JQ5Rq"
+COOKIE_ACCEPT = (By.ID, "onetrust-accept-btn-handler")
+COOKIE_REJECT = (By.ID, "onetrust-reject-all-handler")
+MIN_SIMILARITY = 0.8  # Title vs. best keyword (Levenshtein ratio)
+
+def _text(tag):
+    """Visible text of a tag with whitespace collapsed (matches Selenium's .text)."""
+    return " ".join(tag.get_text(" ").split())
+
+def parse_job_cards(html):
+    """
+    Extracts title, link, company and location from every job card in a rendered results page.
+    Cards missing any of them come back with None for that field.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    cards = []
+
+    for job_card in soup.select(JOB_CARD_SELECTOR):
+        title_tag = job_card.select_one("a.JobCard_jobTitle__GLyJ1")
+        company_tag = job_card.select_one("span.EmployerProfile_compactEmployerName__9MGcV")
+        location_tag = job_card.select_one("div.JobCard_location__Ds1fM")
+        job_url = title_tag.get("href") if title_tag else None
+
+        cards.append({
+            "title": _text(title_tag) if title_tag else None,
+            "url": f"https://www.glassdoor.co.uk{job_url}" if job_url and job_url.startswith("/") else job_url,
+            "company": _text(company_tag) if company_tag else None,
+            "location": _text(location_tag) if location_tag else None,
+        })
+
+    return cards
 
 def handle_cookie_banner(driver):
     """Handles both 'Accept Cookies' and 'Reject Cookies' options."""
-    try:
-        print("🍪 Checking for cookie banner...")
-        WebDriverWait(driver, 2).until(
-            EC.element_to_be_clickable((By.ID, "onetrust-accept-btn-handler"))
-        ).click()
+    print("🍪 Checking for cookie banner...")
+    clicked = readiness.click_first_present(driver, [COOKIE_ACCEPT, COOKIE_REJECT], timeout=2)
+    if clicked == COOKIE_ACCEPT:
         print("✅ Accepted cookies.")
-    except Exception:
-        try:
-            WebDriverWait(driver, 2).until(
-                EC.element_to_be_clickable((By.ID, "onetrust-reject-all-handler"))
-            ).click()
-            print("✅ Rejected cookies.")
-        except Exception:
-            print("⚠️ No cookie banner found or already dismissed.")
+    elif clicked == COOKIE_REJECT:
+        print("✅ Rejected cookies.")
+    else:
+        print("⚠️ No cookie banner found or already dismissed.")
 
 def close_popup(driver):
     """Closes the sign-in popup if it appears."""
-    try:
-        print("🔓 Checking for sign-in popup...")
-        WebDriverWait(driver, 2).until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, "button.CloseButton"))
-        ).click()
+    print("🔓 Checking for sign-in popup...")
+    if readiness.click_if_present(driver, By.CSS_SELECTOR, "button.CloseButton", timeout=1):
         print("✅ Sign-in popup dismissed!")
-    except Exception:
+    else:
         print("⚠️ No sign-in popup found or already dismissed.")
 
 def load_more_jobs(driver, max_clicks=2):
@@ -58,121 +76,140 @@ def load_more_jobs(driver, max_clicks=2):
     any sign-in popups that reappear.
     """
     for _ in range(max_clicks):
-        try:
-            print("🔄 Clicking 'Show more jobs' button...")
-            load_more_button = WebDriverWait(driver, 2).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "button[data-test='load-more']"))
-            )
-            driver.execute_script("arguments[0].click();", load_more_button)
-            time.sleep(2)
-
-            # 🟢 Handle reappearing popups
-            close_popup(driver)
-        except Exception:
+        card_count = readiness.count(driver, JOB_CARD_SELECTOR)
+
+        print("🔄 Clicking 'Show more jobs' button...")
+        if not readiness.click_if_present(driver, By.CSS_SELECTOR, "button[data-test='load-more']", timeout=2):
             print("⚠️ 'Show more jobs' button not found or no more jobs to load.")
             break
 
-def fetch_glassdoor_jobs():
-    """Scrapes job listings from Glassdoor using Selenium (headless) and fuzzy matching."""
-    print("\n🔍 Starting Glassdoor Jobs Scraper...")
+        # ✅ Move on as soon as the extra cards render
+        if readiness.wait_for_count_increase(driver, JOB_CARD_SELECTOR, card_count, timeout=5) == card_count:
+            print("⚠️ 'Show more jobs' loaded nothing new.")
+            break
 
-    # ✅ Chrome options (headless by default)
-    options = Options()
-    # If you want to try the new headless mode, replace with:
-    # options.add_argument("--headless=new")
-    options.add_argument("--headless")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--window-size=1920,1080")
-    options.add_argument("--blink-settings=imagesEnabled=false")
-    options.add_argument("--disable-blink-features=CSSPaintAPI")
-
-    driver = webdriver.Chrome(
-        service=Service(ChromeDriverManager().install()),
-        options=options
-    )
+        # 🟢 Handle reappearing popups
+        close_popup(driver)
 
-    jobs = []
+def _scrape_keyword(driver, keyword):
+    """Runs one Glassdoor keyword search in a pooled browser and returns its raw job cards."""
 
-    for keyword in config.JOB_KEYWORDS:
-        # Convert spaces to hyphens for the URL
-        query = quote(keyword.replace(" ", "-"))
-        start = 15  # Glassdoor starts job title at position 15
-        end = start + len(keyword)
-        query_url = BASE_URL.format(query=query, start=start, end=end)
-
-        print(f"\n🌍 Navigating to {query_url} (Keyword: {keyword})")
-        driver.get(query_url)
-
-        # ✅ Handle cookie banner (Accept/Reject)
-        handle_cookie_banner(driver)
-
-        # ✅ Manually enter the keyword in the search box
-        try:
-            search_box = WebDriverWait(driver, 3).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='text']"))
-            )
-            search_box.clear()
-            search_box.send_keys(keyword)
-            search_box.send_keys(Keys.RETURN)
-            time.sleep(1.5)
-        except Exception:
-            print("⚠️ Could not find the search box to trigger search manually.")
-
-        # ✅ Close sign-in popup if present
-        close_popup(driver)
+    # Convert spaces to hyphens for the URL
+    query = quote(keyword.replace(" ", "-"))
+    start = 15  # Glassdoor starts job title at position 15
+    end = start + len(keyword)
+    query_url = BASE_URL.format(query=query, start=start, end=end)
 
-        # ✅ Optionally click 'Show more jobs' to load additional results
-        load_more_jobs(driver, max_clicks=2)
+    print(f"\n🌍 Navigating to {query_url} (Keyword: {keyword})")
+    started = time.perf_counter()
+    try:
+        return _search(driver, keyword, query_url)
+    finally:
+        metrics.observe("keyword_seconds", time.perf_counter() - started, source="glassdoor", keyword=keyword)
 
-        # ✅ Wait for job cards to appear
-        try:
-            job_cards = WebDriverWait(driver, 3).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div.jobCard.JobCard_jobCardContent__JQ5Rq"))
-            )
-        except Exception:
-            print("❌ No job listings found for this keyword. Moving on.")
-            continue
+def _search(driver, keyword, query_url):
+    """The body of _scrape_keyword: load, search, expand and parse one keyword's results."""
+    driver.get(query_url)
+    metrics.inc("page_loads_total", source="glassdoor")
+
+    # ✅ Handle cookie banner (Accept/Reject)
+    handle_cookie_banner(driver)
+
+    # ✅ Manually enter the keyword in the search box
+    search_box = readiness.wait_for_element(driver, "input[type='text']", timeout=3)
+    try:
+        if search_box is None:
+            raise LookupError("search box not found")
+        search_box.clear()
+        search_box.send_keys(keyword)
+        search_box.send_keys(Keys.RETURN)
+        readiness.wait_for_network_idle(driver, idle_time=0.5, timeout=5)  # ✅ Results refresh in place
+    except Exception:
+        print("⚠️ Could not find the search box to trigger search manually.")
+
+    # ✅ Close sign-in popup if present
+    close_popup(driver)
+
+    # ✅ Optionally click 'Show more jobs' to load additional results
+    load_more_jobs(driver, max_clicks=2)
+
+    # ✅ Wait for job cards to appear
+    if not readiness.wait_for_selector(driver, JOB_CARD_SELECTOR, timeout=3):
+        print("❌ No job listings found for this keyword. Moving on.")
+        return []
+
+    page_source = replay.page_source(driver, query_url)
+    with metrics.timer("parse_seconds", parser="fetch.glassdoor.parse_job_cards"):
+        cards = parse_job_cards(page_source)
+    print(f"📌 Found {len(cards)} jobs for '{keyword}'.")
+    return cards
 
-        print(f"📌 Found {len(job_cards)} jobs for '{keyword}'.")
+def _matching_jobs(cards, seen_urls):
+    """
+    Scores every card's title against every configured keyword in one batch
+    and keeps the cards whose best keyword is at least MIN_SIMILARITY.
+    `seen_urls` is shared across keywords, so a job found under several is kept once.
+    """
+    jobs = []
+
+    # ✅ Drop untitled cards and the same job found under several keywords before scoring
+    titled = []
+    for card in cards:
+        if card["title"] is None:
+            print("⚠️ Error processing job card: missing title")
+            metrics.inc("jobs_filtered_total", source="glassdoor", reason="incomplete")
+        elif card["url"] in seen_urls:
+            metrics.inc("jobs_filtered_total", source="glassdoor", reason="duplicate")
+        else:
+            seen_urls.add(card["url"])
+            titled.append(card)
+
+    scores = fuzzy_match.best_keywords([card["title"] for card in titled], config.JOB_KEYWORDS)
+
+    for card, (keyword, similarity) in zip(titled, scores):
+        title = card["title"]
+        if similarity < MIN_SIMILARITY:
+            print(f"❌ Skipping '{title}' (Similarity: {similarity:.2f}) vs. '{keyword}'")
+            metrics.inc("jobs_filtered_total", source="glassdoor", reason="similarity")
+            continue
 
-        # ✅ Limit to first 10 job cards per keyword for speed
-        for job_card in job_cards[:10]:
-            try:
-                title_element = job_card.find_element(By.CSS_SELECTOR, "a.JobCard_jobTitle__GLyJ1")
-                title = title_element.text.strip()
-                job_url = title_element.get_attribute("href")
+        if card["company"] is None or card["location"] is None:
+            print(f"⚠️ Error processing job card: '{title}' is missing its company or location")
+            metrics.inc("jobs_filtered_total", source="glassdoor", reason="incomplete")
+            continue
 
-                similarity = ratio(keyword.lower(), title.lower())
-                if similarity < 0.8:
-                    print(f"❌ Skipping '{title}' (Similarity: {similarity:.2f}) vs. '{keyword}'")
-                    continue
+        jobs.append({
+            "title": title,
+            "company": card["company"],
+            "location": card["location"],
+            "url": card["url"],
+            "date_added": datetime.utcnow().strftime("%Y-%m-%d"),
+            "has_applied": False
+        })
+        metrics.inc("jobs_kept_total", source="glassdoor")
 
-                company_element = job_card.find_element(By.CSS_SELECTOR, "span.EmployerProfile_compactEmployerName__9MGcV")
-                company = company_element.text.strip()
+        print(f"✅ '{title}' at '{card['company']}' ({card['location']}) - Similarity: {similarity:.2f} ('{keyword}')")
+        print(f"   🔗 {card['url']}")
 
-                location_element = job_card.find_element(By.CSS_SELECTOR, "div.JobCard_location__Ds1fM")
-                location = location_element.text.strip()
+    return jobs
 
-                jobs.append({
-                    "title": title,
-                    "company": company,
-                    "location": location,
-                    "url": job_url,
-                    "date_added": datetime.utcnow().strftime("%Y-%m-%d"),
-                    "has_applied": False
-                })
+def fetch_glassdoor_jobs():
+    """Scrapes job listings from Glassdoor using Selenium (headless) and fuzzy matching."""
+    print("\n🔍 Starting Glassdoor Jobs Scraper...")
 
-                print(f"✅ '{title}' at '{company}' ({location}) - Similarity: {similarity:.2f}")
-                print(f"   🔗 {job_url}")
+    jobs = deadline.results_list()
 
-            except Exception as e:
-                print(f"⚠️ Error processing job card: {e}")
+    # ✅ Keywords run in parallel across the shared browser pool; each keyword's cards are scored
+    #    (titles × keywords in one pass) as soon as they arrive, so a deadline keeps what's done so far
+    seen_urls = set()
+    searches = [query.text for query in query_planner.plan("glassdoor", config.JOB_KEYWORDS)]
+    for keyword_cards in browser_pool.map_pages(_scrape_keyword, searches):
+        jobs.extend(_matching_jobs(keyword_cards, seen_urls))
 
-    driver.quit()
     print(f"✅ Finished Glassdoor scraping. Total jobs found: {len(jobs)}")
     return jobs
 
 if __name__ == "__main__":
-    # Local test
-    fetch_glassdoor_jobs()
\ No newline at end of file
+    # Local test (add --profile to sample it)
+    import profiling
+    profiling.run_main(fetch_glassdoor_jobs, "glassdoor")
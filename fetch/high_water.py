@@ -0,0 +1,153 @@
+import os
+import json
+import hashlib
+import threading
+import config
+from fetch import replay
+
+# ✅ Per-(source, keyword) record of the listings seen on previous runs, persisted between runs
+STATE_PATH = os.getenv("HIGH_WATER_PATH", os.path.join(config.CACHE_DIR, "high_water.json"))
+MAX_SEEN = int(os.getenv("HIGH_WATER_MAX_SEEN", 1000))  # Most recent listing IDs kept per mark
+ENABLED = os.getenv("HIGH_WATER", "1") != "0" and not replay.replaying()  # ✅ Replays stay deterministic
+
+# ✅ Bump when the state file layout changes; older files are then ignored
+FORMAT_VERSION = 1
+
+_lock = threading.Lock()
+_marks = None  # key → {"seen": [digest, ...], "newest": "YYYY-MM-DD" | None}, as loaded from disk
+_known = {}  # key → set of digests seen on previous runs (what stop/deepen decisions use)
+_pending = {}  # key → {"seen": [digest, ...], "newest": ...} from this run, merged in by save()
+
+_stats = {
+    "stopped": 0,  # Paginations cut short because a page was entirely seen
+    "all_new": 0,  # Pages where every listing was new (sources may go deeper)
+}
+
+def _key(source, keyword):
+    return f"{source}:{keyword.strip().lower()}"
+
+def _digest(listing_id):
+    """Short, stable digest of a job ID or URL (keeps the state file compact)."""
+    return hashlib.sha1(str(listing_id).encode("utf-8")).hexdigest()[:12]
+
+def _load():
+    """Read the state file once per process (lock held)."""
+    global _marks
+    if _marks is not None:
+        return _marks
+
+    _marks = {}
+    try:
+        with open(STATE_PATH, encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("version") == FORMAT_VERSION:
+            _marks = state["marks"]
+    except (OSError, ValueError, KeyError):
+        pass  # ✅ No marks yet (or unreadable): behave like a first run
+
+    for key, mark in _marks.items():
+        _known[key] = set(mark["seen"])
+    return _marks
+
+def has_mark(source, keyword):
+    """True if a previous run left a high-water mark for this search."""
+    if not ENABLED:
+        return False
+    with _lock:
+        _load()
+        return _key(source, keyword) in _known
+
+def all_seen(source, keyword, listing_ids):
+    """True if every listing on a page was already seen on a previous run (stop paginating)."""
+    digests = {_digest(listing_id) for listing_id in listing_ids}
+    if not ENABLED or not digests:
+        return False
+    with _lock:
+        _load()
+        seen = digests <= _known.get(_key(source, keyword), set())
+        if seen:
+            _stats["stopped"] += 1
+    return seen
+
+def all_new(source, keyword, listing_ids):
+    """
+    True if a mark exists and none of a page's listings were seen before,
+    i.e. a burst of new postings that may continue on the next page (go deeper).
+    """
+    digests = {_digest(listing_id) for listing_id in listing_ids}
+    if not ENABLED or not digests:
+        return False
+    with _lock:
+        _load()
+        key = _key(source, keyword)
+        new = key in _known and _known[key].isdisjoint(digests)
+        if new:
+            _stats["all_new"] += 1
+    return new
+
+def record(source, keyword, listing_ids, newest=None):
+    """Remember the listings on a page (and its newest posting date, "YYYY-MM-DD") for the next run."""
+    if not ENABLED:
+        return
+    with _lock:
+        _load()
+        pending = _pending.setdefault(_key(source, keyword), {"seen": [], "newest": None})
+        pending["seen"].extend(_digest(listing_id) for listing_id in listing_ids)
+        if newest and (pending["newest"] is None or newest > pending["newest"]):
+            pending["newest"] = newest
+
+def newest(source, keyword):
+    """Newest posting date recorded for a search (saved or from this run), or None."""
+    if not ENABLED:
+        return None
+    with _lock:
+        key = _key(source, keyword)
+        dates = [entry["newest"] for entry in (_load().get(key), _pending.get(key)) if entry and entry["newest"]]
+    return max(dates, default=None)
+
+def save():
+    """Merge this run's listings into the marks and write the state file (call once they're stored)."""
+    if not ENABLED:
+        return
+    with _lock:
+        marks = _load()
+        if not _pending:
+            return
+
+        for key, pending in _pending.items():
+            mark = marks.setdefault(key, {"seen": [], "newest": None})
+            if pending["newest"] and (mark["newest"] is None or pending["newest"] > mark["newest"]):
+                mark["newest"] = pending["newest"]
+            # ✅ Most recently seen last; re-seen listings move to the end so they aren't trimmed
+            digests = pending["seen"]
+            this_run = set(digests)
+            merged = dict.fromkeys(d for d in mark["seen"] if d not in this_run)
+            merged.update(dict.fromkeys(digests))
+            mark["seen"] = list(merged)[-MAX_SEEN:]
+            _known[key] = set(mark["seen"])  # ✅ A long-running process (daemon.py) sees them next cycle
+        _pending.clear()
+
+        os.makedirs(os.path.dirname(STATE_PATH), exist_ok=True)
+        temp_path = f"{STATE_PATH}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": FORMAT_VERSION, "marks": marks}, f, separators=(",", ":"))
+        os.replace(temp_path, STATE_PATH)  # ✅ Atomic, so a killed run can't leave half a file
+
+def discard():
+    """Forget this run's listings without saving them (their jobs never made it to storage)."""
+    with _lock:
+        _pending.clear()
+
+def high_water_stats():
+    with _lock:
+        return dict(_stats)
+
+def print_high_water_stats():
+    """Print a one-line summary of early stops and all-new pages."""
+    stats = high_water_stats()
+    if not stats["stopped"] and not stats["all_new"]:
+        return
+    print(
+        f"🌊 High-water marks: {stats['stopped']} paginations stopped early (page already seen), "
+        f"{stats['all_new']} pages of entirely new listings"
+    )
@@ -0,0 +1,207 @@
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+import config
+import metrics
+from fetch import replay
+
+# ✅ Cache location & size (bodies are stored zlib-compressed)
+CACHE_PATH = os.getenv("HTTP_CACHE_PATH", os.path.join(config.CACHE_DIR, "http_cache.sqlite3"))
+MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_MB", 64)) * 1024 * 1024
+ENABLED = os.getenv("HTTP_CACHE", "1") != "0" and not replay.replaying()  # ✅ Replays stay deterministic
+
+_lock = threading.Lock()
+_db = None
+
+_stats = {
+    "lookups": 0,  # Cacheable requests made
+    "not_modified": 0,  # 304s answered from the cache
+    "unchanged": 0,  # 200s whose body hashed the same as the cached copy
+    "misses": 0,  # New or changed pages
+    "bytes_saved": 0,  # Body bytes we didn't download thanks to 304s
+    "parses_skipped": 0,
+    "parses_run": 0,
+}
+
+def _connect():
+    global _db
+    if _db is None:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        _db = sqlite3.connect(CACHE_PATH, check_same_thread=False)
+        _db.execute("PRAGMA journal_mode=WAL")
+        _db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, content_hash TEXT,"
+            "encoding TEXT, body BLOB, size INTEGER, accessed REAL)"
+        )
+        _db.execute(
+            "CREATE TABLE IF NOT EXISTS parsed ("
+            "key TEXT PRIMARY KEY, content_hash TEXT, payload BLOB, size INTEGER, accessed REAL)"
+        )
+    return _db
+
+def content_hash(content):
+    """Stable hash of a page body (str or bytes)."""
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha1(content).hexdigest()
+
+def lookup(url):
+    """Return the cached entry for `url` as a dict, or None."""
+    if not ENABLED:
+        return None
+    with _lock:
+        row = _connect().execute(
+            "SELECT etag, last_modified, content_hash, encoding, body FROM responses WHERE url = ?", (url,)
+        ).fetchone()
+    if row is None:
+        return None
+    etag, last_modified, digest, encoding, body = row
+    return {"etag": etag, "last_modified": last_modified, "content_hash": digest, "encoding": encoding, "body": body}
+
+def conditional_headers(entry):
+    """If-None-Match / If-Modified-Since headers to revalidate a cached entry."""
+    headers = {}
+    if entry and entry["etag"]:
+        headers["If-None-Match"] = entry["etag"]
+    if entry and entry["last_modified"]:
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+def revalidate(url, response, entry):
+    """
+    Reconcile a fresh response with the cached entry and update the cache.
+    A 304 is rewritten in place into a 200 carrying the cached body.
+    Sets response.from_cache and response.content_hash for callers.
+    """
+    response.from_cache = False
+    if not ENABLED:
+        response.content_hash = content_hash(response.content)
+        return response
+
+    with _lock:
+        _stats["lookups"] += 1
+
+    if response.status_code == 304 and entry:
+        body = zlib.decompress(entry["body"])
+        response._content = body
+        response.status_code = 200
+        response.encoding = entry["encoding"]
+        response.from_cache = True
+        response.content_hash = entry["content_hash"]
+        with _lock:
+            _stats["not_modified"] += 1
+            _stats["bytes_saved"] += len(body)
+            _connect().execute("UPDATE responses SET accessed = ? WHERE url = ?", (time.time(), url))
+            _db.commit()
+        return response
+
+    response.content_hash = content_hash(response.content)
+    if response.status_code != 200:
+        return response
+
+    with _lock:
+        _stats["unchanged" if entry and entry["content_hash"] == response.content_hash else "misses"] += 1
+
+    _store(url, response)
+    return response
+
+def _store(url, response):
+    body = zlib.compress(response.content, 6)
+    with _lock:
+        _connect().execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                url,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+                response.content_hash,
+                response.encoding,
+                body,
+                len(body),
+                time.time(),
+            ),
+        )
+        _db.commit()
+        _evict()
+
+def parse_once(key, content, parser, version=1):
+    """
+    Return parser(content), reusing the stored result when `content` hashes the same
+    as last time for `key`. Parser output must be JSON-serialisable; bump `version`
+    whenever its output format changes.
+    """
+    parser_name = f"{parser.__module__}.{parser.__name__}"
+    if not ENABLED:
+        with metrics.timer("parse_seconds", parser=parser_name):
+            return parser(content)
+
+    digest = f"{content_hash(content)}:v{version}"
+    key = f"{key}#{parser_name}"
+
+    with _lock:
+        row = _connect().execute("SELECT content_hash, payload FROM parsed WHERE key = ?", (key,)).fetchone()
+        if row and row[0] == digest:
+            _stats["parses_skipped"] += 1
+            _db.execute("UPDATE parsed SET accessed = ? WHERE key = ?", (time.time(), key))
+            _db.commit()
+            return json.loads(zlib.decompress(row[1]))
+
+    with metrics.timer("parse_seconds", parser=parser_name):
+        result = parser(content)
+    payload = zlib.compress(json.dumps(result).encode("utf-8"))
+
+    with _lock:
+        _stats["parses_run"] += 1
+        _db.execute(
+            "INSERT OR REPLACE INTO parsed VALUES (?, ?, ?, ?, ?)",
+            (key, digest, payload, len(payload), time.time()),
+        )
+        _db.commit()
+        _evict()
+    return result
+
+def _evict():
+    """Drop least-recently-used entries until the cache is back under 90% of MAX_BYTES (lock held)."""
+    total = _db.execute(
+        "SELECT (SELECT COALESCE(SUM(size), 0) FROM responses) + (SELECT COALESCE(SUM(size), 0) FROM parsed)"
+    ).fetchone()[0]
+    if total <= MAX_BYTES:
+        return
+
+    target = MAX_BYTES * 0.9
+    rows = _db.execute(
+        "SELECT 'responses', url, size, accessed FROM responses "
+        "UNION ALL SELECT 'parsed', key, size, accessed FROM parsed ORDER BY accessed"
+    ).fetchall()
+    for table, key, size, _ in rows:
+        if total <= target:
+            break
+        column = "url" if table == "responses" else "key"
+        _db.execute(f"DELETE FROM {table} WHERE {column} = ?", (key,))
+        total -= size
+    _db.commit()
+
+def cache_stats():
+    """Counters plus the overall hit rate (304s and unchanged bodies over all lookups)."""
+    with _lock:
+        stats = dict(_stats)
+    hits = stats["not_modified"] + stats["unchanged"]
+    stats["hit_rate"] = round(hits / stats["lookups"], 3) if stats["lookups"] else 0.0
+    return stats
+
+def print_cache_stats():
+    """Print a one-line cache summary."""
+    stats = cache_stats()
+    if not stats["lookups"] and not stats["parses_run"] + stats["parses_skipped"]:
+        return
+    print(
+        f"🗄️ HTTP cache: {stats['hit_rate']:.0%} hit rate "
+        f"({stats['not_modified']} not modified, {stats['unchanged']} unchanged, {stats['misses']} misses), "
+        f"{stats['bytes_saved'] / 1024:.0f} KB not downloaded, "
+        f"{stats['parses_skipped']} parses skipped / {stats['parses_run']} run"
+    )
@@ -0,0 +1,156 @@
+import os
+import threading
+from collections import defaultdict
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.request import ACCEPT_ENCODING
+import metrics
+from fetch import rate_limiter, http_cache, replay, deadline
+
+# ✅ Pool sizing (hosts kept in the pool / sockets kept per host)
+POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", 10))
+POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", 10))
+DEFAULT_TIMEOUT = int(os.getenv("HTTP_TIMEOUT", 10))
+
+# ✅ Headers every pooled session sends (urllib3 adds "br" when brotli is installed)
+SESSION_HEADERS = {
+    "Accept-Encoding": ACCEPT_ENCODING,
+    "Connection": "keep-alive",
+}
+
+_sessions = {}
+_lock = threading.Lock()
+
+# ✅ Pool statistics per host
+_stats = defaultdict(lambda: {"opened": 0, "requests": 0})
+_stats_lock = threading.Lock()
+
+def _count(host, field):
+    with _stats_lock:
+        _stats[host][field] += 1
+
+# ✅ Count real TCP connects (urllib3 reconnects pooled connection objects in place)
+class _CountingHTTPConnection(HTTPConnection):
+    def connect(self):
+        _count(self.host, "opened")
+        return super().connect()
+
+class _CountingHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        _count(self.host, "opened")
+        return super().connect()
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+def _instrument(adapter):
+    """(Re)build an adapter's pool manager with our sizing and connection counting."""
+    adapter.init_poolmanager(POOL_CONNECTIONS, POOL_MAXSIZE, block=False)
+    adapter.poolmanager.pool_classes_by_scheme = {
+        "http": _CountingHTTPConnectionPool,
+        "https": _CountingHTTPSConnectionPool,
+    }
+
+def _count_request(response, *args, **kwargs):
+    _count(urlsplit(response.url).hostname, "requests")
+
+def _build_session(kind):
+    if kind == "cloudscraper":
+        import cloudscraper  # ✅ Only the sources behind Cloudflare pay for this import
+
+        # ✅ Keep CloudScraper's own TLS adapter (needed for Cloudflare), just pool it
+        session = cloudscraper.create_scraper()
+        _instrument(session.get_adapter("https://"))
+        _instrument(session.get_adapter("http://"))
+    else:
+        session = requests.Session()
+        for prefix in ("https://", "http://"):
+            adapter = HTTPAdapter()
+            _instrument(adapter)
+            session.mount(prefix, adapter)
+
+    session.headers.update(SESSION_HEADERS)
+    session.hooks["response"].append(_count_request)
+    return session
+
+def get_session(kind="default"):
+    """Return the shared session for `kind` ("default" or "cloudscraper"), creating it once."""
+    with _lock:
+        if kind not in _sessions:
+            _sessions[kind] = _build_session(kind)
+        return _sessions[kind]
+
+def _wire_bytes(response):
+    """Body bytes as transferred (still gzip/br-compressed), not the decoded len(response.content)."""
+    response.content  # ✅ Reads the body, so the raw stream has counted every byte
+    try:
+        return int(response.raw.tell())
+    except (AttributeError, TypeError, ValueError):
+        pass  # ✅ No urllib3 stream (e.g. a response built in memory)
+    length = response.headers.get("Content-Length", "")
+    return int(length) if length.isdigit() else len(response.content)
+
+def get(url, headers=None, timeout=DEFAULT_TIMEOUT, kind="default", retries=0, cache=False, **kwargs):
+    """
+    GET through the shared keep-alive pool for `kind`, paced by the per-domain rate limiter.
+    Responses that push back (403/429/5xx) are retried up to `retries` times once the limiter allows,
+    unless the worker's deadline has passed. Socket timeouts are capped at the time left (at least 1s).
+    With cache=True the request is revalidated against the on-disk cache (see http_cache).
+    SCRAPER_TRANSPORT=record/replay saves or serves fixtures instead (see replay).
+    """
+    if replay.replaying():
+        return replay.load_response(url)
+
+    domain = urlsplit(url).hostname
+    session = get_session(kind)
+    entry = http_cache.lookup(url) if cache else None
+    headers = {**(headers or {}), **http_cache.conditional_headers(entry)}
+    timeout = max(1.0, deadline.capped(timeout))
+
+    for attempt in range(retries + 1):
+        rate_limiter.acquire(domain)
+        response = session.get(url, headers=headers, timeout=timeout, **kwargs)
+        rate_limiter.feedback(domain, response.status_code, response.headers.get("Retry-After"))
+        metrics.inc("http_requests_total", host=domain, status=response.status_code)
+        metrics.inc("http_bytes_total", _wire_bytes(response), host=domain)  # ✅ Before a 304 is filled from cache
+
+        if response.status_code not in rate_limiter.PUSHBACK_STATUSES and response.status_code < 500:
+            break
+        if attempt == retries or deadline.expired():
+            break  # ✅ Out of retries (or time): return the pushback response as it is
+        print(f"🔁 Retrying {url} after {response.status_code} ({attempt + 1}/{retries})...")
+
+    if cache:
+        response = http_cache.revalidate(url, response, entry)
+    if replay.recording():
+        replay.save_response(url, response)
+    return response
+
+def pool_stats():
+    """Return {host: {"opened", "requests", "reused"}} for every host contacted so far."""
+    with _stats_lock:
+        return {
+            host: {**counts, "reused": max(0, counts["requests"] - counts["opened"])}
+            for host, counts in _stats.items()
+        }
+
+def print_pool_stats():
+    """Print a one-line pooling summary per host."""
+    for host, counts in sorted(pool_stats().items()):
+        print(
+            f"🔌 {host}: {counts['requests']} requests over {counts['opened']} connections "
+            f"({counts['reused']} reused)"
+        )
+
+def close():
+    """Close all pooled sessions (their connections are dropped)."""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
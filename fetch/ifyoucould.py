@@ -2,104 +2,195 @@
 
 import sys
 import os
-import time
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
+from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))  # Go up one level
 import config  # Import the config file
+import metrics
+from fetch import deadline, browser_pool, readiness, http_cache, replay, high_water, keyword_matcher
 
 BASE_URL = "https://www.ifyoucouldjobs.com/jobs"
 MAX_PAGES = 2  # Scrape first 2 pages
+MAX_DEPTH = int(os.getenv("IFYOUCOULD_MAX_DEPTH", 6))  # Ceiling when every listing on a page is new
+JOB_CARD_SELECTOR = "article.bg-warm-grey, article.bg-light-peach"
+COOKIE_ACCEPT_ID = "CybotCookiebotDialogBodyLevelButtonLevelOptinAllowAll"
+
+# ✅ Titles must equal one of the configured keywords (case-insensitive)
+EXACT_KEYWORDS = keyword_matcher.compile(config.JOB_KEYWORDS, mode=keyword_matcher.EXACT)
+
+# ✅ Bump when parse_job_cards' output changes (invalidates cached parses)
+PARSE_VERSION = 1
+
+def _text(tag):
+    """Visible text of a tag with whitespace collapsed (matches Selenium's .text)."""
+    return " ".join(tag.get_text(" ").split())
+
+def _definition(card, label):
+    """Text of the <dd> following the <dt> whose text contains `label`, or None."""
+    term = card.find("dt", string=lambda text: text and label in text)
+    value = term.find_next_sibling("dd") if term else None
+    return _text(value) if value else None
+
+def parse_job_cards(html):
+    """
+    Extracts the raw fields of every job card from a rendered listing page.
+    Parsing page_source once avoids a WebDriver round trip per field, and the
+    JSON-serialisable output lets http_cache skip unchanged pages.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    cards = []
+
+    for job in soup.select(JOB_CARD_SELECTOR):
+        title_tag = job.select_one("h2.type-style-3")
+        company_tag = job.select_one("h3.type-style-4")
+        link_tag = job.select_one("a.link-reset")
+        location = _definition(job, "Location")
+        salary = _definition(job, "Salary")
+
+        cards.append({
+            "title": _text(title_tag) if title_tag else None,
+            "company": _text(company_tag) if company_tag else "Unknown",
+            "location": location if location is not None else "Unknown",
+            "salary": salary if salary is not None else "Not listed",
+            "url": link_tag.get("href") if link_tag else None,
+        })
+
+    return cards
+
+# ✅ The listing isn't searched per keyword, so there's one high-water mark for the whole board
+HIGH_WATER_KEY = "all"
+
+def filter_job_cards(cards):
+    """Jobs for the cards whose title exactly matches a keyword (no I/O; see benchmarks/suite.py)."""
+    jobs = []
+
+    for card in cards:
+        # ✅ Check if title exists, otherwise skip
+        title = card["title"]
+        if not title:
+            print("⚠️ Skipping job due to missing title")
+            metrics.inc("jobs_filtered_total", source="ifyoucould", reason="incomplete")
+            continue
+
+        if not card["url"]:
+            print(f"⚠️ Skipping '{title}' due to missing job link")
+            metrics.inc("jobs_filtered_total", source="ifyoucould", reason="incomplete")
+            continue
+
+        company = card["company"]
+        location = card["location"]
+        salary = card["salary"]
+
+        # ✅ Get Full Job Link
+        relative_link = card["url"]
+        full_link = f"https://www.ifyoucouldjobs.com{relative_link}" if relative_link.startswith("/") else relative_link
+
+        # ✅ Strict Filtering: Only include jobs with an **exact match** in JOB_KEYWORDS
+        if EXACT_KEYWORDS.matches(title):
+            print(f"🆕 Job Matched: {title} at {company} ({location}) - {salary}")
+            print(f"🔗 Job Link: {full_link}")
+
+            jobs.append({
+                "title": title,
+                "company": company,
+                "location": location,
+                "salary": salary,
+                "url": full_link,
+                "date_added": datetime.utcnow().strftime("%Y-%m-%d"),  # ✅ New field
+                "has_applied": False,  # ✅ New field
+            })
+        else:
+            print(f"❌ Job Skipped: {title} (Does not match exact keywords)")
+            metrics.inc("jobs_filtered_total", source="ifyoucould", reason="keyword")
+
+    metrics.inc("jobs_kept_total", len(jobs), source="ifyoucould")
+    return jobs
+
+def _scrape_page(driver, page):
+    """
+    Loads one listing page in a pooled browser and extracts jobs that exactly match a keyword.
+    Returns (jobs, listing_urls); the URLs of every card feed the high-water mark.
+    """
+    url = f"{BASE_URL}?page={page}"
+    print(f"🌍 Navigating to {url} (Page {page})")
+    driver.get(url)
+    metrics.inc("page_loads_total", source="ifyoucould")
+
+    # ✅ Wait for the job cards themselves rather than a fixed delay
+    if not readiness.wait_for_selector(driver, JOB_CARD_SELECTOR, timeout=10):
+        print(f"⚠️ No job cards rendered on Page {page} within 10s.")
+
+    # ✅ Handle Cookie Popup (pooled browsers may or may not have seen it already)
+    print("🍪 Checking for cookie popup...")
+    if readiness.click_if_present(driver, By.ID, COOKIE_ACCEPT_ID, timeout=1):
+        readiness.wait_until_gone(driver, By.ID, COOKIE_ACCEPT_ID, timeout=2)
+        print("✅ Cookie popup dismissed!")
+    else:
+        print("⚠️ No cookie popup found or already dismissed.")
+
+    print("🔍 Searching for job elements...")
+    cards = http_cache.parse_once(url, replay.page_source(driver, url), parse_job_cards, PARSE_VERSION)
+    print(f"📌 Found {len(cards)} job elements on Page {page}.")
+    listing_urls = [card["url"] for card in cards if card["url"]]
+
+    jobs = filter_job_cards(cards)
+    return jobs, listing_urls
+
+def _keep_paging(page, listing_urls):
+    """
+    Decide whether to load the page after `page`: stop once a page is made up entirely of
+    listings seen on a previous run, go past MAX_PAGES (up to MAX_DEPTH) while every listing is new.
+    """
+    already_seen = high_water.all_seen("ifyoucould", HIGH_WATER_KEY, listing_urls)
+    all_new = high_water.all_new("ifyoucould", HIGH_WATER_KEY, listing_urls)
+    high_water.record("ifyoucould", HIGH_WATER_KEY, listing_urls)
+
+    if already_seen:
+        print(f"🌊 Page {page} already seen on a previous run. Stopping.")
+        return False
+    if page < MAX_PAGES:
+        return True
+    if all_new and page < MAX_DEPTH:
+        print(f"🌊 Every job on Page {page} is new. Going one page deeper.")
+        return True
+    return False
+
+def iter_ifyoucould_jobs():
+    """Yields If You Could jobs page by page, as each page is scraped."""
+    # ✅ Pages load in parallel across the shared browser pool, one pool-sized batch at a time
+    page = 1
+    keep_paging = True
+    while keep_paging and not deadline.expired():
+        if page <= MAX_PAGES:
+            batch = range(page, min(page + browser_pool.POOL_SIZE, MAX_PAGES + 1))
+        else:
+            batch = range(page, page + 1)  # ✅ Past the usual depth, only go one page at a time
+
+        for page, result in zip(batch, browser_pool.map_pages(_scrape_page, batch)):
+            page_jobs, listing_urls = result or ([], [])
+            yield from page_jobs
+            if keep_paging:
+                keep_paging = _keep_paging(page, listing_urls)
+
+        page += 1
 
 def fetch_ifyoucould_jobs():
     """Scrapes job listings from If You Could Jobs using Selenium with strict keyword filtering."""
     print("🔍 Starting If You Could Jobs Scraper...")
 
-    # ✅ Set up Chrome options
-    options = Options()
-    options.add_argument("--headless")  # Run in background (Remove for debugging)
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-
-    print("🚀 Launching Chrome Browser...")
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    jobs = deadline.results_list()
+    for job in iter_ifyoucould_jobs():
+        jobs.append(job)
 
-    jobs = []
+    if deadline.expired():
+        print("⏰ If You Could deadline reached. Returning jobs found so far.")
 
-    for page in range(1, MAX_PAGES + 1):
-        url = f"{BASE_URL}?page={page}"
-        print(f"🌍 Navigating to {url} (Page {page})")
-        driver.get(url)
-        time.sleep(5)  # Wait for page to load
-
-        # ✅ Handle Cookie Popup Only Once
-        if page == 1:
-            try:
-                print("🍪 Checking for cookie popup...")
-                cookie_button = driver.find_element(By.ID, "CybotCookiebotDialogBodyLevelButtonLevelOptinAllowAll")
-                cookie_button.click()
-                print("✅ Cookie popup dismissed!")
-                time.sleep(2)  # Wait after clicking
-            except Exception:
-                print("⚠️ No cookie popup found or already dismissed.")
-
-        print("🔍 Searching for job elements...")
-        job_elements = driver.find_elements(By.CSS_SELECTOR, "article.bg-warm-grey, article.bg-light-peach")
-        print(f"📌 Found {len(job_elements)} job elements on Page {page}.")
-
-        for job in job_elements:
-            try:
-                # ✅ Check if title exists, otherwise skip
-                title_element = job.find_elements(By.CSS_SELECTOR, "h2.type-style-3")
-                title = title_element[0].text.strip() if title_element else None
-                if not title:
-                    print("⚠️ Skipping job due to missing title")
-                    continue
-
-                company_element = job.find_elements(By.CSS_SELECTOR, "h3.type-style-4")
-                company = company_element[0].text.strip() if company_element else "Unknown"
-
-                location_element = job.find_elements(By.XPATH, ".//dt[contains(text(), 'Location')]/following-sibling::dd")
-                location = location_element[0].text.strip() if location_element else "Unknown"
-
-                salary_element = job.find_elements(By.XPATH, ".//dt[contains(text(), 'Salary')]/following-sibling::dd")
-                salary = salary_element[0].text.strip() if salary_element else "Not listed"
-
-                # ✅ Fix: Get Full Job Link
-                link_element = job.find_element(By.CSS_SELECTOR, "a.link-reset")
-                relative_link = link_element.get_attribute("href")
-                full_link = f"https://www.ifyoucouldjobs.com{relative_link}" if relative_link.startswith("/") else relative_link
-
-                # ✅ Strict Filtering: Only include jobs with an **exact match** in JOB_KEYWORDS
-                if any(keyword.lower() == title.lower() for keyword in config.JOB_KEYWORDS):
-                    print(f"🆕 Job Matched: {title} at {company} ({location}) - {salary}")
-                    print(f"🔗 Job Link: {full_link}")
-
-                    jobs.append({
-                        "title": title,
-                        "company": company,
-                        "location": location,
-                        "salary": salary,
-                        "url": full_link,
-                        "date_added": datetime.utcnow().strftime("%Y-%m-%d"),  # ✅ New field
-                        "has_applied": False,  # ✅ New field
-                    })
-                else:
-                    print(f"❌ Job Skipped: {title} (Does not match exact keywords)")
-
-            except Exception as e:
-                print(f"⚠️ Skipping a job due to error: {e}")
-                continue  # Skip if any element is missing
-
-    driver.quit()
     print(f"✅ Finished scraping. Total jobs found: {len(jobs)}")
     return jobs
 
 # Run Scraper for Debugging
 if __name__ == "__main__":
-    fetch_ifyoucould_jobs()
\ No newline at end of file
+    import profiling
+    profiling.run_main(fetch_ifyoucould_jobs, "ifyoucould")
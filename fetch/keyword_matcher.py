@@ -0,0 +1,80 @@
+import re
+from functools import lru_cache
+
+# ✅ How a keyword has to appear in the text
+SUBSTRING = "substring"  # Anywhere, e.g. "designer" in "Product Designers" (the scrapers' old `kw in title`)
+WORD = "word"  # As whole words, e.g. "senior" but not "seniority"
+EXACT = "exact"  # The whole text, e.g. ifyoucould's exact title match
+MODES = (SUBSTRING, WORD, EXACT)
+
+def _build_trie(keywords):
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = True  # ✅ End of a keyword
+    return trie
+
+def _trie_pattern(node):
+    """
+    Regex for a trie: shared prefixes are factored out ("data(?: journalist| visualisation)?"),
+    so at each position the regex engine only walks the keywords that still fit.
+    """
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char != ""]
+    if not branches:
+        return ""
+
+    pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if "" in node:
+        # ✅ A keyword ends here but longer ones continue: optional (and greedy, so longest wins)
+        pattern = (pattern if len(branches) > 1 else f"(?:{pattern})") + "?"
+    return pattern
+
+class KeywordMatcher:
+    """
+    Every keyword compiled into one case-insensitive regex (a trie of the keywords), so matching
+    a title costs one pass over it no matter how many keywords there are. Text is lowercased once.
+    """
+
+    def __init__(self, keywords, mode=SUBSTRING):
+        if mode not in MODES:
+            raise ValueError(f"❌ Unknown keyword match mode '{mode}'. Use one of {MODES}.")
+
+        self.mode = mode
+        self.keywords = {}  # lowercased → keyword as configured
+        for keyword in keywords:
+            keyword = keyword.strip()
+            if keyword:
+                self.keywords.setdefault(keyword.lower(), keyword)
+
+        body = _trie_pattern(_build_trie(self.keywords)) if self.keywords else "(?!)"  # ✅ (?!) never matches
+        if mode == WORD:
+            body = rf"(?<!\w)(?:{body})(?!\w)"
+        self.pattern = re.compile(body)
+
+    def find(self, text):
+        """The configured keyword found in `text` (the first, longest one), or None."""
+        if not text:
+            return None
+        text = text.lower()
+        match = self.pattern.fullmatch(text) if self.mode == EXACT else self.pattern.search(text)
+        return self.keywords[match.group(0)] if match else None
+
+    def matches(self, text):
+        return self.find(text) is not None
+
+    def find_all(self, text):
+        """Every distinct configured keyword found in `text`, in order of appearance (not EXACT mode)."""
+        if not text or self.mode == EXACT:
+            return [self.find(text)] if self.find(text) else []
+        found = dict.fromkeys(self.keywords[match.group(0)] for match in self.pattern.finditer(text.lower()))
+        return list(found)
+
+@lru_cache(maxsize=None)
+def _compile(keywords, mode):
+    return KeywordMatcher(keywords, mode)
+
+def compile(keywords, mode=SUBSTRING):
+    """Matcher for a keyword list, built once per process and shared by every scraper that asks for it."""
+    return _compile(tuple(keywords), mode)
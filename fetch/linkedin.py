@@ -1,9 +1,11 @@
+import os
 import time
-import random
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+from urllib.parse import quote
 from datetime import datetime, timedelta
 import config  # ✅ Import job keywords & location
+import metrics
+from fetch import deadline, http_client, http_cache, fast_parse, high_water, keyword_matcher, query_planner, replay
 
 # ✅ LinkedIn Request Headers (mimics a browser to avoid detection)
 HEADERS = {
@@ -17,11 +19,15 @@ HEADERS = {
 
 # ✅ Define filtering rules
 EXCLUDED_KEYWORDS = ["video", "social media", "director", "senior"]  # 🚨 Excludes senior roles
+EXCLUDED = keyword_matcher.compile(EXCLUDED_KEYWORDS)
 REQUIRED_LOCATIONS = ["London", "London Area"]  # 🚨 Only accept jobs in these locations
 
+# ✅ Max LinkedIn requests in flight at once on the async path
+CONCURRENCY = int(os.getenv("LINKEDIN_CONCURRENCY", 3))
+
 # ✅ Convert relative date ("1 week ago", "3 weeks ago") to actual date
-def parse_relative_date(date_text):
-    today = datetime.today()
+def parse_relative_date(date_text, today=None):
+    today = today or replay.today()
 
     if "week ago" in date_text or "weeks ago" in date_text:
         weeks = int(date_text.split()[0])  # Extract number
@@ -36,144 +42,341 @@ def parse_relative_date(date_text):
 # ✅ Function to fetch all jobs with strict filtering
 def fetch_all_linkedin_jobs(max_jobs=5, max_per_title=5):
     """
-    Fetches LinkedIn job listings for all keywords in config.py.
-    Limits to max_per_title per job role and max_jobs per keyword.
+    Fetches LinkedIn job listings for all keywords in config.py, merged by the
+    query planner into a few "a" OR "b" searches. Limits to max_per_title per
+    job role and max_jobs per keyword.
     """
-    all_jobs = []
+    all_jobs = deadline.results_list()
+    seen_job_ids = set()  # ✅ Shared by every query: merged queries overlap, each listing is kept once
+
+    for query in query_planner.plan("linkedin", config.JOB_KEYWORDS):
+        if deadline.expired():
+            print("⏰ LinkedIn deadline reached. Returning jobs found so far.")
+            break
 
-    for keyword in config.JOB_KEYWORDS:
-        print(f"\n🔍 Searching for: {keyword.strip()} in {config.LOCATION}")
+        print(f"\n🔍 Searching for: {query.text} in {config.LOCATION}")
 
         jobs = fetch_linkedin_jobs(
-            search_term=keyword.strip(),
+            search_term=query.text,
             location=config.LOCATION,
-            max_jobs=max_jobs, 
-            max_per_title=max_per_title
+            max_jobs=max_jobs * len(query.keywords),
+            max_per_title=max_per_title,
+            seen_job_ids=seen_job_ids,
         )
-
-        if jobs:
-            print(f"✅ Found {len(jobs)} jobs for {keyword.strip()}!")
-            all_jobs.extend(jobs)
-        else:
-            print(f"❌ No jobs found for {keyword.strip()}.")
+        _report_query(query, jobs)
+        all_jobs.extend(jobs)
 
     print(f"\n✅ Scraped {len(all_jobs)} total jobs from LinkedIn.")
     return all_jobs
 
+# ✅ Per-keyword counts for a merged query
+def _report_query(query, jobs):
+    for keyword, matched in query.map_back(jobs).items():
+        if keyword is None:
+            print(f"ℹ️ {len(matched)} jobs matched none of the keywords exactly.")
+        elif matched:
+            print(f"✅ Found {len(matched)} jobs for {keyword}!")
+        else:
+            print(f"❌ No jobs found for {keyword}.")
+
+# ✅ Build the guest-API URL for one results page
+def _search_url(search_term, location, start):
+    return (
+        f"https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search?"
+        f"keywords={quote(search_term)}&location={quote(location)}&start={start}"
+    )
+
+# ✅ Per-keyword search state shared by the sync and async paths
+def _new_search_state(today=None, seen_job_ids=None):
+    """
+    `today` pins the clock for the 14-day filter (defaults to replay.today(): real time unless replaying).
+    `seen_job_ids` is shared between the queries of one run, so a listing two queries return is kept once.
+    """
+    today = today or replay.today()
+    return {
+        "jobs": [],
+        "seen_job_ids": set() if seen_job_ids is None else seen_job_ids,
+        "job_title_counts": {},  # ✅ Track count per job title
+        "today": today,
+        "date_threshold": today - timedelta(days=14),  # ✅ Threshold for 14 days ago
+        "started": time.perf_counter(),  # ✅ For the per-keyword wall time metric
+    }
+
+# ✅ Bump when parse_job_cards' output changes (invalidates cached parses)
+PARSE_VERSION = 1
+
+# ✅ Fields pulled from each card in a single pass: field → (tag, class)
+CARD_FIELDS = {
+    "link": ("a", "base-card__full-link"),
+    "title": ("span", "sr-only"),
+    "company": ("h4", "base-search-card__subtitle"),
+    "location": ("span", "job-search-card__location"),
+    "salary": ("span", "job-search-card__salary-info"),
+    "date": ("time", "job-search-card__listdate"),
+}
+
+# ✅ Extract the raw fields of every card on a results page (no filtering)
+def parse_job_cards(html):
+    """
+    Parses a LinkedIn results page into a list of raw card dicts.
+    Only the card subtrees are built (lxml + SoupStrainer) and each card is walked once.
+    Output is JSON-serialisable so http_cache can reuse it for unchanged pages.
+    """
+    soup = fast_parse.soup_for(html, "div", class_="base-search-card")
+    cards = []
+
+    for job_card in soup.find_all("div", class_="base-search-card"):
+        tags = fast_parse.first_matches(job_card, CARD_FIELDS)
+        href_tag = tags["link"]
+        date_tag = tags["date"]  # ✅ ISO attribute, or "1 week ago" text
+
+        cards.append({
+            "url": href_tag["href"].split("?")[0] if href_tag and "href" in href_tag.attrs else None,
+            "title": tags["title"].get_text(strip=True) if tags["title"] else "N/A",
+            "company": tags["company"].get_text(strip=True) if tags["company"] else "N/A",
+            "location": tags["location"].get_text(strip=True) if tags["location"] else "N/A",
+            "salary": tags["salary"].get_text(strip=True) if tags["salary"] else "Not Provided",
+            "date": date_tag["datetime"] if date_tag and date_tag.has_attr("datetime") else None,
+            "date_text": date_tag.get_text(strip=True).lower() if date_tag else None,
+        })
+
+    return cards
+
+# ✅ Apply all filters to one page of parsed cards
+def _collect_page_jobs(cards, search_term, state, max_jobs, max_per_title):
+    """
+    Adds the cards that pass every filter to state["jobs"].
+    Returns False when the page has no job cards (end of results).
+    """
+    jobs = state["jobs"]
+    seen_job_ids = state["seen_job_ids"]
+    job_title_counts = state["job_title_counts"]
+    today = state["today"]
+    date_threshold = state["date_threshold"]
+
+    if not cards:
+        print(f"❌ No job listings found for {search_term}.")
+        return False
+
+    for card in cards:
+        if len(jobs) >= max_jobs:  # ✅ Stop if we already hit the keyword limit
+            print(f"🚫 Stopping search for {search_term} (max {max_jobs} jobs found)")
+            break
+
+        job_url = card["url"]
+        if not job_url:
+            metrics.inc("jobs_filtered_total", source="linkedin", reason="incomplete")
+            continue
+
+        # ✅ Extract Job ID
+        job_id = job_url.split("-")[-1]
+        if job_id in seen_job_ids:
+            metrics.inc("jobs_filtered_total", source="linkedin", reason="duplicate")
+            continue
+        seen_job_ids.add(job_id)
+
+        title = card["title"]
+        company_name = card["company"]
+        job_location = card["location"]
+        salary = card["salary"]
+
+        # ✅ Validate Job Posting Date
+        job_date = today  # Default to today if no date found
+
+        if card["date_text"] is not None:
+            if card["date"]:  # ✅ Use ISO format date if available
+                job_date = datetime.strptime(card["date"], "%Y-%m-%d")
+            else:  # ✅ Handle "1 week ago" format
+                job_date = parse_relative_date(card["date_text"], today)
+
+            if job_date < date_threshold:
+                print(f"⏳ Skipping job: {title} at {company_name} (Posted {job_date.date()}, over 14 days old)")
+                metrics.inc("jobs_filtered_total", source="linkedin", reason="too_old")
+                continue  # 🚨 Skip old job listings
+
+        # ✅ FILTER OUT JOBS NOT IN LONDON
+        if not any(loc in job_location for loc in REQUIRED_LOCATIONS):
+            print(f"⏳ Skipping job: {title} at {company_name} (Location: {job_location}, not in London)")
+            metrics.inc("jobs_filtered_total", source="linkedin", reason="location")
+            continue  # 🚨 Skip job if not in London
+
+        # ✅ FILTER OUT SENIOR ROLES (Director, Senior)
+        excluded_word = EXCLUDED.find(title)
+        if excluded_word:
+            print(f"⚠️ Skipping job: {title} at {company_name} (Filtered Out: Title contains '{excluded_word}')")
+            metrics.inc("jobs_filtered_total", source="linkedin", reason="excluded_title")
+            continue  # 🚨 Skip job
+
+        # ✅ **LIMIT JOBS PER TITLE (Max 5 per unique title)**
+        if job_title_counts.get(title, 0) >= max_per_title:
+            print(f"⚠️ Skipping extra '{title}' jobs (Already found {max_per_title})")
+            metrics.inc("jobs_filtered_total", source="linkedin", reason="title_cap")
+            continue
+
+        # ✅ Add to job list
+        jobs.append({
+            "title": title,
+            "company": company_name,
+            "location": job_location,
+            "url": job_url,
+            "salary": salary,
+            "date_posted": job_date.strftime("%Y-%m-%d"),  # ✅ Store formatted date
+            "date_added": datetime.utcnow().strftime("%Y-%m-%d"),  # ✅ New field
+            "has_applied": False,  # ✅ New field
+        })
+
+        # ✅ Update count for this title
+        job_title_counts[title] = job_title_counts.get(title, 0) + 1
+        metrics.inc("jobs_kept_total", source="linkedin")
+
+    return True
+
+# ✅ High-water check: has a previous run already seen this whole page?
+def _page_already_seen(search_term, cards):
+    """
+    Records the page's job IDs (and newest posting date) for the next run and returns
+    True if every one of them was seen on a previous run, so deeper pages can be skipped.
+    """
+    job_ids = [card["url"].split("-")[-1] for card in cards if card["url"]]
+    dates = [card["date"] for card in cards if card["date"]]
+
+    already_seen = high_water.all_seen("linkedin", search_term, job_ids)
+    high_water.record("linkedin", search_term, job_ids, newest=max(dates, default=None))
+
+    if already_seen:
+        print(f"🌊 Page already seen on a previous run. Stopping search for {search_term}.")
+    return already_seen
+
 # ✅ Function to fetch LinkedIn jobs for a single keyword
-def fetch_linkedin_jobs(search_term, location, max_jobs=5, max_per_title=5):
+def fetch_linkedin_jobs(search_term, location, max_jobs=5, max_per_title=5, seen_job_ids=None):
     """
     Fetches job listings from LinkedIn for a specific job title.
     Limits results to a maximum per job title and per keyword.
     Filters out jobs posted more than 14 days ago.
     """
-    jobs = []
+    state = _new_search_state(seen_job_ids=seen_job_ids)
     start = 0  # LinkedIn paginates results (increments of 25)
-    seen_job_ids = set()
-    job_title_counts = {}  # ✅ Track count per job title
 
-    # ✅ Get today's date & threshold for 14 days ago
-    today = datetime.today()
-    date_threshold = today - timedelta(days=14)
+    while len(state["jobs"]) < max_jobs and start < 1000 and not deadline.expired():
+        url = _search_url(search_term, location, start)
 
-    while len(jobs) < max_jobs and start < 1000:
-        url = (
-            f"https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search?"
-            f"keywords={search_term}&location={location}&start={start}"
-        )
-
-        response = requests.get(url, headers=HEADERS, timeout=10)
+        response = http_client.get(url, headers=HEADERS, timeout=10, cache=True)
         if response.status_code != 200:
             print(f"❌ LinkedIn request failed with status code: {response.status_code}")
             break
 
-        soup = BeautifulSoup(response.text, "html.parser")
-        job_cards = soup.find_all("div", class_="base-search-card")
+        cards = http_cache.parse_once(url, response.text, parse_job_cards, PARSE_VERSION)
+        if not _collect_page_jobs(cards, search_term, state, max_jobs, max_per_title):
+            break
+        if _page_already_seen(search_term, cards):
+            break
+
+        start += 25  # ✅ Always paginate in increments of 25 (pacing is handled by the rate limiter)
+
+    metrics.observe("keyword_seconds", time.perf_counter() - state["started"], source="linkedin", keyword=search_term)
+    return state["jobs"]
+
+# ✅ Async variant: same pagination & filters, but keywords run concurrently
+async def fetch_linkedin_jobs_async(search_term, location, semaphore, max_jobs=5, max_per_title=5, seen_job_ids=None):
+    """
+    Async version of fetch_linkedin_jobs. Requests are gated by the shared
+    `semaphore` so the global concurrency cap holds across all keywords;
+    the per-domain rate limiter paces them.
+    """
+    state = _new_search_state(seen_job_ids=seen_job_ids)
+    start = 0
+
+    while len(state["jobs"]) < max_jobs and start < 1000 and not deadline.expired():
+        url = _search_url(search_term, location, start)
 
-        if not job_cards:
-            print(f"❌ No job listings found for {search_term}.")
+        async with semaphore:
+            # ✅ propagate: the executor thread gets this worker's deadline (rate limiter sleeps, timeouts)
+            response = await asyncio.to_thread(
+                deadline.propagate(http_client.get), url, headers=HEADERS, timeout=10, cache=True
+            )
+
+        if response.status_code != 200:
+            print(f"❌ LinkedIn request failed with status code: {response.status_code}")
+            break
+
+        cards = http_cache.parse_once(url, response.text, parse_job_cards, PARSE_VERSION)
+        if not _collect_page_jobs(cards, search_term, state, max_jobs, max_per_title):
+            break
+        if _page_already_seen(search_term, cards):
             break
 
-        for job_card in job_cards:
-            if len(jobs) >= max_jobs:  # ✅ Stop if we already hit the keyword limit
-                print(f"🚫 Stopping search for {search_term} (max {max_jobs} jobs found)")
-                break
-
-            # ✅ Extract Job URL
-            href_tag = job_card.find("a", class_="base-card__full-link")
-            if not href_tag or "href" not in href_tag.attrs:
-                continue
-            job_url = href_tag["href"].split("?")[0]
-
-            # ✅ Extract Job ID
-            job_id = job_url.split("-")[-1]
-            if job_id in seen_job_ids:
-                continue
-            seen_job_ids.add(job_id)
-
-            # ✅ Extract Job Title
-            title_tag = job_card.find("span", class_="sr-only")
-            title = title_tag.get_text(strip=True) if title_tag else "N/A"
-
-            # ✅ Extract Company Name
-            company_tag = job_card.find("h4", class_="base-search-card__subtitle")
-            company_name = company_tag.get_text(strip=True) if company_tag else "N/A"
-
-            # ✅ Extract Location
-            location_tag = job_card.find("span", class_="job-search-card__location")
-            job_location = location_tag.get_text(strip=True) if location_tag else "N/A"
-
-            # ✅ Extract Salary (if available)
-            salary_tag = job_card.find("span", class_="job-search-card__salary-info")
-            salary = salary_tag.get_text(strip=True) if salary_tag else "Not Provided"
-
-            # ✅ Extract & Validate Job Posting Date
-            date_tag = job_card.find("time", class_="job-search-card__listdate")
-            job_date = today  # Default to today if no date found
-
-            if date_tag:
-                if date_tag.has_attr("datetime"):  # ✅ Use ISO format date if available
-                    job_date = datetime.strptime(date_tag["datetime"], "%Y-%m-%d")
-                else:  # ✅ Handle "1 week ago" format
-                    relative_date_text = date_tag.get_text(strip=True).lower()
-                    job_date = parse_relative_date(relative_date_text)
-
-                if job_date < date_threshold:
-                    print(f"⏳ Skipping job: {title} at {company_name} (Posted {job_date.date()}, over 14 days old)")
-                    continue  # 🚨 Skip old job listings
-
-            # ✅ FILTER OUT JOBS NOT IN LONDON
-            if not any(loc in job_location for loc in REQUIRED_LOCATIONS):
-                print(f"⏳ Skipping job: {title} at {company_name} (Location: {job_location}, not in London)")
-                continue  # 🚨 Skip job if not in London
-
-            # ✅ FILTER OUT SENIOR ROLES (Director, Senior)
-            for word in EXCLUDED_KEYWORDS:
-                if word.lower() in title.lower():
-                    print(f"⚠️ Skipping job: {title} at {company_name} (Filtered Out: Title contains '{word}')")
-                    continue  # 🚨 Skip job
-
-            # ✅ **LIMIT JOBS PER TITLE (Max 5 per unique title)**
-            if job_title_counts.get(title, 0) >= max_per_title:
-                print(f"⚠️ Skipping extra '{title}' jobs (Already found {max_per_title})")
-                continue
-
-            # ✅ Add to job list
-            jobs.append({
-                "title": title,
-                "company": company_name,
-                "location": job_location,
-                "url": job_url,
-                "salary": salary,
-                "date_posted": job_date.strftime("%Y-%m-%d"),  # ✅ Store formatted date
-                "date_added": datetime.utcnow().strftime("%Y-%m-%d"),  # ✅ New field
-                "has_applied": False,  # ✅ New field
-            })
-
-            # ✅ Update count for this title
-            job_title_counts[title] = job_title_counts.get(title, 0) + 1
-
-        start += 25  # ✅ Always paginate in increments of 25
-        time.sleep(random.uniform(3, 6))  # ✅ Avoid detection
-
-    return jobs
\ No newline at end of file
+        start += 25
+
+    metrics.observe("keyword_seconds", time.perf_counter() - state["started"], source="linkedin", keyword=search_term)
+    return state["jobs"]
+
+async def fetch_all_linkedin_jobs_async(max_jobs=5, max_per_title=5, concurrency=CONCURRENCY):
+    """
+    Fetches LinkedIn job listings for all planned queries concurrently, at most
+    `concurrency` requests in flight. Returns jobs in query order, like
+    fetch_all_linkedin_jobs; a listing several queries return goes to whichever reaches it first.
+    """
+    all_jobs = deadline.results_list()
+    semaphore = asyncio.Semaphore(concurrency)
+    seen_job_ids = set()  # ✅ Shared by every query (they all run on this event loop's thread)
+    queries = query_planner.plan("linkedin", config.JOB_KEYWORDS)
+    keyword_count = sum(len(query.keywords) for query in queries)
+
+    print(f"\n🔍 Searching LinkedIn for {keyword_count} keywords in {len(queries)} queries "
+          f"in {config.LOCATION} ({concurrency} at a time)")
+    results = await asyncio.gather(*(
+        fetch_linkedin_jobs_async(
+            query.text, config.LOCATION, semaphore, max_jobs * len(query.keywords), max_per_title, seen_job_ids
+        )
+        for query in queries
+    ))
+
+    for query, jobs in zip(queries, results):
+        print(f"\n🔍 {query.text}")
+        _report_query(query, jobs)
+        all_jobs.extend(jobs)
+
+    print(f"\n✅ Scraped {len(all_jobs)} total jobs from LinkedIn.")
+    return all_jobs
+
+def iter_linkedin_jobs(max_jobs=5, max_per_title=5, concurrency=CONCURRENCY):
+    """
+    Streaming variant of fetch_all_linkedin_jobs_concurrently: queries run concurrently
+    on a private event loop and each one's jobs are yielded as soon as it finishes.
+    """
+    loop = asyncio.new_event_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    seen_job_ids = set()
+    pending = {
+        loop.create_task(fetch_linkedin_jobs_async(
+            query.text, config.LOCATION, semaphore, max_jobs * len(query.keywords), max_per_title, seen_job_ids
+        )): query
+        for query in query_planner.plan("linkedin", config.JOB_KEYWORDS)
+    }
+
+    try:
+        while pending:
+            done, _ = loop.run_until_complete(asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED))
+            for task in done:
+                query = pending.pop(task)
+                jobs = task.result()
+                print(f"\n🔍 {query.text}")
+                _report_query(query, jobs)
+                yield from jobs
+    finally:
+        # ✅ Consumer stopped early (or a query failed): cancel the rest before closing the loop
+        if pending:
+            for task in pending:
+                task.cancel()
+            loop.run_until_complete(asyncio.wait(pending))
+        loop.run_until_complete(loop.shutdown_default_executor())
+        loop.close()
+
+def fetch_all_linkedin_jobs_concurrently(max_jobs=5, max_per_title=5, concurrency=CONCURRENCY):
+    """Sync entry point for the async LinkedIn path (used by run_scrapers)."""
+    return asyncio.run(fetch_all_linkedin_jobs_async(max_jobs, max_per_title, concurrency))
+
+# ✅ Test Run (python -m fetch.linkedin [--profile])
+if __name__ == "__main__":
+    import profiling
+    profiling.run_main(fetch_all_linkedin_jobs_concurrently, "linkedin")
@@ -0,0 +1,91 @@
+from dataclasses import dataclass
+from fetch import keyword_matcher
+
+# ✅ What each site's search box understands
+#   boolean: supports "quoted phrases" joined with OR
+#   max_length: longest query string we send
+#   max_terms: most OR'd phrases per query (broader queries dilute the results we paginate through)
+SOURCE_SYNTAX = {
+    "linkedin": {"boolean": True, "max_length": 200, "max_terms": 5},
+    "unjobs": {"boolean": False},  # Keyword is a URL slug
+    "workable": {"boolean": False},
+    "glassdoor": {"boolean": False},  # Keyword is encoded into the URL path
+    "ziprecruiter": {"boolean": False},
+}
+
+@dataclass
+class Query:
+    """One search request and the configured keywords it covers."""
+
+    text: str
+    keywords: list
+
+    def map_back(self, jobs, field="title"):
+        """
+        Group a query's jobs by the keyword(s) they match (whole words, case-insensitive).
+        A job can count for several keywords; jobs matching none are listed under None.
+        """
+        matcher = keyword_matcher.compile(self.keywords, mode=keyword_matcher.WORD)
+        by_keyword = {keyword: [] for keyword in self.keywords}
+        for job in jobs:
+            matched = matcher.find_all(job.get(field, ""))
+            for keyword in matched:
+                by_keyword[keyword].append(job)
+            if not matched:
+                by_keyword.setdefault(None, []).append(job)
+        return by_keyword
+
+def _phrase(keyword):
+    return f'"{keyword}"'
+
+def _drop_subsumed(keywords):
+    """
+    Keywords whose phrase contains another keyword's phrase are already covered by that
+    broader search ("Data" finds every "Data Journalist"). Returns (searched, covered_by).
+    """
+    padded = {keyword: f" {keyword.lower()} " for keyword in keywords}  # ✅ Spaces so only whole words count
+    searched, covered_by = [], {}
+    for keyword in keywords:
+        broader = next((other for other in keywords if other != keyword and padded[other] in padded[keyword]), None)
+        if broader:
+            covered_by.setdefault(broader, []).append(keyword)
+        else:
+            searched.append(keyword)
+    return searched, covered_by
+
+def plan(source, keywords):
+    """
+    The fewest queries covering `keywords` on `source`. Sites with boolean search get
+    "a" OR "b" queries packed up to their length/term limits; others get one query per keyword.
+    """
+    unique = {}
+    for keyword in keywords:
+        unique.setdefault(keyword.strip().lower(), keyword.strip())
+    keywords = [keyword for keyword in unique.values() if keyword]
+    syntax = SOURCE_SYNTAX.get(source, {"boolean": False})
+
+    if not syntax["boolean"]:
+        return [Query(keyword, [keyword]) for keyword in keywords]
+
+    searched, covered_by = _drop_subsumed(keywords)
+
+    # ✅ First-fit decreasing: longest phrases first, each into the first query with room for it
+    groups = []
+    for keyword in sorted(searched, key=len, reverse=True):
+        for group in groups:
+            text = " OR ".join(_phrase(k) for k in group + [keyword])
+            if len(group) < syntax["max_terms"] and len(text) <= syntax["max_length"]:
+                group.append(keyword)
+                break
+        else:
+            groups.append([keyword])
+
+    queries = []
+    for group in groups:
+        group.sort(key=keywords.index)  # ✅ Keep config order inside each query
+        covered = [k for keyword in group for k in [keyword] + covered_by.get(keyword, [])]
+        text = _phrase(group[0]) if len(group) == 1 else " OR ".join(_phrase(k) for k in group)
+        queries.append(Query(text, covered))
+
+    queries.sort(key=lambda query: keywords.index(query.keywords[0]))
+    return queries
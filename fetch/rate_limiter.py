@@ -0,0 +1,128 @@
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from fetch import deadline
+
+# ✅ Per-domain limits in requests/second: (start, floor, ceiling)
+DOMAIN_LIMITS = {
+    "www.linkedin.com": (0.25, 0.05, 0.6),
+    "unjobs.org": (0.15, 0.03, 0.5),
+    "www.ziprecruiter.com": (0.25, 0.05, 1.0),
+}
+DEFAULT_LIMITS = (1.0, 0.1, 4.0)
+
+BURST = 2  # Tokens a quiet domain can bank
+ADDITIVE_STEP = 0.02  # Rate gained per successful response (req/s)
+BACKOFF_FACTOR = 0.5  # Rate multiplier when the server pushes back
+JITTER = 0.2  # ± fraction added to every wait so requests don't look clockwork
+MAX_RETRY_AFTER = 120  # Longest Retry-After honoured (seconds); longer hints are clamped
+
+# ✅ Responses that mean "slow down"
+PUSHBACK_STATUSES = {403, 429}
+
+class _Bucket:
+    """Token bucket for one domain whose refill rate moves with server feedback (AIMD)."""
+
+    def __init__(self, rate, min_rate, max_rate):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.tokens = 1.0
+        self.updated = time.monotonic()
+        self.last_backoff = 0.0
+        self.requests = 0
+        self.pushbacks = 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(BURST, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return now
+
+    def reserve(self):
+        """Take a token (possibly borrowing from the future) and return how long to wait for it."""
+        self._refill()
+        self.tokens -= 1
+        self.requests += 1
+        return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+    def back_off(self, delay):
+        """Multiplicative decrease, plus a pause of `delay` seconds before the next token."""
+        now = self._refill()
+        self.pushbacks += 1
+
+        # ✅ In-flight requests often fail together: count that as one congestion signal
+        if now - self.last_backoff >= 1 / self.rate:
+            self.rate = max(self.min_rate, self.rate * BACKOFF_FACTOR)
+            self.last_backoff = now
+
+        if delay is None:
+            delay = 1 / self.rate  # ✅ No hint from the server: wait one (slower) interval
+        # ✅ Owing `delay` seconds' worth of tokens pushes every queued request back
+        self.tokens = min(self.tokens, 0.0) - delay * self.rate
+
+    def speed_up(self):
+        """Additive increase after a successful response."""
+        self.rate = min(self.max_rate, self.rate + ADDITIVE_STEP)
+
+_buckets = {}
+_lock = threading.Lock()
+
+def _bucket(domain):
+    if domain not in _buckets:
+        _buckets[domain] = _Bucket(*DOMAIN_LIMITS.get(domain, DEFAULT_LIMITS))
+    return _buckets[domain]
+
+def acquire(domain):
+    """
+    Block until a request to `domain` is allowed. Shared by every thread hitting that domain.
+    The wait never runs past the calling worker's deadline.
+    """
+    with _lock:
+        wait = _bucket(domain).reserve()
+    if wait > 0:
+        deadline.sleep(wait * random.uniform(1 - JITTER, 1 + JITTER))
+
+def _retry_after_seconds(value):
+    """Parse a Retry-After header (seconds or HTTP date) into seconds, clamped to MAX_RETRY_AFTER."""
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(MAX_RETRY_AFTER, max(0.0, seconds))
+
+def feedback(domain, status_code, retry_after=None):
+    """
+    Adjust `domain`'s rate from a response: additive increase on success,
+    multiplicative decrease on 403/429/5xx, honouring Retry-After.
+    """
+    with _lock:
+        bucket = _bucket(domain)
+
+        if status_code in PUSHBACK_STATUSES or status_code >= 500:
+            bucket.back_off(_retry_after_seconds(retry_after))
+            print(f"🐢 {domain} returned {status_code}. Slowing to {bucket.rate:.2f} req/s for now.")
+        elif status_code < 400:
+            bucket.speed_up()
+
+def limiter_stats():
+    """Return {domain: {"rate", "requests", "pushbacks"}} for every domain seen so far."""
+    with _lock:
+        return {
+            domain: {"rate": round(b.rate, 3), "requests": b.requests, "pushbacks": b.pushbacks}
+            for domain, b in _buckets.items()
+        }
+
+def print_limiter_stats():
+    """Print where each domain's rate ended up."""
+    for domain, stats in sorted(limiter_stats().items()):
+        print(
+            f"🚦 {domain}: {stats['requests']} requests, {stats['pushbacks']} pushbacks, "
+            f"ending at {stats['rate']} req/s"
+        )
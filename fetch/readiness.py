@@ -0,0 +1,97 @@
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+from fetch import deadline, replay
+
+# ✅ How often conditions are re-checked (seconds)
+POLL_INTERVAL = 0.1
+
+# ✅ Number of resource timing entries the page has recorded so far
+_RESOURCE_COUNT_JS = "return window.performance.getEntriesByType('resource').length;"
+
+def _wait(driver, timeout, condition):
+    """Run a WebDriverWait; return its value, or None once `timeout` (or the worker's deadline) passes."""
+    timeout = deadline.capped(timeout)
+    if replay.replaying():
+        timeout = 0  # ✅ Recorded pages never change: check the condition once
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL).until(condition)
+    except TimeoutException:
+        return None
+
+def wait_for_page_load(driver, timeout=10):
+    """Wait until document.readyState is 'complete'."""
+    return bool(_wait(driver, timeout, lambda d: d.execute_script("return document.readyState") == "complete"))
+
+def wait_for_element(driver, css, timeout=10):
+    """Wait for the first element matching `css` and return it (None if it never appeared)."""
+    return _wait(driver, timeout, EC.presence_of_element_located((By.CSS_SELECTOR, css)))
+
+def wait_for_selector(driver, css, timeout=10):
+    """Wait until at least one element matches `css`. Returns True if it appeared in time."""
+    return wait_for_element(driver, css, timeout) is not None
+
+def count(driver, css):
+    """Number of elements currently matching `css`."""
+    return len(driver.find_elements(By.CSS_SELECTOR, css))
+
+def wait_for_count_increase(driver, css, previous, timeout=10):
+    """
+    Wait until more than `previous` elements match `css` (e.g. after "Show more").
+    Returns the new count, or `previous` if nothing new arrived in time.
+    """
+    new_count = _wait(driver, timeout, lambda d: count(d, css) > previous and count(d, css))
+    return new_count or previous
+
+def wait_for_network_idle(driver, idle_time=0.5, timeout=10):
+    """
+    Wait until the page has started no new network requests for `idle_time` seconds.
+    Returns True if the page went idle before `timeout`.
+    """
+    state = {"count": -1, "stable_polls": 0}
+    polls_needed = max(1, int(idle_time / POLL_INTERVAL))
+
+    def idle(d):
+        current = d.execute_script(_RESOURCE_COUNT_JS)
+        if current == state["count"]:
+            state["stable_polls"] += 1
+        else:
+            state["count"], state["stable_polls"] = current, 0
+        return state["stable_polls"] >= polls_needed
+
+    return bool(_wait(driver, timeout, idle))
+
+def wait_until_gone(driver, by, value, timeout=5):
+    """Wait until the element at (by, value) is hidden or removed."""
+    return bool(_wait(driver, timeout, EC.invisibility_of_element_located((by, value))))
+
+def click_first_present(driver, locators, timeout=2):
+    """
+    Click whichever of `locators` [(by, value), ...] becomes clickable first.
+    Returns the locator that was clicked, or None if none showed up within `timeout`.
+    """
+    def first_clickable(d):
+        for locator in locators:
+            element = EC.element_to_be_clickable(locator)(d)
+            if element:
+                return locator, element
+        return False
+
+    found = _wait(driver, timeout, first_clickable)
+    if found is None:
+        return None
+    locator, element = found
+    driver.execute_script("arguments[0].click();", element)
+    return locator
+
+def click_if_present(driver, by, value, timeout=2):
+    """
+    Click the element at (by, value) once it is clickable.
+    Returns False if it doesn't show up within `timeout`.
+    """
+    element = _wait(driver, timeout, EC.element_to_be_clickable((by, value)))
+    if element is None:
+        return False
+    driver.execute_script("arguments[0].click();", element)
+    return True
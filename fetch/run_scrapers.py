@@ -1,34 +1,238 @@
 import sys
 import os
+import time
+import threading
+import queue
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-# ✅ Import job keywords & location from config
-from config import JOB_KEYWORDS, LOCATION  
+import metrics
 
-# ✅ Import scrapers
-from fetch import ifyoucould, unjobs, workable, linkedin
-# from fetch.glassdoor import fetch_glassdoor_jobs  # ✅ Uncomment to enable Glassdoor
+# ✅ Scrapers are looked up in the fetch registry, so only the selected sources' modules get imported
+import fetch
+from fetch import deadline, http_client, http_cache, rate_limiter, high_water
 
-def fetch_jobs():
-    """Fetch job listings dynamically from all sources using job keywords and location."""
-    print("\n⏳ Running job scrapers...")
+# ✅ Sources to run by default (SCRAPER_SOURCES=linkedin,unjobs to pick others, e.g. glassdoor or ziprecruiter)
+DEFAULT_SOURCES = ["linkedin", "ifyoucould", "unjobs", "workable"]
+
+def selected_sources(names=None):
+    """The sources to run: `names`, else SCRAPER_SOURCES, else DEFAULT_SOURCES (unknown names raise)."""
+    if names is None:
+        env = os.getenv("SCRAPER_SOURCES")
+        names = [name.strip() for name in env.split(",") if name.strip()] if env else DEFAULT_SOURCES
+    unknown = [name for name in names if name not in fetch.REGISTRY]
+    if unknown:
+        raise ValueError(f"❌ Unknown job source(s): {', '.join(unknown)}. Choose from: {', '.join(fetch.JOB_SOURCES)}")
+    return list(names)
+
+# ✅ Jobs buffered between the scrapers and storage; a full queue pauses the scrapers
+QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", 200))
+# ✅ How often stream_jobs wakes an idle consumer (so it can flush a partial batch)
+IDLE_TICK = 1.0
+
+# ✅ Wall-clock budget per source in seconds (override all with SCRAPER_DEADLINE)
+DEFAULT_DEADLINE = int(os.getenv("SCRAPER_DEADLINE", 900))
+SOURCE_DEADLINES = {
+    "linkedin": DEFAULT_DEADLINE,
+    "ifyoucould": DEFAULT_DEADLINE,
+    "unjobs": DEFAULT_DEADLINE,
+    "workable": DEFAULT_DEADLINE,
+}
+
+# ✅ Extra time a source gets to wind down after its deadline before we stop waiting
+GRACE_PERIOD = 30
+
+# ✅ source → its streaming thread, so a source still stuck from an earlier run isn't started twice
+_producers = {}
+
+def _run_source(name, scraper, seconds, results):
+    """Worker body: run one scraper with its deadline armed."""
+    deadline.start(seconds, results)
+    started = time.perf_counter()
+    try:
+        jobs = scraper()
+        # ✅ Scrapers that don't use deadline.results_list() return a fresh list
+        if jobs is not results:
+            results[:] = jobs
+    except Exception as e:
+        print(f"❌ {name} scraper failed: {e} (keeping {len(results)} partial results)")
+        metrics.inc("source_errors_total", source=name)
+    finally:
+        deadline.clear()
+        metrics.observe("source_seconds", time.perf_counter() - started, source=name)
+
+def fetch_jobs_concurrently(deadlines=None, sources=None):
+    """
+    Run every selected source in its own worker thread, each with its own deadline.
+    Returns the same {source: [jobs]} dict as fetch_jobs; a source that overruns
+    contributes whatever it had collected when we stopped waiting.
+    """
+    deadlines = {**SOURCE_DEADLINES, **(deadlines or {})}
+    # ✅ Resolve (import) the scrapers here, not in the workers, so imports never race each other
+    scrapers = {name: fetch.scraper(name) for name in selected_sources(sources)}
+    results = {name: [] for name in scrapers}
+    workers = {}
+
+    for name, scraper in scrapers.items():
+        seconds = deadlines.get(name, DEFAULT_DEADLINE)
+        # ✅ Daemon threads so a hung source can never block interpreter exit
+        worker = threading.Thread(
+            target=_run_source,
+            args=(name, scraper, seconds, results[name]),
+            name=f"scraper-{name}",
+            daemon=True,
+        )
+        worker.start()
+        workers[name] = (worker, time.monotonic() + seconds + GRACE_PERIOD)
+
+    for name, (worker, give_up_at) in workers.items():
+        worker.join(max(0.0, give_up_at - time.monotonic()))
+        if worker.is_alive():
+            print(f"⏰ {name} overran its deadline. Returning {len(results[name])} partial results.")
+            results[name] = list(results[name])  # ✅ Snapshot so the stuck worker can't mutate it later
+
+    return results
+
+def _stream_source(name, stream, seconds, out, stop):
+    """Worker body: run one source's generator with its deadline armed, feeding the shared queue."""
+    deadline.start(seconds, None)
+    started = time.perf_counter()
+    count = 0
+    jobs = None
+    try:
+        jobs = stream()
+        for job in jobs:
+            if not _put(out, (name, job), stop):
+                print(f"🛑 {name} stopped after {count} jobs: nothing is reading them any more.")
+                break
+            count += 1
+    except Exception as e:
+        print(f"❌ {name} scraper failed: {e} (after streaming {count} jobs)")
+        metrics.inc("source_errors_total", source=name)
+    finally:
+        if hasattr(jobs, "close"):
+            jobs.close()  # ✅ Runs the generator's own cleanup (event loop, browser leases) now
+        deadline.clear()
+        metrics.observe("source_seconds", time.perf_counter() - started, source=name)
+        _put(out, (name, None), stop)  # ✅ End-of-source marker
 
-    jobs = {
-        "linkedin": linkedin.fetch_all_linkedin_jobs(),
-        "ifyoucould": ifyoucould.fetch_ifyoucould_jobs(),
-        "unjobs": unjobs.fetch_unjobs(),
-        "workable": workable.fetch_workable_jobs(),
+def _put(out, item, stop):
+    """Queue `item`, waiting while the queue is full, unless `stop` is set first. Returns whether it was queued."""
+    while not stop.is_set():
+        try:
+            out.put(item, timeout=IDLE_TICK)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def stream_jobs(deadlines=None, queue_size=QUEUE_SIZE, sources=None, keep_warm=False):
+    """
+    Run every selected source's generator in its own worker thread and yield (source, job) pairs as
+    they're parsed, through a bounded queue so memory stays flat however much is scraped.
+    Yields None after IDLE_TICK seconds without a job, so consumers can flush on a timer.
+    Stops once every source has finished or overrun its deadline (or the caller stops reading), then does
+    fetch_jobs' wrap-up; sources whose jobs will no longer be read are told to stop. keep_warm leaves the browser pool running for the next run in the same process (daemon.py).
+    """
+    print("\n⏳ Streaming job scrapers...")
+    started = time.perf_counter()
+    deadlines = {**SOURCE_DEADLINES, **(deadlines or {})}
+    out = queue.Queue(maxsize=queue_size)
+    give_up_at = {}
+    stops = {}
+    streams = {}
+    for name in selected_sources(sources):
+        if name in _producers and _producers[name].is_alive():
+            print(f"⚠️ {name} is still winding down from an earlier run. Skipping it this time.")
+            metrics.inc("source_errors_total", source=name)
+        else:
+            streams[name] = fetch.stream(name)
+    counts = {name: 0 for name in streams}
+
+    for name, stream in streams.items():
+        seconds = deadlines.get(name, DEFAULT_DEADLINE)
+        stops[name] = threading.Event()
+        _producers[name] = threading.Thread(
+            target=_stream_source,
+            args=(name, stream, seconds, out, stops[name]),
+            name=f"scraper-{name}",
+            daemon=True,
+        )
+        _producers[name].start()
+        give_up_at[name] = time.monotonic() + seconds + GRACE_PERIOD
+
+    try:
+        while give_up_at:
+            for name in [name for name, at in give_up_at.items() if time.monotonic() >= at]:
+                print(f"⏰ {name} overran its deadline. Stopped after {counts[name]} jobs.")
+                del give_up_at[name]
+                stops[name].set()
+            if not give_up_at:
+                break
+
+            try:
+                name, job = out.get(timeout=IDLE_TICK)
+            except queue.Empty:
+                yield None
+                continue
+
+            if job is None:
+                print(f"✅ {name} finished: {counts[name]} jobs streamed.")
+                give_up_at.pop(name, None)
+            elif name in give_up_at:
+                counts[name] += 1
+                yield name, job
+    finally:
+        for stop in stops.values():
+            stop.set()  # ✅ Unblocks any producer still waiting to queue a job nobody will read
+        metrics.observe("stage_seconds", time.perf_counter() - started, stage="fetch")
+        _finish_run(keep_warm)
+
+def _finish_run(keep_warm=False):
+    """
+    Stats and browser shutdown (unless keep_warm) once every source is done.
+    High-water marks are saved by the caller, once the jobs are stored (see main.store_then_mark).
+    """
+    # ✅ Confirm connections are actually being reused
+    http_client.print_pool_stats()
+    rate_limiter.print_limiter_stats()
+    http_cache.print_cache_stats()
+    high_water.print_high_water_stats()
+
+    # ✅ Chrome is shared by the Selenium scrapers, so close it once they're all done (if any ran)
+    browser_pool = sys.modules.get("fetch.browser_pool")
+    if browser_pool and not keep_warm:
+        browser_pool.shutdown()
+
+def component_stats():
+    """The numbers _finish_run prints, for the run's metrics report."""
+    return {
+        "http_pool": http_client.pool_stats(),
+        "rate_limiter": rate_limiter.limiter_stats(),
+        "http_cache": http_cache.cache_stats(),
+        "high_water": high_water.high_water_stats(),
     }
 
-    # ✅ Add Glassdoor back but keep it commented out
-    # print("\n🔍 Fetching Glassdoor jobs...")
-    # jobs["glassdoor"] = fetch_glassdoor_jobs(JOB_KEYWORDS, LOCATION)  # ✅ Calls the correct function
+def fetch_jobs(concurrent=True, sources=None, keep_warm=False):
+    """Fetch job listings dynamically from the selected sources using job keywords and location."""
+    print("\n⏳ Running job scrapers...")
+
+    with metrics.timer("stage_seconds", stage="fetch"):
+        if concurrent:
+            jobs = fetch_jobs_concurrently(sources=sources)
+        else:
+            jobs = {}
+            for name in selected_sources(sources):
+                with metrics.timer("source_seconds", source=name):
+                    jobs[name] = fetch.scraper(name)()
+
+    _finish_run(keep_warm)
 
     return jobs  # ✅ Now only returning jobs, not storing them
 
-def run_scrapers():
-    """Run all scrapers and return job data."""
-    return fetch_jobs()  # ✅ Now just returning jobs
+def run_scrapers(concurrent=True, sources=None, keep_warm=False):
+    """Run the selected scrapers and return job data."""
+    return fetch_jobs(concurrent=concurrent, sources=sources, keep_warm=keep_warm)  # ✅ Now just returning jobs
 
 if __name__ == "__main__":
-    run_scrapers()
\ No newline at end of file
+    import profiling
+    profiling.run_main(run_scrapers, "run_scrapers")
@@ -2,13 +2,13 @@ import sys
 import os
 import time
 import random
-import cloudscraper
-from bs4 import BeautifulSoup
 from datetime import datetime
 
 # ✅ Ensure script finds `config.py`
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 import config  # Import job keywords & location
+import metrics
+from fetch import deadline, http_client, http_cache, fast_parse, high_water, keyword_matcher, query_planner
 
 BASE_URL = "https://unjobs.org/search/{query}"  # ✅ Correct search format
 
@@ -19,96 +19,139 @@ USER_AGENTS = [
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.77 Safari/537.36",
 ]
 
-def fetch_unjobs():
-    """Scrapes job listings from UN Jobs using CloudScraper."""
-    print("🔍 Scraping UN Jobs...")
-
-    scraper = cloudscraper.create_scraper()  # ✅ Bypasses Cloudflare
+# ✅ Titles must contain one of the configured keywords (compiled once, shared with other scrapers)
+KEYWORDS = keyword_matcher.compile(config.JOB_KEYWORDS)
+
+# ✅ Bump when parse_listing_page's output changes (invalidates cached parses)
+PARSE_VERSION = 1
+
+def _absolute(url):
+    """UN Jobs mixes relative and absolute links."""
+    return url if url.startswith("https://") else "https://unjobs.org" + url
+
+def parse_listing_page(html):
+    """
+    Extracts job titles/links and the "Next >" link from a search results page.
+    Output is JSON-serialisable so http_cache can reuse it for unchanged pages.
+    """
+    # ✅ Only build the job links and pagination links
+    soup = fast_parse.soup_for(html, "a", class_=["jtitle", "ts"])
+
+    # ✅ Extract job listings
+    listings = [
+        {"title": job_element.text.strip(), "url": _absolute(job_element["href"])}
+        for job_element in soup.select("a.jtitle")  # Finds job titles & links
+    ]
+
+    # ✅ Find "Next >" button for pagination
+    next_button = soup.select_one("a.ts")
+    next_url = _absolute(next_button["href"]) if next_button else None
+
+    return {"listings": listings, "next": next_url}
+
+def filter_listings(listings):
+    """Jobs for the listings that match a keyword and are in London (no I/O; see benchmarks/suite.py)."""
+    jobs = []
+    for listing in listings:
+        title = listing["title"]
+        url = listing["url"]
+
+        # ✅ Filter by Keywords (Loosely Matches Job Titles)
+        if not KEYWORDS.matches(title):
+            metrics.inc("jobs_filtered_total", source="unjobs", reason="keyword")
+            continue  
+
+        # ✅ Filter by Location (Must Contain "London")
+        if "London" not in title:
+            metrics.inc("jobs_filtered_total", source="unjobs", reason="location")
+            continue  
+
+        print(f"🆕 Job Found: {title}")
+        print(f"🔗 Job Link: {url}")
+
+        metrics.inc("jobs_kept_total", source="unjobs")
+        jobs.append({
+            "title": title,
+            "company": "UN Jobs",
+            "location": "London",
+            "url": url,
+            "date_added": datetime.utcnow().strftime("%Y-%m-%d"),  # ✅ New field
+            "has_applied": False,  # ✅ New field
+        })
+
+    return jobs
+
+def iter_unjobs():
+    """Yields UN Jobs listings one at a time, as each results page is parsed."""
     headers = {"User-Agent": random.choice(USER_AGENTS)}
 
-    all_jobs = []
+    # ✅ One query per keyword (UN Jobs searches a URL slug), deduplicated by the planner
+    for query in query_planner.plan("unjobs", config.JOB_KEYWORDS):
+        job_keyword = query.text
+        if deadline.expired():
+            print("⏰ UN Jobs deadline reached. Returning jobs found so far.")
+            break
 
-    for job_keyword in config.JOB_KEYWORDS:
-        query = job_keyword.lower().replace(" ", "-")  
-        search_url = BASE_URL.format(query=query)  
+        keyword_started = time.perf_counter()
+        slug = job_keyword.lower().replace(" ", "-")
+        search_url = BASE_URL.format(query=slug)
         print(f"\n🌍 Searching for '{job_keyword}' → {search_url}")
 
         visited_pages = set()  # ✅ Track visited pages to avoid loops
         current_page = search_url
 
-        while current_page:
+        while current_page and not deadline.expired():
             if current_page in visited_pages:
                 print(f"⚠️ Loop detected! Already visited {current_page}. Stopping pagination.")
                 break  # ✅ Stop if we are looping
             visited_pages.add(current_page)
 
             print(f"🔄 Fetching page: {current_page}")
-            response = scraper.get(current_page, headers=headers)
+            # ✅ Bypasses Cloudflare; a 403 backs the limiter off and retries once
+            response = http_client.get(current_page, headers=headers, kind="cloudscraper", retries=1, cache=True)
 
             if response.status_code == 403:
-                print("❌ Forbidden (403). Adding delay and retrying...")
-                time.sleep(random.randint(5, 10))  # 🔄 Add a longer delay
-                response = scraper.get(current_page, headers=headers)
-
-                if response.status_code == 403:
-                    print("❌ Still Forbidden. Skipping this search term.")
-                    break
-
-            soup = BeautifulSoup(response.text, "html.parser")
-
-            # ✅ Extract job listings
-            job_elements = soup.select("a.jtitle")  # Finds job titles & links
-
-            print(f"📌 Found {len(job_elements)} job elements for '{job_keyword}'.")
-
-            for job_element in job_elements:
-                title = job_element.text.strip()
-                url = job_element["href"]
+                print("❌ Still Forbidden. Skipping this search term.")
+                break
 
-                # ✅ Ensure absolute URL
-                if not url.startswith("https://"):
-                    url = "https://unjobs.org" + url  
+            page = http_cache.parse_once(current_page, response.text, parse_listing_page, PARSE_VERSION)
 
-                # ✅ Filter by Keywords (Loosely Matches Job Titles)
-                if not any(kw.lower() in title.lower() for kw in config.JOB_KEYWORDS):
-                    continue  
+            print(f"📌 Found {len(page['listings'])} job elements for '{job_keyword}'.")
 
-                # ✅ Filter by Location (Must Contain "London")
-                if "London" not in title:
-                    continue  
+            yield from filter_listings(page["listings"])
 
-                print(f"🆕 Job Found: {title}")
-                print(f"🔗 Job Link: {url}")
-
-                all_jobs.append({
-                    "title": title,
-                    "company": "UN Jobs",
-                    "location": "London",
-                    "url": url,
-                    "date_added": datetime.utcnow().strftime("%Y-%m-%d"),  # ✅ New field
-                    "has_applied": False,  # ✅ New field
-                })
-
-            # ✅ Find "Next >" button for pagination
-            next_button = soup.select_one("a.ts")
-            if next_button:
-                next_url = next_button["href"]
-
-                # ✅ Fix the issue where the base URL is already included
-                if not next_url.startswith("https://"):
-                    next_url = "https://unjobs.org" + next_url
+            # ✅ Every listing here was seen on a previous run: older pages won't have anything new
+            listing_urls = [listing["url"] for listing in page["listings"]]
+            already_seen = high_water.all_seen("unjobs", job_keyword, listing_urls)
+            high_water.record("unjobs", job_keyword, listing_urls)
+            if already_seen:
+                print("🌊 Page already seen on a previous run. Moving to next search.")
+                break
 
+            # ✅ Follow the "Next >" link
+            next_url = page["next"]
+            if next_url:
                 if next_url in visited_pages:
                     print("⚠️ Pagination Loop Detected. Stopping.")
                     break  # ✅ Stop if we are looping
 
                 print(f"➡️ Clicking 'Next' to load more jobs... → {next_url}")
-                current_page = next_url
-                time.sleep(random.randint(5, 10))  # ✅ Random delay to prevent rate-limiting
+                current_page = next_url  # ✅ The rate limiter spaces out the next request
             else:
                 print(f"✅ No more pages for '{job_keyword}'. Moving to next search.")
                 break  # Stop loop if no more pages
 
+        # ✅ Includes time the consumer held the generator (storage, when streaming)
+        metrics.observe("keyword_seconds", time.perf_counter() - keyword_started, source="unjobs", keyword=job_keyword)
+
+def fetch_unjobs():
+    """Scrapes job listings from UN Jobs using CloudScraper."""
+    print("🔍 Scraping UN Jobs...")
+
+    all_jobs = deadline.results_list()
+    for job in iter_unjobs():
+        all_jobs.append(job)
+
     # ✅ Print results at the end for debugging
     print("\n🔍 FINAL JOB LISTINGS:")
     for job in all_jobs:
@@ -123,4 +166,5 @@ def fetch_unjobs():
 
 # ✅ Test Run
 if __name__ == "__main__":
-    fetch_unjobs()
\ No newline at end of file
+    import profiling
+    profiling.run_main(fetch_unjobs, "unjobs")
\ No newline at end of file
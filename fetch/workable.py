@@ -2,108 +2,161 @@ import sys
 import os
 import time
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
+from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 
 # ✅ Ensure script finds `config.py`
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 import config  # Import the config file
+import metrics
+from fetch import deadline, browser_pool, readiness, replay, keyword_matcher, query_planner
 
 BASE_URL = "https://jobs.workable.com/search?location=London&query={query}&employment_type=full_time&day_range=30"
+JOB_CARD_SELECTOR = ".jobCardDetails__job-breakdown--AnIQr"
+COOKIE_DECLINE_SELECTOR = "button[data-ui='cookie-consent-decline']"
+LOAD_MORE_SELECTOR = "button[data-ui='load-more-button']"
+
+# ✅ Titles must contain one of the configured keywords (compiled once, shared with other scrapers)
+KEYWORDS = keyword_matcher.compile(config.JOB_KEYWORDS)
+
+def _text(tag):
+    """Visible text of a tag with whitespace collapsed (matches Selenium's .text)."""
+    return " ".join(tag.get_text(" ").split())
+
+def parse_job_cards(html):
+    """
+    Extracts title, company and link from every job card in a rendered search page.
+    Cards missing any of them come back with None for that field.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    cards = []
+
+    for job in soup.select(JOB_CARD_SELECTOR):
+        title_tag = job.select_one("h2[data-ui='job-card-title'] a")
+        company_tag = job.select_one("h3[data-ui='job-card-company-label'] a")
+
+        cards.append({
+            "title": _text(title_tag) if title_tag else None,
+            "company": _text(company_tag) if company_tag else None,
+            "url": title_tag.get("href") if title_tag else None,
+        })
+
+    return cards
+
+def filter_job_cards(cards, keyword):
+    """Jobs for the complete cards whose title matches a keyword (no I/O; see benchmarks/suite.py)."""
+    jobs = []
+
+    for card in cards:
+        title = card["title"]
+        company = card["company"]
+        job_link = card["url"]
+
+        if title is None or company is None or not job_link:
+            print("⚠️ Skipping a job due to a missing title, company or link")
+            metrics.inc("jobs_filtered_total", source="workable", reason="incomplete")
+            continue  # Skip if any element is missing
+
+        # ✅ Extract full job link
+        full_job_link = f"https://jobs.workable.com{job_link}" if job_link.startswith("/") else job_link
+
+        # ✅ Strict Title Filtering (Ensures Job Title Matches Keywords)
+        if not KEYWORDS.matches(title):
+            print(f"⚠️ Skipping '{title}' - Does Not Match Exact Keyword '{keyword}'")
+            metrics.inc("jobs_filtered_total", source="workable", reason="keyword")
+            continue
+
+        print(f"🆕 Job Found: {title} at {company}")
+        print(f"🔗 Job Link: {full_job_link}")
+
+        jobs.append({
+            "title": title,
+            "company": company,
+            "location": "London",
+            "url": full_job_link,  # ✅ Stores the full job URL
+            "date_added": datetime.utcnow().strftime("%Y-%m-%d"),  # ✅ New field
+            "has_applied": False,  # ✅ New field
+        })
+
+    metrics.inc("jobs_kept_total", len(jobs), source="workable")
+    return jobs
+
+def _scrape_keyword(driver, keyword):
+    """Loads the Workable search for one keyword in a pooled browser and extracts matching jobs."""
+    query = keyword.replace(" ", "+")  # Format search query
+    query_url = BASE_URL.format(query=query)  # Insert formatted query into the URL
+    print(f"🌍 Navigating to {query_url} (Query: {keyword})")
+    started = time.perf_counter()
+    driver.get(query_url)
+    metrics.inc("page_loads_total", source="workable")
+
+    # ✅ Wait for JavaScript to render the first job cards (returns as soon as they exist)
+    if not readiness.wait_for_selector(driver, JOB_CARD_SELECTOR, timeout=10):
+        print(f"⚠️ No job cards rendered for '{keyword}' within 10s.")
+
+    # ✅ Handle Cookie Popup
+    print("🍪 Checking for cookie popup...")
+    if readiness.click_if_present(driver, By.CSS_SELECTOR, COOKIE_DECLINE_SELECTOR, timeout=1):
+        readiness.wait_until_gone(driver, By.CSS_SELECTOR, COOKIE_DECLINE_SELECTOR, timeout=2)
+        print("✅ Cookie popup declined!")
+    else:
+        print("⚠️ No cookie popup found or already dismissed.")
+
+    # ✅ Click "Show More Jobs" up to 3 times
+    max_clicks = 3
+    click_count = 0
+    card_count = readiness.count(driver, JOB_CARD_SELECTOR)
+
+    while click_count < max_clicks:
+        try:
+            show_more_button = driver.find_element(By.CSS_SELECTOR, LOAD_MORE_SELECTOR)
+            show_more_button.click()
+        except Exception:
+            print("✅ No more 'Show More Jobs' button found or end of jobs reached.")
+            break  # Exit loop when no button is found
+
+        click_count += 1
+        print(f"🔽 Clicked 'Show More Jobs' button #{click_count}...")
+
+        # ✅ Continue as soon as new cards arrive; stop if none do
+        new_count = readiness.wait_for_count_increase(driver, JOB_CARD_SELECTOR, card_count, timeout=5)
+        if new_count == card_count:
+            print("✅ 'Show More Jobs' loaded nothing new. End of jobs reached.")
+            break
+        card_count = new_count
+
+    print(f"🔍 Searching for job elements after {click_count} load-more clicks...")
+    page_source = replay.page_source(driver, query_url)
+    with metrics.timer("parse_seconds", parser="fetch.workable.parse_job_cards"):
+        cards = parse_job_cards(page_source)
+    print(f"📌 Found {len(cards)} job elements for '{keyword}'.")
+
+    jobs = filter_job_cards(cards, keyword)
+    metrics.observe("keyword_seconds", time.perf_counter() - started, source="workable", keyword=keyword)
+    return jobs
+
+def iter_workable_jobs():
+    """Yields Workable jobs keyword by keyword, as each search finishes loading."""
+    # ✅ Keywords run in parallel across the shared browser pool
+    searches = [query.text for query in query_planner.plan("workable", config.JOB_KEYWORDS)]
+    for keyword_jobs in browser_pool.map_pages(_scrape_keyword, searches):
+        yield from keyword_jobs
 
 def fetch_workable_jobs():
     """Scrapes job listings from Workable Jobs using Selenium"""
     print("🔍 Starting Workable Jobs Scraper...")
 
-    # Set up Chrome options
-    options = Options()
-    options.add_argument("--headless")  # Run in background
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-
-    print("🚀 Launching Chrome Browser...")
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-
-    jobs = []
+    jobs = deadline.results_list()
+    for job in iter_workable_jobs():
+        jobs.append(job)
 
-    for keyword in config.JOB_KEYWORDS:
-        query = keyword.replace(" ", "+")  # Format search query
-        query_url = BASE_URL.format(query=query)  # Insert formatted query into the URL
-        print(f"🌍 Navigating to {query_url} (Query: {keyword})")
-        driver.get(query_url)
-        time.sleep(5)  # Wait for JavaScript to load jobs
+    if deadline.expired():
+        print("⏰ Workable deadline reached. Returning jobs found so far.")
 
-        # ✅ Handle Cookie Popup
-        try:
-            print("🍪 Checking for cookie popup...")
-            cookie_button = driver.find_element(By.CSS_SELECTOR, "button[data-ui='cookie-consent-decline']")
-            cookie_button.click()
-            print("✅ Cookie popup declined!")
-            time.sleep(2)  # Wait after clicking
-        except Exception:
-            print("⚠️ No cookie popup found or already dismissed.")
-
-        # ✅ Click "Show More Jobs" Up to 10 Times
-        max_clicks = 3
-        click_count = 0
-
-        while click_count < max_clicks:
-            try:
-                show_more_button = driver.find_element(By.CSS_SELECTOR, "button[data-ui='load-more-button']")
-                show_more_button.click()
-                click_count += 1
-                print(f"🔽 Clicked 'Show More Jobs' button #{click_count}...")
-                time.sleep(3)  # Allow time for new jobs to load
-            except Exception:
-                print("✅ No more 'Show More Jobs' button found or end of jobs reached.")
-                break  # Exit loop when no button is found
-
-        print(f"🔍 Searching for job elements after {click_count} load-more clicks...")
-        job_elements = driver.find_elements(By.CSS_SELECTOR, ".jobCardDetails__job-breakdown--AnIQr")
-        print(f"📌 Found {len(job_elements)} job elements for '{keyword}'.")
-
-        for job in job_elements:
-            try:
-                # ✅ Extract job title
-                title_element = job.find_element(By.CSS_SELECTOR, "h2[data-ui='job-card-title'] a")
-                title = title_element.text.strip()
-
-                # ✅ Extract company name
-                company_element = job.find_element(By.CSS_SELECTOR, "h3[data-ui='job-card-company-label'] a")
-                company = company_element.text.strip()
-
-                # ✅ Extract full job link
-                job_link = title_element.get_attribute("href")
-                full_job_link = f"https://jobs.workable.com{job_link}" if job_link.startswith("/") else job_link
-
-                # ✅ Strict Title Filtering (Ensures Job Title Matches Keywords)
-                if not any(kw.lower() in title.lower() for kw in config.JOB_KEYWORDS):
-                    print(f"⚠️ Skipping '{title}' - Does Not Match Exact Keyword '{keyword}'")
-                    continue
-
-                print(f"🆕 Job Found: {title} at {company}")
-                print(f"🔗 Job Link: {full_job_link}")
-
-                jobs.append({
-                    "title": title,
-                    "company": company,
-                    "location": "London",
-                    "url": full_job_link,  # ✅ Stores the full job URL
-                    "date_added": datetime.utcnow().strftime("%Y-%m-%d"),  # ✅ New field
-                    "has_applied": False,  # ✅ New field
-                })
-
-            except Exception as e:
-                print(f"⚠️ Skipping a job due to error: {e}")
-                continue  # Skip if any element is missing
-
-    driver.quit()
     print(f"✅ Finished scraping Workable. Total jobs found: {len(jobs)}")
     return jobs
 
 # ✅ Test Run
 if __name__ == "__main__":
-    fetch_workable_jobs()
\ No newline at end of file
+    import profiling
+    profiling.run_main(fetch_workable_jobs, "workable")
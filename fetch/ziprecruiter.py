@@ -1,8 +1,7 @@
 import time
-import random
-import requests
 import config  # ✅ Import job keywords & location
-from bs4 import BeautifulSoup
+import metrics
+from fetch import http_client, fast_parse, keyword_matcher, query_planner
 
 # ✅ ZipRecruiter Request Headers (Mimics a browser)
 HEADERS = {
@@ -14,6 +13,38 @@ HEADERS = {
 
 # ❌ Excluded job categories (e.g., video-related roles)
 EXCLUDED_KEYWORDS = ["video", "social media"]
+EXCLUDED = keyword_matcher.compile(EXCLUDED_KEYWORDS)
+
+# ✅ Fields pulled from each card in a single pass: field → (tag, class)
+CARD_FIELDS = {
+    "title": ("a", "job_title"),
+    "company": ("div", "company_name"),
+    "location": ("div", "location"),
+    "salary": ("div", "salary"),
+}
+
+# ✅ Extract the raw fields of every job card (no filtering)
+def parse_job_cards(html):
+    """
+    Parses a ZipRecruiter results page into a list of raw card dicts.
+    Only the job_result articles are built (lxml + SoupStrainer) and each card is walked once.
+    """
+    soup = fast_parse.soup_for(html, "article", class_="job_result")
+    cards = []
+
+    for job_card in soup.find_all("article", class_="job_result"):
+        tags = fast_parse.first_matches(job_card, CARD_FIELDS)
+        title_tag = tags["title"]
+
+        cards.append({
+            "title": title_tag.get_text(strip=True) if title_tag else "N/A",
+            "url": title_tag["href"] if title_tag else "#",
+            "company": tags["company"].get_text(strip=True) if tags["company"] else "N/A",
+            "location": tags["location"].get_text(strip=True) if tags["location"] else "N/A",
+            "salary": tags["salary"].get_text(strip=True) if tags["salary"] else "Not Provided",
+        })
+
+    return cards
 
 # ✅ Fetch all ZipRecruiter jobs (cycles through all job keywords)
 def fetch_all_ziprecruiter_jobs(max_jobs=50):
@@ -22,77 +53,45 @@ def fetch_all_ziprecruiter_jobs(max_jobs=50):
     """
     all_jobs = []
 
-    for keyword in config.JOB_KEYWORDS:
-        print(f"\n🔍 Searching for: {keyword.strip()} in {config.LOCATION}")
+    for query in query_planner.plan("ziprecruiter", config.JOB_KEYWORDS):
+        keyword = query.text
+        print(f"\n🔍 Searching for: {keyword} in {config.LOCATION}")
 
-        jobs = fetch_ziprecruiter_jobs(search_term=keyword.strip(), location=config.LOCATION, max_jobs=max_jobs)
+        jobs = fetch_ziprecruiter_jobs(search_term=keyword, location=config.LOCATION, max_jobs=max_jobs)
 
         if jobs:
-            print(f"✅ Found {len(jobs)} jobs for {keyword.strip()}!")
+            print(f"✅ Found {len(jobs)} jobs for {keyword}!")
             all_jobs.extend(jobs)
         else:
-            print(f"❌ No jobs found for {keyword.strip()}.")
+            print(f"❌ No jobs found for {keyword}.")
 
     print(f"\n✅ Scraped {len(all_jobs)} total jobs from ZipRecruiter.")
     return all_jobs
 
-# ✅ Fetch ZipRecruiter jobs (single keyword search)
-def fetch_ziprecruiter_jobs(search_term, location, max_jobs=50):
-    """
-    Fetches job listings from ZipRecruiter for a specific job title.
-    Filters out jobs containing unwanted keywords.
-    """
+# ✅ Apply the filters to one page of parsed cards (no I/O; see benchmarks/suite.py)
+def filter_job_cards(cards, max_jobs=50):
+    """Jobs for the cards that aren't duplicates or excluded, at most max_jobs."""
     jobs = []
-    start = 0  # Pagination offset
     seen_job_ids = set()
 
-    # ✅ Correct ZipRecruiter Search URL
-    url = (
-        f"https://www.ziprecruiter.com/candidate/search?"
-        f"search={search_term.replace(' ', '+')}&location={location.replace(' ', '+')}"
-    )
-
-    print(f"🔗 Fetching URL: {url}")  # ✅ Debugging step
-
-    response = requests.get(url, headers=HEADERS, timeout=10)
-    if response.status_code != 200:
-        print(f"❌ ZipRecruiter request failed with status code: {response.status_code}")
-        return []
-
-    soup = BeautifulSoup(response.text, "html.parser")
-    job_cards = soup.find_all("article", class_="job_result")
-
-    if not job_cards:
-        print(f"❌ No job listings found for {search_term}.")
-        return []
-
-    for job_card in job_cards:
-        # ✅ Extract Job Title
-        title_tag = job_card.find("a", class_="job_title")
-        title = title_tag.get_text(strip=True) if title_tag else "N/A"
-        job_url = title_tag["href"] if title_tag else "#"
-
-        # ✅ Extract Company Name
-        company_tag = job_card.find("div", class_="company_name")
-        company_name = company_tag.get_text(strip=True) if company_tag else "N/A"
-
-        # ✅ Extract Location
-        location_tag = job_card.find("div", class_="location")
-        job_location = location_tag.get_text(strip=True) if location_tag else "N/A"
-
-        # ✅ Extract Salary (if available)
-        salary_tag = job_card.find("div", class_="salary")
-        salary = salary_tag.get_text(strip=True) if salary_tag else "Not Provided"
+    for card in cards:
+        title = card["title"]
+        job_url = card["url"]
+        company_name = card["company"]
+        job_location = card["location"]
+        salary = card["salary"]
 
         # ✅ Generate a unique job ID
         job_id = job_url.split("/")[-1]
         if job_id in seen_job_ids:
+            metrics.inc("jobs_filtered_total", source="ziprecruiter", reason="duplicate")
             continue
         seen_job_ids.add(job_id)
 
         # ✅ FILTER OUT JOBS WITH UNWANTED KEYWORDS
-        if any(word.lower() in title.lower() or word.lower() in company_name.lower() for word in EXCLUDED_KEYWORDS):
+        if EXCLUDED.matches(title) or EXCLUDED.matches(company_name):
             print(f"⚠️ Skipping job: {title} at {company_name} (Filtered Out)")
+            metrics.inc("jobs_filtered_total", source="ziprecruiter", reason="excluded")
             continue  # 🚨 Skip this job
 
         jobs.append({
@@ -107,4 +106,42 @@ def fetch_ziprecruiter_jobs(search_term, location, max_jobs=50):
         if len(jobs) >= max_jobs:
             break
 
-    return jobs
\ No newline at end of file
+    metrics.inc("jobs_kept_total", len(jobs), source="ziprecruiter")
+    return jobs
+
+# ✅ Fetch ZipRecruiter jobs (single keyword search)
+def fetch_ziprecruiter_jobs(search_term, location, max_jobs=50):
+    """
+    Fetches job listings from ZipRecruiter for a specific job title.
+    Filters out jobs containing unwanted keywords.
+    """
+    # ✅ Correct ZipRecruiter Search URL
+    url = (
+        f"https://www.ziprecruiter.com/candidate/search?"
+        f"search={search_term.replace(' ', '+')}&location={location.replace(' ', '+')}"
+    )
+
+    print(f"🔗 Fetching URL: {url}")  # ✅ Debugging step
+
+    started = time.perf_counter()
+    try:
+        response = http_client.get(url, headers=HEADERS, timeout=10)
+        if response.status_code != 200:
+            print(f"❌ ZipRecruiter request failed with status code: {response.status_code}")
+            return []
+
+        with metrics.timer("parse_seconds", parser="fetch.ziprecruiter.parse_job_cards"):
+            job_cards = parse_job_cards(response.text)
+
+        if not job_cards:
+            print(f"❌ No job listings found for {search_term}.")
+            return []
+
+        return filter_job_cards(job_cards, max_jobs)
+    finally:
+        metrics.observe("keyword_seconds", time.perf_counter() - started, source="ziprecruiter", keyword=search_term)
+
+# ✅ Test Run (python -m fetch.ziprecruiter [--profile])
+if __name__ == "__main__":
+    import profiling
+    profiling.run_main(fetch_all_ziprecruiter_jobs, "ziprecruiter")
@@ -1,26 +1,124 @@
+import os
+import sys
 import time
-from fetch.run_scrapers import run_scrapers  # ✅ Correct Import
-from store.store_jobs import store_jobs  # ✅ Corrected Import
+from collections import Counter
+import metrics
+import profiling
+import fetch
+from fetch import high_water
+from fetch.run_scrapers import run_scrapers, stream_jobs, component_stats, selected_sources  # ✅ Correct Import
+from store.store_jobs import store_jobs, store_stream  # ✅ Corrected Import
+from store.dedupe import drop_near_duplicates, NearDuplicateFilter
 
-def job_cycle():
-    """Fetch new jobs, store them in Firestore, and send email if new jobs exist."""
+# ✅ Store jobs while the scrapers run (STREAMING=0 to scrape everything first, then store)
+STREAMING = os.getenv("STREAMING", "1") != "0"
+
+# ✅ python main.py --dry-run: scrape and list the jobs, without storage, email or any credentials
+DRY_RUN = "--dry-run" in sys.argv or os.getenv("DRY_RUN") == "1"
+# ✅ python main.py --http-only: skip the sources that drive Chrome (Selenium is never imported)
+HTTP_ONLY = "--http-only" in sys.argv
+# ✅ python main.py --daemon: stay running, each source on its own schedule (see daemon.py)
+DAEMON = "--daemon" in sys.argv
+
+def run_sources():
+    """The sources this run scrapes (SCRAPER_SOURCES or the defaults, minus browser sources with --http-only)."""
+    sources = selected_sources()
+    return [source for source in sources if source not in fetch.BROWSER_SOURCES] if HTTP_ONLY else sources
+
+def job_cycle(sources=None, keep_warm=False):
+    """
+    Fetch new jobs, store them in Firestore, and send email if new jobs exist.
+    `sources` defaults to run_sources(); keep_warm leaves Chrome running for the next cycle (daemon.py).
+    """
     print("\n🔄 Fetching new jobs...")
-    jobs = run_scrapers()  # ✅ Now fetches jobs only, does NOT store them
+    sources = run_sources() if sources is None else sources
+    high_water.discard()  # ✅ Nothing left over from an earlier cycle that failed (daemon.py)
+    if DRY_RUN:
+        return dry_run_cycle(sources, keep_warm)
+    if STREAMING:
+        return streaming_job_cycle(sources, keep_warm)
+
+    jobs = run_scrapers(sources=sources, keep_warm=keep_warm)  # ✅ Now fetches jobs only, does NOT store them
+
+    # ✅ The same role often comes from several sources under different URLs
+    jobs = drop_near_duplicates(jobs)
 
     if any(jobs.values()):  # ✅ Ensure jobs exist before storing
         total_jobs = sum(len(v) for v in jobs.values())
         print(f"💾 Storing {total_jobs} jobs in Firestore...")
-        store_jobs(jobs)  # ✅ Storing happens here only!
+        store_then_mark(store_jobs, jobs)  # ✅ Storing happens here only!
     else:
+        high_water.save()
         print("❌ No new jobs found. Skipping email.")
 
     print("✅ Job check complete.")
 
-if __name__ == "__main__":
+def streaming_job_cycle(sources=None, keep_warm=False):
+    """job_cycle as a pipeline: scrapers → bounded queue → near-duplicate filter → micro-batched storage."""
+    near_duplicates = NearDuplicateFilter()
+    try:
+        results = store_then_mark(store_stream, (
+            item for item in stream_jobs(sources=sources, keep_warm=keep_warm)
+            if item is None or near_duplicates.keep(*item)
+        ))
+    finally:
+        near_duplicates.close()
+
+    if not results.get("jobs_compiled", {}).get("stored"):
+        print("❌ No new jobs found. Skipping email.")
+
+    print("✅ Job check complete.")
+
+def store_then_mark(store, jobs):
+    """
+    Run a storage step, then save this run's high-water marks, or drop them if storage raised or any
+    write failed, so a failed store never makes the next run skip pages whose jobs weren't kept.
+    """
+    try:
+        results = store(jobs)
+    except BaseException:
+        high_water.discard()
+        raise
+
+    if any(counts["failed"] for counts in results.values()):
+        print("⚠️ Some writes failed. Not saving high-water marks, so those pages are scraped again next run.")
+        high_water.discard()
+    else:
+        high_water.save()
+    return results
+
+def dry_run_cycle(sources=None, keep_warm=False):
+    """
+    Scrape and print every job. Nothing is stored or deduplicated, and high-water marks are neither
+    used nor recorded, so the dry run sees every page and the next real run is unaffected.
+    """
+    counts = Counter()
+    tracking, high_water.ENABLED = high_water.ENABLED, False
+    try:
+        for item in stream_jobs(sources=sources, keep_warm=keep_warm):
+            if item is None:
+                continue
+            source, job = item
+            counts[source] += 1
+            print(f"🧪 [{source}] {job['title']} – {job.get('company', 'N/A')} ({job['url']})")
+    finally:
+        high_water.ENABLED = tracking
+
+    print(f"🧪 Dry run: {sum(counts.values())} jobs "
+          f"({', '.join(f'{source}: {count}' for source, count in counts.items()) or 'none'}), nothing stored.")
+
+if __name__ == "__main__" and DAEMON:
+    import daemon
+    daemon.run(job_cycle, run_sources(), email=daemon.EMAIL and not DRY_RUN)
+
+elif __name__ == "__main__":
     start_time = time.time()
 
     print("\n🚀 Running scraper test...")
-    job_cycle()
+    profiling.run_main(job_cycle, "main")  # ✅ python main.py --profile
 
     elapsed_time = time.time() - start_time
-    print(f"\n🕒 Total time taken: {elapsed_time:.2f} seconds.")
\ No newline at end of file
+    print(f"\n🕒 Total time taken: {elapsed_time:.2f} seconds.")
+
+    # ✅ Per-stage/source/keyword numbers as JSON and a Prometheus textfile
+    metrics.write("dry-run" if DRY_RUN else "main", extra={"components": component_stats()})
\ No newline at end of file
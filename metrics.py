@@ -0,0 +1,164 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import config
+
+# ✅ Run metrics: counters and timers recorded across fetch, store and email,
+#    written at the end of a run as a JSON report and a Prometheus textfile
+METRICS_DIR = os.getenv("METRICS_DIR", os.path.join(config.CACHE_DIR, "metrics"))
+ENABLED = os.getenv("METRICS", "1") != "0"
+PREFIX = "nextgig"
+
+# ✅ Help text for the Prometheus textfile (metric → description)
+HELP = {
+    "source_seconds": "Wall time per source",
+    "source_errors_total": "Scrapers that raised before finishing",
+    "keyword_seconds": "Wall time per source and keyword (or merged query)",
+    "http_requests_total": "HTTP requests sent, by host and status code",
+    "http_bytes_total": "Response body bytes transferred (before decompression), by host",
+    "page_loads_total": "Selenium page loads, by source",
+    "parse_seconds": "Time spent parsing pages, by parser",
+    "jobs_kept_total": "Jobs that passed a stage's filters, by source",
+    "jobs_filtered_total": "Jobs dropped, by source and reason",
+    "storage_reads_total": "Documents/rows read from the storage backend, by operation",
+    "storage_writes_total": "Documents/rows written to the storage backend, by operation",
+    "storage_write_failures_total": "Writes the storage backend gave up on, by collection",
+    "storage_seconds": "Time spent in storage backend calls, by operation",
+    "stage_seconds": "Wall time per pipeline stage",
+    "smtp_seconds": "Time spent connecting to and sending through the SMTP server",
+    "emails_sent_total": "Digest emails sent",
+    "jobs_emailed_total": "Jobs included in sent digest emails",
+    "daemon_cycles_total": "Daemon cycles that completed",
+    "daemon_cycle_errors_total": "Daemon cycles that raised",
+    "daemon_skipped_total": "Scheduled runs skipped because the source was still running, by source",
+}
+
+_lock = threading.Lock()
+_counters = {}  # (name, labels) → value
+_timers = {}  # (name, labels) → [total seconds, count]
+_started = time.time()
+
+def _key(name, labels):
+    return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+def inc(name, value=1, **labels):
+    """Add `value` to a counter, e.g. inc("jobs_filtered_total", source="linkedin", reason="location")."""
+    if not ENABLED:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+def observe(name, seconds, **labels):
+    """Add one timing to a timer."""
+    if not ENABLED:
+        return
+    key = _key(name, labels)
+    with _lock:
+        total = _timers.setdefault(key, [0.0, 0])
+        total[0] += seconds
+        total[1] += 1
+
+@contextmanager
+def timer(name, **labels):
+    """Time the `with` block into a timer (recorded even if the block raises)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+def reset():
+    """Forget everything recorded so far (the next report starts from now)."""
+    global _started
+    with _lock:
+        _counters.clear()
+        _timers.clear()
+        _started = time.time()
+
+def report(run, extra=None):
+    """The run report as a JSON-serialisable dict."""
+    finished = time.time()
+    with _lock:
+        counters = [
+            {"name": name, "labels": dict(labels), "value": value}
+            for (name, labels), value in sorted(_counters.items())
+        ]
+        timers = [
+            {"name": name, "labels": dict(labels), "seconds": round(seconds, 4), "count": count}
+            for (name, labels), (seconds, count) in sorted(_timers.items())
+        ]
+
+    return {
+        "run": run,
+        "started_at": datetime.fromtimestamp(_started, timezone.utc).isoformat(),
+        "finished_at": datetime.fromtimestamp(finished, timezone.utc).isoformat(),
+        "elapsed_seconds": round(finished - _started, 3),
+        "counters": counters,
+        "timers": timers,
+        **(extra or {}),
+    }
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _series(name, labels, value):
+    rendered = ",".join(f'{label}="{_escape(label_value)}"' for label, label_value in labels.items())
+    return f"{PREFIX}_{name}{{{rendered}}} {value}" if rendered else f"{PREFIX}_{name} {value}"
+
+def prometheus_text(run_report):
+    """Render a report in the Prometheus text exposition format (for node_exporter's textfile collector)."""
+    run = {"run": run_report["run"]}
+    lines = [
+        f"# TYPE {PREFIX}_run_elapsed_seconds gauge",
+        _series("run_elapsed_seconds", run, run_report["elapsed_seconds"]),
+        f"# TYPE {PREFIX}_run_finished_timestamp_seconds gauge",
+        _series("run_finished_timestamp_seconds", run,
+                int(datetime.fromisoformat(run_report["finished_at"]).timestamp())),
+    ]
+
+    typed = set()
+    for counter in run_report["counters"]:
+        if counter["name"] not in typed:
+            typed.add(counter["name"])
+            lines.append(f"# HELP {PREFIX}_{counter['name']} {HELP.get(counter['name'], counter['name'])}")
+            lines.append(f"# TYPE {PREFIX}_{counter['name']} counter")
+        lines.append(_series(counter["name"], {**run, **counter["labels"]}, counter["value"]))
+
+    for timing in run_report["timers"]:
+        if timing["name"] not in typed:
+            typed.add(timing["name"])
+            lines.append(f"# HELP {PREFIX}_{timing['name']} {HELP.get(timing['name'], timing['name'])}")
+            lines.append(f"# TYPE {PREFIX}_{timing['name']} summary")
+        labels = {**run, **timing["labels"]}
+        lines.append(_series(f"{timing['name']}_sum", labels, timing["seconds"]))
+        lines.append(_series(f"{timing['name']}_count", labels, timing["count"]))
+
+    return "\n".join(lines) + "\n"
+
+def _write_atomic(path, text):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(temp_path, path)  # ✅ The textfile collector never sees a half-written file
+
+def write(run, extra=None, directory=None):
+    """
+    Write <run>.json and <run>.prom to METRICS_DIR, start a fresh report and return this one.
+    `extra` adds sections to the JSON report only (e.g. component stats).
+    """
+    if not ENABLED:
+        return None
+
+    directory = directory or METRICS_DIR
+    os.makedirs(directory, exist_ok=True)
+    run_report = report(run, extra)
+
+    _write_atomic(os.path.join(directory, f"{run}.json"), json.dumps(run_report, indent=2))
+    _write_atomic(os.path.join(directory, f"{run}.prom"), prometheus_text(run_report))
+    print(f"📈 Metrics written to {os.path.join(directory, run)}.json / .prom")
+    reset()
+    return run_report
@@ -0,0 +1,186 @@
+import os
+import sys
+import json
+import time
+import linecache
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+import config
+
+# ✅ Sampling profiler: every INTERVAL seconds, record every thread's Python stack (sys._current_frames).
+#    Threads are where this app spends its time (scraper workers, browser pool, Firestore writers),
+#    which a deterministic profiler like cProfile only sees on the thread that started it.
+INTERVAL = float(os.getenv("PROFILE_INTERVAL", 0.005))
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(config.CACHE_DIR, "profiles"))
+FLAG = "--profile"
+
+# ✅ Pipeline stage of a sample: the first stage (in this order) with a frame on the stack in one of its
+#    modules, so e.g. Firestore's or Selenium's own socket reads count as firestore/webdriver, not http
+STAGES = [
+    ("parse", ("bs4", "lxml", "html.parser", "html5lib", "soupsieve", "fetch.fast_parse")),
+    ("throttle", ("fetch.rate_limiter",)),  # Not fetch.deadline: propagate() wraps every browser / HTTP task
+    ("webdriver", ("selenium",)),
+    ("firestore", ("google", "grpc", "firebase_admin", "store.firestore_backend")),
+    ("sqlite", ("sqlite3", "store.sqlite_backend", "fetch.http_cache")),
+    ("smtp", ("smtplib",)),
+    ("http", ("requests", "urllib3", "http.client", "cloudscraper", "ssl", "socket")),
+    ("dedupe", ("store.dedupe",)),
+    ("filter", ("fetch.keyword_matcher", "fetch.fuzzy_match", "re")),
+]
+
+# ✅ What a thread that isn't on the CPU is waiting for, from its innermost Python frame (default: io)
+LOCK_MODULES = ("threading", "queue", "concurrent.futures", "asyncio.locks", "asyncio.queues")
+
+def _module(frame):
+    return frame.f_globals.get("__name__", "?")
+
+def _matches(module, prefixes):
+    return any(module == prefix or module.startswith(prefix + ".") for prefix in prefixes)
+
+def _stage(frames):
+    modules = {_module(frame) for frame in frames}
+    for stage, prefixes in STAGES:
+        if any(_matches(module, prefixes) for module in modules):
+            return stage
+    return "app"
+
+def _wait_kind(frame):
+    """'sleep', 'lock' or 'io' for a thread that's off the CPU, judged by its innermost frame."""
+    if "sleep(" in linecache.getline(frame.f_code.co_filename, frame.f_lineno):
+        return "sleep"
+    return "lock" if _matches(_module(frame), LOCK_MODULES) else "io"
+
+def _thread_cpu(thread_id):
+    """CPU seconds used so far by another thread (POSIX per-thread clocks), or None where unsupported."""
+    try:
+        return time.clock_gettime(time.pthread_getcpuclockid(thread_id))
+    except (AttributeError, OSError):
+        return None
+
+class Sampler:
+    """Background thread sampling every other thread's stack into folded-stack counts."""
+
+    def __init__(self, interval=INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()  # "thread;frame;frame;[wait]" → samples
+        self.stages = Counter()  # (stage, "cpu" | wait kind) → thread-seconds
+        self.samples = 0
+        self._thread_cpu = {}  # thread id → CPU seconds at the previous sample
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def start(self):
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.wall_seconds = time.perf_counter() - self._wall_start
+        self.cpu_seconds = time.process_time() - self._cpu_start
+
+    def _run(self):
+        own_id = threading.get_ident()
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own_id:
+                    self._record(thread_id, names.get(thread_id, str(thread_id)), frame, elapsed)
+            self.samples += 1
+
+    def _cpu_share(self, thread_id, elapsed, leaf):
+        """Fraction of the last interval the thread spent on the CPU (measured, or guessed from its leaf frame)."""
+        cpu = _thread_cpu(thread_id)
+        if cpu is None:
+            # ✅ No per-thread clocks: blocked C calls show up as these innermost Python frames
+            blocked = "sleep(" in linecache.getline(leaf.f_code.co_filename, leaf.f_lineno) or \
+                _matches(_module(leaf), LOCK_MODULES + ("selectors", "socket", "ssl", "subprocess"))
+            return 0.0 if blocked else 1.0
+        previous = self._thread_cpu.get(thread_id)
+        self._thread_cpu[thread_id] = cpu
+        if previous is None:
+            return 0.0
+        return min(1.0, (cpu - previous) / elapsed) if elapsed > 0 else 0.0
+
+    def _record(self, thread_id, thread_name, frame, elapsed):
+        frames = []
+        while frame is not None:
+            frames.append(frame)
+            frame = frame.f_back
+
+        share = self._cpu_share(thread_id, elapsed, frames[0])
+        stage = _stage(frames)
+        wait = _wait_kind(frames[0])
+        self.stages[(stage, "cpu")] += share * elapsed
+        self.stages[(stage, wait)] += (1 - share) * elapsed
+
+        names = [f"{_module(f)}:{f.f_code.co_name}" for f in reversed(frames)]
+        if share < 0.5:
+            names.append(f"[{wait}]")  # ✅ Leaf marker so blocked time stands out in the flamegraph
+        self.stacks[";".join([thread_name.split("_")[0]] + names)] += 1
+
+    def folded(self):
+        """Brendan Gregg's folded format ("frame;frame;frame count"), for flamegraph.pl, speedscope, etc."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def summary(self):
+        """Per-stage thread-seconds split into CPU and waiting (sleep / io / lock)."""
+        stages = {}
+        for (stage, kind), seconds in self.stages.items():
+            stages.setdefault(stage, {"cpu": 0.0, "sleep": 0.0, "io": 0.0, "lock": 0.0})[kind] += seconds
+        totals = {kind: round(sum(s[kind] for s in stages.values()), 2) for kind in ("cpu", "sleep", "io", "lock")}
+        return {
+            "wall_seconds": round(self.wall_seconds, 2),
+            "process_cpu_seconds": round(self.cpu_seconds, 2),  # ✅ Measured by the OS, not estimated
+            "samples": self.samples,
+            "interval": self.interval,
+            "thread_seconds": totals,
+            "stages": {
+                stage: {kind: round(seconds, 2) for kind, seconds in split.items()}
+                for stage, split in sorted(stages.items(), key=lambda item: -sum(item[1].values()))
+            },
+        }
+
+def print_summary(summary):
+    print(f"\n🔬 Profile: {summary['wall_seconds']}s wall, {summary['process_cpu_seconds']}s process CPU "
+          f"({summary['samples']} samples every {summary['interval'] * 1000:.0f} ms)")
+    for stage, split in summary["stages"].items():
+        waiting = split["sleep"] + split["io"] + split["lock"]
+        print(f"   {stage:<10} {split['cpu']:>8.2f}s CPU  {waiting:>8.2f}s waiting "
+              f"(sleep {split['sleep']:.2f}s, I/O {split['io']:.2f}s, locks/queues {split['lock']:.2f}s)")
+
+@contextmanager
+def profile(name, directory=None):
+    """Sample the `with` block, then write <name>-<timestamp>.folded and .json to PROFILE_DIR."""
+    sampler = Sampler()
+    sampler.start()
+    try:
+        yield sampler
+    finally:
+        sampler.stop()
+        directory = directory or PROFILE_DIR
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, f"{name}-{datetime.now().strftime('%Y%m%d-%H%M%S')}")
+
+        summary = sampler.summary()
+        with open(f"{base}.folded", "w", encoding="utf-8") as f:
+            f.write(sampler.folded())
+        with open(f"{base}.json", "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+        print_summary(summary)
+        print(f"🔬 Flamegraph input: {base}.folded (flamegraph.pl, or drop it on speedscope.app)")
+
+def run_main(fn, name, argv=None):
+    """Entry-point helper: fn() under the profiler when --profile is on the command line, else just fn()."""
+    argv = sys.argv if argv is None else argv
+    if FLAG not in argv:
+        return fn()
+    with profile(name):
+        return fn()
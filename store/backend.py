@@ -0,0 +1,70 @@
+import threading
+import config
+
+class StorageBackend:
+    """
+    Everything the pipeline needs from a job store.
+    Jobs live in collections ("jobs_<scraper>" and "jobs_compiled") keyed by document ID;
+    digests are outbox records of the job IDs emailed together (see email_service/send_email.py).
+    """
+
+    name = None
+    remote = False  # ✅ Remote stores benefit from the local known-IDs cache (store/known_ids.py)
+
+    def existing_ids(self, doc_ids):
+        """The subset of `doc_ids` already in 'jobs_compiled'."""
+        raise NotImplementedError
+
+    def upsert_jobs(self, writes):
+        """
+        Merge (collection, doc_id, job) writes into the store.
+        Returns {collection: {"stored": n, "failed": n}}.
+        """
+        raise NotImplementedError
+
+    def unsent_jobs(self):
+        """Jobs in 'jobs_compiled' with sent == False, oldest first, each with its document "id"."""
+        raise NotImplementedError
+
+    def create_digest(self, digest_id, job_ids, created_at):
+        """Write the outbox record for a digest that's about to be emailed (status "sending")."""
+        raise NotImplementedError
+
+    def mark_digest_emailed(self, digest_id, sent_at):
+        """Record that a digest's email went out (status "sent")."""
+        raise NotImplementedError
+
+    def discard_digest(self, digest_id):
+        """Drop a digest whose email failed, so its jobs go in the next one."""
+        raise NotImplementedError
+
+    def mark_sent(self, digest_id):
+        """Flip `sent` on every job in a digest (resuming if interrupted), then mark it "done"."""
+        raise NotImplementedError
+
+    def pending_digests(self):
+        """IDs of digests that were (or may have been) emailed but whose jobs aren't all marked sent."""
+        raise NotImplementedError
+
+    def backfill_sent_flag(self):
+        """Give jobs stored without a `sent` field an explicit False. Returns how many were updated."""
+        return 0
+
+_lock = threading.Lock()
+_backends = {}
+
+def get_backend(name=None):
+    """The storage backend named by STORAGE_BACKEND (or `name`), created once per process."""
+    name = (name or config.STORAGE_BACKEND).lower()
+
+    with _lock:
+        if name not in _backends:
+            if name == "firestore":
+                from store.firestore_backend import FirestoreBackend
+                _backends[name] = FirestoreBackend()
+            elif name == "sqlite":
+                from store.sqlite_backend import SQLiteBackend
+                _backends[name] = SQLiteBackend()
+            else:
+                raise ValueError(f"❌ Unknown STORAGE_BACKEND '{name}'. Use 'firestore' or 'sqlite'.")
+        return _backends[name]
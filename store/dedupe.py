@@ -0,0 +1,187 @@
+import os
+import re
+import json
+import base64
+import hashlib
+from array import array
+from datetime import datetime, timedelta
+import config
+import metrics
+from store.store_jobs import generate_document_id
+
+# ✅ Near-duplicate detection: MinHash signatures of title + company + location, bucketed with LSH
+THRESHOLD = float(os.getenv("DEDUPE_THRESHOLD", 0.8))  # Estimated Jaccard similarity that counts as the same role
+NUM_PERM = 128  # Hash functions per signature
+SHINGLE_SIZE = 4  # Character n-grams
+INDEX_PATH = os.getenv("DEDUPE_INDEX_PATH", os.path.join(config.CACHE_DIR, "dedupe_index.json"))
+MAX_AGE_DAYS = int(os.getenv("DEDUPE_MAX_AGE_DAYS", 30))  # Older entries are dropped from the index
+ENABLED = os.getenv("DEDUPE", "1") != "0"
+
+# ✅ Bump when normalisation or hashing changes; older indexes are then rebuilt from scratch
+FORMAT_VERSION = 1
+
+_COMPANY_SUFFIXES = re.compile(r"\b(ltd|limited|inc|plc|llc|llp|gmbh|group|uk)\b")
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+def _lsh_params(threshold, num_perm=NUM_PERM):
+    """
+    Bands × rows whose S-curve midpoint (1/bands)^(1/rows) is the highest one at or below
+    `threshold`: candidates err towards recall, and are then checked against the threshold.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+BANDS, ROWS = _lsh_params(THRESHOLD)
+
+def normalise(job):
+    """Comparable text for a job: lowercased title, company without legal suffixes, first part of location."""
+    title = _NON_WORD.sub(" ", job.get("title", "").lower())
+    company = _COMPANY_SUFFIXES.sub(" ", _NON_WORD.sub(" ", job.get("company", "").lower()))
+    location = _NON_WORD.sub(" ", job.get("location", "").split(",")[0].lower())
+    return " | ".join(" ".join(part.split()) for part in (title, company, location))
+
+def shingles(text):
+    """Set of SHINGLE_SIZE-character n-grams."""
+    if len(text) <= SHINGLE_SIZE:
+        return {text}
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+def signature(job):
+    """
+    MinHash signature (NUM_PERM 32-bit values) of a job's normalised text.
+    One SHAKE-128 digest per shingle supplies all NUM_PERM hash values at once, and the
+    per-position minimum runs in C (map(min, ...)), ~7x faster than modular hashing in Python.
+    """
+    rows = [array("I", hashlib.shake_128(shingle.encode("utf-8")).digest(4 * NUM_PERM))
+            for shingle in shingles(normalise(job))]
+    return array("I", map(min, *rows)) if len(rows) > 1 else rows[0]
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of the two jobs' shingle sets."""
+    return sum(x == y for x, y in zip(sig_a, sig_b)) / NUM_PERM
+
+class LSHIndex:
+    """MinHash LSH index: one hash table per band, so lookups touch only colliding candidates."""
+
+    def __init__(self):
+        self.signatures = {}  # doc_id → signature
+        self.added = {}  # doc_id → "YYYY-MM-DD"
+        self._buckets = [{} for _ in range(BANDS)]
+
+    def _band_keys(self, sig):
+        for band in range(BANDS):
+            yield band, sig[band * ROWS:(band + 1) * ROWS].tobytes()
+
+    def add(self, doc_id, sig, added=None):
+        self.signatures[doc_id] = sig
+        self.added[doc_id] = added or datetime.utcnow().strftime("%Y-%m-%d")
+        for band, key in self._band_keys(sig):
+            self._buckets[band].setdefault(key, []).append(doc_id)
+
+    def query(self, sig, threshold=THRESHOLD):
+        """(doc_id, similarity) of the most similar indexed job at or above `threshold`, or None."""
+        candidates = set()
+        for band, key in self._band_keys(sig):
+            candidates.update(self._buckets[band].get(key, ()))
+
+        best = None
+        for doc_id in candidates:
+            score = similarity(sig, self.signatures[doc_id])
+            if score >= threshold and (best is None or score > best[1]):
+                best = (doc_id, score)
+        return best
+
+    # ✅ Persistence
+
+    @classmethod
+    def load(cls, path=INDEX_PATH):
+        """Index from a previous run (empty if missing, unreadable or from another format/LSH setup)."""
+        index = cls()
+        try:
+            with open(path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return index
+
+        if state.get("version") != FORMAT_VERSION or state.get("lsh") != [NUM_PERM, BANDS, ROWS]:
+            return index
+
+        cutoff = (datetime.utcnow() - timedelta(days=MAX_AGE_DAYS)).strftime("%Y-%m-%d")
+        for doc_id, (encoded, added) in state["entries"].items():
+            if added >= cutoff:
+                index.add(doc_id, array("I", base64.b64decode(encoded)), added)
+        return index
+
+    def save(self, path=INDEX_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entries = {
+            doc_id: [base64.b64encode(sig.tobytes()).decode("ascii"), self.added[doc_id]]
+            for doc_id, sig in self.signatures.items()
+        }
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": FORMAT_VERSION, "lsh": [NUM_PERM, BANDS, ROWS], "entries": entries}, f,
+                      separators=(",", ":"))
+        os.replace(temp_path, path)
+
+class NearDuplicateFilter:
+    """
+    Streaming form of drop_near_duplicates: call keep(source, job) for each job as it arrives,
+    then close() to save the index. The first occurrence wins, in arrival order.
+    """
+
+    def __init__(self, threshold=THRESHOLD):
+        self.threshold = threshold
+        self.index = LSHIndex.load() if ENABLED else None
+        self.total = 0
+        self.dropped = 0
+
+    def keep(self, source, job):
+        """False if `job` is a near-duplicate of one already kept this run or seen on a recent run."""
+        if not ENABLED:
+            return True
+
+        self.total += 1
+        doc_id = generate_document_id(job["url"])
+        sig = signature(job)
+
+        match = None if doc_id in self.index.signatures else self.index.query(sig, self.threshold)
+        if match:
+            self.dropped += 1
+            metrics.inc("jobs_filtered_total", source=source, reason="near_duplicate")
+            print(f"♊ Skipping near-duplicate from '{source}': {job.get('title')} at {job.get('company')} "
+                  f"({match[1]:.0%} similar to an earlier listing)")
+            return False
+
+        if doc_id not in self.index.signatures:
+            self.index.add(doc_id, sig)
+        return True
+
+    def close(self):
+        if not ENABLED:
+            return
+        self.index.save()
+        print(f"♊ Dedupe: {self.dropped} near-duplicates dropped from {self.total} jobs "
+              f"(threshold {self.threshold:.0%}, {BANDS} bands × {ROWS} rows).")
+
+def drop_near_duplicates(jobs_by_source, threshold=THRESHOLD):
+    """
+    Remove jobs that are near-duplicates of one already kept this run or seen on a recent run
+    (same role under a different URL, usually from another source). The first occurrence wins,
+    in source order. Exact URL repeats are left for store_jobs' duplicate check.
+    Returns a new {source: [jobs]} dict.
+    """
+    if not ENABLED:
+        return jobs_by_source
+
+    near_duplicates = NearDuplicateFilter(threshold)
+    kept = {
+        source: [job for job in jobs if near_duplicates.keep(source, job)]
+        for source, jobs in jobs_by_source.items()
+    }
+    near_duplicates.close()
+    return kept
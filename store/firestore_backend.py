@@ -0,0 +1,204 @@
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import firebase_admin
+from firebase_admin import credentials, firestore
+from google.api_core.exceptions import NotFound
+from google.cloud.firestore_v1.base_query import FieldFilter
+import config
+from store.backend import StorageBackend
+
+# ✅ Bulk write tuning
+BATCH_SIZE = 500  # Firestore's limit on writes per WriteBatch
+WRITE_WORKERS = int(os.getenv("FIRESTORE_WRITE_WORKERS", 4))  # Batches committed in parallel
+WRITE_RETRIES = 3  # Attempts per job when a batch fails and its jobs are retried one by one
+EXISTS_CHUNK = 300  # Document IDs per keys-only existence lookup
+
+# ✅ Unsent-jobs query tuning
+PAGE_SIZE = int(os.getenv("UNSENT_PAGE_SIZE", 300))  # Documents per query page
+EMAIL_FIELDS = ["title", "company", "location", "url", "date_added"]  # Everything the email needs
+
+OUTBOX_COLLECTION = "email_outbox"
+
+class FirestoreBackend(StorageBackend):
+    """Jobs in Firestore collections, written in parallel WriteBatches and read with keys-only lookups."""
+
+    name = "firestore"
+    remote = True
+
+    def __init__(self):
+        # ✅ Prevent multiple Firebase initializations
+        if not firebase_admin._apps:
+            cred = credentials.Certificate(config.firebase_credentials_file())
+            firebase_admin.initialize_app(cred)
+
+        self.db = firestore.client()
+
+    # ✅ Storing jobs
+
+    def existing_ids(self, doc_ids):
+        """Keys-only (no fields) batched get_all, so cost tracks the candidates, not the collection size."""
+        doc_ids = sorted(doc_ids)
+        existing = set()
+
+        collection = self.db.collection("jobs_compiled")
+        for i in range(0, len(doc_ids), EXISTS_CHUNK):
+            refs = [collection.document(doc_id) for doc_id in doc_ids[i:i + EXISTS_CHUNK]]
+            for snapshot in self.db.get_all(refs, field_paths=[]):
+                if snapshot.exists:
+                    existing.add(snapshot.id)
+
+        return existing
+
+    def _write_one(self, collection, doc_id, job):
+        """Write a single job, retrying with backoff. Returns True on success."""
+        for attempt in range(WRITE_RETRIES):
+            try:
+                self.db.collection(collection).document(doc_id).set(job, merge=True)
+                return True
+            except Exception as e:
+                if attempt == WRITE_RETRIES - 1:
+                    print(f"❌ Failed to store {doc_id} in '{collection}': {e}")
+                    return False
+                time.sleep(0.5 * 2 ** attempt)
+
+    def _commit_batch(self, writes):
+        """
+        Commit up to BATCH_SIZE writes in one round trip.
+        A batch is all-or-nothing, so if it fails each write is retried on its own.
+        Returns {collection: [stored, failed]}.
+        """
+        counts = defaultdict(lambda: [0, 0])
+        batch = self.db.batch()
+        for collection, doc_id, job in writes:
+            batch.set(self.db.collection(collection).document(doc_id), job, merge=True)
+
+        try:
+            batch.commit()
+            for collection, _, _ in writes:
+                counts[collection][0] += 1
+        except Exception as e:
+            print(f"⚠️ Batch of {len(writes)} writes failed ({e}). Retrying them one by one...")
+            for collection, doc_id, job in writes:
+                counts[collection][0 if self._write_one(collection, doc_id, job) else 1] += 1
+
+        return counts
+
+    def upsert_jobs(self, writes):
+        """Batches of BATCH_SIZE, up to WRITE_WORKERS committed in parallel."""
+        chunks = [writes[i:i + BATCH_SIZE] for i in range(0, len(writes), BATCH_SIZE)]
+        totals = defaultdict(lambda: {"stored": 0, "failed": 0})
+
+        with ThreadPoolExecutor(max_workers=WRITE_WORKERS) as executor:
+            for counts in executor.map(self._commit_batch, chunks):
+                for collection, (stored, failed) in counts.items():
+                    totals[collection]["stored"] += stored
+                    totals[collection]["failed"] += failed
+
+        return dict(totals)
+
+    # ✅ Emailing jobs
+
+    def unsent_jobs(self):
+        """
+        Filters on `sent` server-side (composite index in firestore.indexes.json), fetches only
+        EMAIL_FIELDS and pages through results with a cursor, so cost tracks the unsent backlog.
+        """
+        query = (
+            self.db.collection("jobs_compiled")
+            .where(filter=FieldFilter("sent", "==", False))
+            .order_by("date_added")
+            .select(EMAIL_FIELDS)
+            .limit(PAGE_SIZE)
+        )
+
+        unsent_jobs = []
+        last_snapshot = None
+        while True:
+            page = query.start_after(last_snapshot) if last_snapshot else query
+            snapshots = list(page.stream())
+            unsent_jobs.extend({**snapshot.to_dict(), "id": snapshot.id} for snapshot in snapshots)
+
+            if len(snapshots) < PAGE_SIZE:
+                break
+            last_snapshot = snapshots[-1]
+
+        return unsent_jobs
+
+    def create_digest(self, digest_id, job_ids, created_at):
+        self.db.collection(OUTBOX_COLLECTION).document(digest_id).set({
+            "job_ids": job_ids,
+            "status": "sending",  # ✅ Treated as sent if we crash mid-send: never resend
+            "flipped": 0,  # How many job_ids have been marked sent so far
+            "created_at": created_at,
+        })
+
+    def mark_digest_emailed(self, digest_id, sent_at):
+        self.db.collection(OUTBOX_COLLECTION).document(digest_id).update({"status": "sent", "sent_at": sent_at})
+
+    def discard_digest(self, digest_id):
+        self.db.collection(OUTBOX_COLLECTION).document(digest_id).delete()
+
+    def mark_sent(self, digest_id):
+        """
+        Batched writes; each batch also records progress on the outbox record, atomically,
+        so a rerun resumes where the last one stopped.
+        """
+        digest_ref = self.db.collection(OUTBOX_COLLECTION).document(digest_id)
+        digest = digest_ref.get().to_dict()
+        job_ids = digest["job_ids"]
+        flipped = 0
+
+        for start in range(digest.get("flipped", 0), len(job_ids), BATCH_SIZE - 1):
+            chunk = job_ids[start:start + BATCH_SIZE - 1]
+            progress = start + len(chunk)
+            try:
+                self._flip_chunk(digest_ref, chunk, progress)
+            except NotFound:
+                # ✅ A job was deleted after the digest was created: flip the rest rather than fail every rerun
+                existing = self.existing_ids(chunk)
+                print(f"⚠️ {len(chunk) - len(existing)} jobs in digest {digest_id} no longer exist. Skipping them.")
+                chunk = [job_id for job_id in chunk if job_id in existing]
+                self._flip_chunk(digest_ref, chunk, progress)
+            flipped += len(chunk)
+
+        digest_ref.update({"status": "done"})
+        return flipped
+
+    def _flip_chunk(self, digest_ref, job_ids, progress):
+        """One batch: mark `job_ids` sent and record `progress` (job_ids done so far) on the digest."""
+        jobs_collection = self.db.collection("jobs_compiled")
+        batch = self.db.batch()
+        for job_id in job_ids:
+            batch.update(jobs_collection.document(job_id), {"sent": True, "digest_id": digest_ref.id})
+        batch.update(digest_ref, {"flipped": progress})
+        batch.commit()
+
+    def pending_digests(self):
+        pending = (
+            self.db.collection(OUTBOX_COLLECTION)
+            .where(filter=FieldFilter("status", "in", ["sending", "sent"]))
+            .select(["status"])
+            .stream()
+        )
+        return [snapshot.id for snapshot in pending]
+
+    def backfill_sent_flag(self):
+        batch = self.db.batch()
+        pending = updated = 0
+
+        for snapshot in self.db.collection("jobs_compiled").select(["sent"]).stream():
+            if "sent" in (snapshot.to_dict() or {}):
+                continue
+            batch.update(snapshot.reference, {"sent": False})
+            pending += 1
+            if pending == BATCH_SIZE:
+                batch.commit()
+                updated += pending
+                batch, pending = self.db.batch(), 0
+
+        if pending:
+            batch.commit()
+            updated += pending
+        return updated
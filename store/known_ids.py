@@ -0,0 +1,52 @@
+import os
+import json
+import threading
+import config
+
+# ✅ Local cache of job document IDs known to be in 'jobs_compiled' (persisted between runs)
+CACHE_PATH = os.getenv("KNOWN_IDS_PATH", os.path.join(config.CACHE_DIR, "known_job_ids.json"))
+MAX_KNOWN = int(os.getenv("KNOWN_IDS_MAX", 20000))  # Most recent IDs kept
+ENABLED = os.getenv("KNOWN_IDS_CACHE", "1") != "0"
+
+_lock = threading.Lock()
+_ids = None  # doc_id → None, in the order they were learned (dict keeps it ordered)
+
+def _load():
+    """Read the cache file once per process (lock held)."""
+    global _ids
+    if _ids is None:
+        _ids = {}
+        try:
+            with open(CACHE_PATH, encoding="utf-8") as f:
+                _ids = dict.fromkeys(json.load(f))
+        except (OSError, ValueError):
+            pass  # ✅ No cache yet: everything gets checked against Firestore
+    return _ids
+
+def known(doc_ids):
+    """The subset of `doc_ids` already known to exist."""
+    if not ENABLED:
+        return set()
+    with _lock:
+        ids = _load()
+        return {doc_id for doc_id in doc_ids if doc_id in ids}
+
+def add(doc_ids):
+    """Remember that these documents exist."""
+    if not ENABLED:
+        return
+    with _lock:
+        _load().update(dict.fromkeys(doc_ids))
+
+def save():
+    """Write the cache, keeping the MAX_KNOWN most recently learned IDs."""
+    global _ids
+    if not ENABLED or _ids is None:
+        return
+    with _lock:
+        _ids = dict.fromkeys(list(_ids)[-MAX_KNOWN:])
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        temp_path = f"{CACHE_PATH}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(list(_ids), f, separators=(",", ":"))
+        os.replace(temp_path, CACHE_PATH)
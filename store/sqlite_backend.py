@@ -0,0 +1,123 @@
+import json
+import os
+import sqlite3
+import threading
+from collections import defaultdict
+import config
+from store.backend import StorageBackend
+
+EXISTS_CHUNK = 500  # Document IDs per IN (...) lookup, well under SQLite's variable limit
+
+# ✅ Firestore-style merge: patch the stored JSON and only touch `sent` if the write includes it
+UPSERT_SQL = (
+    "INSERT INTO jobs (collection, id, data, date_added, sent) VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT (collection, id) DO UPDATE SET "
+    "data = json_patch(jobs.data, excluded.data), "
+    "date_added = COALESCE(excluded.date_added, jobs.date_added), "
+    "sent = CASE WHEN json_type(excluded.data, '$.sent') IS NULL THEN jobs.sent ELSE excluded.sent END"
+)
+
+class SQLiteBackend(StorageBackend):
+    """
+    Local job store in one SQLite file (WAL mode), for self-hosting, offline runs and benchmarks.
+    Collections map to a column; job fields are kept as JSON next to the indexed sent/date_added columns.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path=None):
+        self.path = path or config.SQLITE_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(self.path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")  # ✅ Safe with WAL, far fewer fsyncs
+        self.db.executescript(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " collection TEXT NOT NULL, id TEXT NOT NULL, data TEXT NOT NULL,"
+            " date_added TEXT, sent INTEGER NOT NULL DEFAULT 0, digest_id TEXT,"
+            " PRIMARY KEY (collection, id));"
+            "CREATE INDEX IF NOT EXISTS jobs_unsent ON jobs (collection, sent, date_added, id);"
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            " id TEXT PRIMARY KEY, job_ids TEXT NOT NULL, status TEXT NOT NULL,"
+            " flipped INTEGER NOT NULL DEFAULT 0, created_at TEXT, sent_at TEXT);"
+            "CREATE INDEX IF NOT EXISTS outbox_status ON outbox (status);"
+        )
+
+    # ✅ Storing jobs
+
+    def existing_ids(self, doc_ids):
+        doc_ids = sorted(doc_ids)
+        existing = set()
+
+        with self._lock:
+            for i in range(0, len(doc_ids), EXISTS_CHUNK):
+                chunk = doc_ids[i:i + EXISTS_CHUNK]
+                rows = self.db.execute(
+                    f"SELECT id FROM jobs WHERE collection = 'jobs_compiled' AND id IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+                existing.update(doc_id for (doc_id,) in rows)
+
+        return existing
+
+    def upsert_jobs(self, writes):
+        """One transaction, one executemany for the whole run."""
+        rows = [
+            (collection, doc_id, json.dumps(job), job.get("date_added"), int(bool(job.get("sent", False))))
+            for collection, doc_id, job in writes
+        ]
+        counts = defaultdict(lambda: {"stored": 0, "failed": 0})
+
+        with self._lock, self.db:
+            self.db.executemany(UPSERT_SQL, rows)
+
+        for collection, _, _ in writes:
+            counts[collection]["stored"] += 1
+        return dict(counts)
+
+    # ✅ Emailing jobs
+
+    def unsent_jobs(self):
+        with self._lock:
+            rows = self.db.execute(
+                "SELECT id, data FROM jobs WHERE collection = 'jobs_compiled' AND sent = 0 ORDER BY date_added, id"
+            ).fetchall()
+        return [{**json.loads(data), "id": doc_id} for doc_id, data in rows]
+
+    def create_digest(self, digest_id, job_ids, created_at):
+        with self._lock, self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO outbox (id, job_ids, status, flipped, created_at) VALUES (?, ?, 'sending', 0, ?)",
+                (digest_id, json.dumps(job_ids), created_at),
+            )
+
+    def mark_digest_emailed(self, digest_id, sent_at):
+        with self._lock, self.db:
+            self.db.execute("UPDATE outbox SET status = 'sent', sent_at = ? WHERE id = ?", (sent_at, digest_id))
+
+    def discard_digest(self, digest_id):
+        with self._lock, self.db:
+            self.db.execute("DELETE FROM outbox WHERE id = ?", (digest_id,))
+
+    def mark_sent(self, digest_id):
+        """A single transaction flips every job and closes the digest, so there's nothing to resume."""
+        with self._lock, self.db:
+            (job_ids,) = self.db.execute("SELECT job_ids FROM outbox WHERE id = ?", (digest_id,)).fetchone()
+            job_ids = json.loads(job_ids)
+            self.db.executemany(
+                "UPDATE jobs SET sent = 1, digest_id = ?, "
+                "data = json_set(data, '$.sent', json('true'), '$.digest_id', ?) "
+                "WHERE collection = 'jobs_compiled' AND id = ?",
+                [(digest_id, digest_id, job_id) for job_id in job_ids],
+            )
+            self.db.execute(
+                "UPDATE outbox SET status = 'done', flipped = ? WHERE id = ?", (len(job_ids), digest_id)
+            )
+        return len(job_ids)
+
+    def pending_digests(self):
+        with self._lock:
+            rows = self.db.execute("SELECT id FROM outbox WHERE status IN ('sending', 'sent')").fetchall()
+        return [digest_id for (digest_id,) in rows]
@@ -1,45 +1,56 @@
 import os
+import time
 import hashlib
-import firebase_admin
-from firebase_admin import credentials, firestore
 from dotenv import load_dotenv
+import metrics
+from store import known_ids
+from store.backend import get_backend
 
 # ✅ Load environment variables
 load_dotenv()
 
-# ✅ Get Firebase credentials path
-FIREBASE_CREDENTIALS_PATH = os.getenv("FIREBASE_CREDENTIALS_PATH")
-
-if not FIREBASE_CREDENTIALS_PATH:
-    raise ValueError("❌ Missing FIREBASE_CREDENTIALS_PATH in environment variables. Please set it in the .env file.")
-
-# ✅ Prevent multiple Firebase initializations
-if not firebase_admin._apps:
-    cred = credentials.Certificate(FIREBASE_CREDENTIALS_PATH)
-    firebase_admin.initialize_app(cred)
-
-# ✅ Initialize Firestore
-db = firestore.client()
+# ✅ Streaming pipeline: write a micro-batch once it has this many jobs, or this long after its first job
+STORE_BATCH_SIZE = int(os.getenv("STORE_BATCH_SIZE", 50))
+STORE_FLUSH_SECONDS = float(os.getenv("STORE_FLUSH_SECONDS", 5))
 
 def generate_document_id(url):
     """Generate a Firestore-safe document ID from a job URL using MD5 hashing."""
     return hashlib.md5(url.encode()).hexdigest()
 
-def fetch_existing_job_ids():
-    """Fetches all stored job document IDs from the 'jobs_compiled' collection to skip duplicates."""
-    jobs_collection = db.collection("jobs_compiled").stream()
-    return {job.id for job in jobs_collection}  # Store existing job IDs in a set
+def fetch_existing_job_ids(doc_ids):
+    """
+    Returns which of `doc_ids` are already in 'jobs_compiled' (to skip duplicates).
+    Only this run's candidates are checked, so cost tracks the scraped jobs, not the collection size.
+    For remote backends, IDs in the local known-IDs cache aren't looked up again.
+    """
+    backend = get_backend()
+    doc_ids = set(doc_ids)
+    existing = known_ids.known(doc_ids) if backend.remote else set()
+    to_check = doc_ids - existing
+    with metrics.timer("storage_seconds", backend=backend.name, op="existing_ids"):
+        existing |= backend.existing_ids(to_check)
+    metrics.inc("storage_reads_total", len(to_check), backend=backend.name, op="existing_ids")
+
+    print(f"🔎 Checked {len(doc_ids)} jobs: {len(doc_ids) - len(to_check)} known locally, "
+          f"{len(to_check)} looked up, {len(existing)} already stored.")
+    if backend.remote:
+        known_ids.add(existing)
+    return existing
 
 def store_jobs(jobs_input):
-    """Stores job listings in Firestore while avoiding duplicates."""
+    """Stores job listings in the configured backend (STORAGE_BACKEND) while avoiding duplicates."""
+    started = time.perf_counter()
     # ✅ Ensure jobs are stored in a dictionary format
     jobs_dict = {"combined": jobs_input} if isinstance(jobs_input, list) else jobs_input
 
-    # ✅ Fetch existing jobs (so we can skip duplicates)
-    existing_job_ids = fetch_existing_job_ids()
+    # ✅ Check which of this run's jobs already exist (so we can skip duplicates)
+    existing_job_ids = fetch_existing_job_ids(
+        generate_document_id(job["url"]) for jobs in jobs_dict.values() for job in jobs
+    )
 
-    stored_count = 0
-    all_jobs = []  # Collect jobs for 'jobs_compiled' collection
+    source_writes = []  # Writes into each scraper's own collection
+    compiled_writes = []  # Writes into 'jobs_compiled'
+    seen = set()  # IDs queued in this call: the same URL can come back from several queries or sources
 
     for scraper_name, jobs in jobs_dict.items():
         print(f"🔍 Storing {len(jobs)} jobs from '{scraper_name}'...")
@@ -49,18 +60,72 @@ def store_jobs(jobs_input):
 
             if doc_id in existing_job_ids:
                 print(f"⚠️ Job already exists: {job.get('title', 'Unknown Title')} (Scraper: {scraper_name})")
+                metrics.inc("jobs_filtered_total", source=scraper_name, reason="already_stored")
                 continue  # Skip duplicate
 
-            # ✅ Store in individual scraper collection
-            db.collection(f"jobs_{scraper_name}").document(doc_id).set(job, merge=True)
-
-            # ✅ Also store in 'jobs_compiled'
-            all_jobs.append(job)
-            stored_count += 1
-
-    # ✅ Now store everything in 'jobs_compiled'
-    for job in all_jobs:
-        doc_id = generate_document_id(job["url"])
-        db.collection("jobs_compiled").document(doc_id).set(job, merge=True)
-
-    print(f"✅ {stored_count} new jobs stored in Firestore!")
\ No newline at end of file
+            if doc_id in seen:
+                metrics.inc("jobs_filtered_total", source=scraper_name, reason="duplicate")
+                continue  # Already queued from another query or source
+            seen.add(doc_id)
+
+            # ✅ Store in individual scraper collection and in 'jobs_compiled'
+            source_writes.append((f"jobs_{scraper_name}", doc_id, job))
+            # ✅ An explicit `sent: False` lets send_email query unsent jobs server-side
+            compiled_writes.append(("jobs_compiled", doc_id, {**job, "sent": False}))
+
+    # ✅ Bulk write (batched round trips for Firestore, one transaction for SQLite)
+    backend = get_backend()
+    with metrics.timer("storage_seconds", backend=backend.name, op="upsert_jobs"):
+        results = backend.upsert_jobs(source_writes + compiled_writes)
+
+    # ✅ Remember what's now stored, unless some writes failed (those must be looked up again)
+    if backend.remote:
+        if not any(counts["failed"] for counts in results.values()):
+            known_ids.add(doc_id for _, doc_id, _ in compiled_writes)
+        known_ids.save()
+
+    for collection, counts in sorted(results.items()):
+        metrics.inc("storage_writes_total", counts["stored"], backend=backend.name, op="upsert_jobs", collection=collection)
+        metrics.inc("storage_write_failures_total", counts["failed"], backend=backend.name, collection=collection)
+        failed = f", {counts['failed']} failed" if counts["failed"] else ""
+        print(f"📦 {collection}: {counts['stored']} stored{failed}")
+
+    stored_count = results.get("jobs_compiled", {}).get("stored", 0)
+    print(f"✅ {stored_count} new jobs stored ({backend.name})!")
+    metrics.observe("stage_seconds", time.perf_counter() - started, stage="store")
+    return results
+
+def store_stream(items, batch_size=STORE_BATCH_SIZE, flush_seconds=STORE_FLUSH_SECONDS):
+    """
+    Store (source, job) pairs as they arrive, in micro-batches through store_jobs, so the first
+    jobs are written within seconds and a crash only loses the current batch. `items` may yield
+    None when idle (see run_scrapers.stream_jobs) so a partial batch still goes out on time.
+    Returns the combined {collection: {stored, failed}} counts.
+    """
+    totals = {}
+    batch = {}
+    batch_count = 0
+    batch_started = None
+
+    def flush():
+        nonlocal batch, batch_count, batch_started
+        if batch_count:
+            print(f"💾 Storing a batch of {batch_count} jobs...")
+            for collection, counts in store_jobs(batch).items():
+                total = totals.setdefault(collection, {"stored": 0, "failed": 0})
+                total["stored"] += counts["stored"]
+                total["failed"] += counts["failed"]
+        batch, batch_count, batch_started = {}, 0, None
+
+    for item in items:
+        if item is not None:
+            source, job = item
+            batch.setdefault(source, []).append(job)
+            batch_count += 1
+            batch_started = batch_started or time.monotonic()
+
+        if batch_count >= batch_size or (batch_count and time.monotonic() - batch_started >= flush_seconds):
+            flush()
+
+    flush()
+    return totals
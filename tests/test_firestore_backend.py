@@ -0,0 +1,90 @@
+import os
+import sys
+
+# Add the parent directory (job_finder_bot) to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from google.api_core.exceptions import NotFound
+from store.firestore_backend import FirestoreBackend, OUTBOX_COLLECTION
+
+# ✅ Just enough of a Firestore client for mark_sent: documents, all-or-nothing update batches, keys-only get_all
+
+class FakeSnapshot:
+    def __init__(self, ref):
+        self.id = ref.id
+        self.exists = ref.path in ref.db.docs
+        self._data = ref.db.docs.get(ref.path)
+
+    def to_dict(self):
+        return dict(self._data) if self.exists else None
+
+class FakeRef:
+    def __init__(self, db, collection, doc_id):
+        self.db, self.id, self.path = db, doc_id, (collection, doc_id)
+
+    def get(self):
+        return FakeSnapshot(self)
+
+    def update(self, fields):
+        if self.path not in self.db.docs:
+            raise NotFound(f"No document to update: {self.path}")
+        self.db.docs[self.path].update(fields)
+
+class FakeCollection:
+    def __init__(self, db, name):
+        self.db, self.name = db, name
+
+    def document(self, doc_id):
+        return FakeRef(self.db, self.name, doc_id)
+
+class FakeBatch:
+    def __init__(self, db):
+        self.db, self.updates = db, []
+
+    def update(self, ref, fields):
+        self.updates.append((ref, fields))
+
+    def commit(self):
+        for ref, _ in self.updates:
+            if ref.path not in self.db.docs:
+                raise NotFound(f"No document to update: {ref.path}")
+        for ref, fields in self.updates:
+            ref.update(fields)
+
+class FakeDB:
+    def __init__(self):
+        self.docs = {}
+
+    def collection(self, name):
+        return FakeCollection(self, name)
+
+    def batch(self):
+        return FakeBatch(self)
+
+    def get_all(self, refs, field_paths=None):
+        return [ref.get() for ref in refs]
+
+def _backend(job_ids, stored):
+    backend = FirestoreBackend.__new__(FirestoreBackend)  # ✅ Skip __init__: no credentials or network
+    backend.db = FakeDB()
+    for job_id in stored:
+        backend.db.docs[("jobs_compiled", job_id)] = {"sent": False}
+    backend.db.docs[(OUTBOX_COLLECTION, "digest")] = {"job_ids": job_ids, "status": "sent", "flipped": 0}
+    return backend
+
+def test_mark_sent_flips_every_job():
+    backend = _backend(["a", "b"], stored=["a", "b"])
+
+    assert backend.mark_sent("digest") == 2
+    assert backend.db.docs[("jobs_compiled", "a")] == {"sent": True, "digest_id": "digest"}
+    assert backend.db.docs[(OUTBOX_COLLECTION, "digest")]["status"] == "done"
+
+def test_mark_sent_skips_jobs_deleted_after_the_digest_was_created():
+    backend = _backend(["a", "deleted", "c"], stored=["a", "c"])
+
+    assert backend.mark_sent("digest") == 2
+    assert backend.db.docs[("jobs_compiled", "a")]["sent"] is True
+    assert backend.db.docs[("jobs_compiled", "c")]["sent"] is True
+    assert ("jobs_compiled", "deleted") not in backend.db.docs  # ✅ Not recreated as a stub
+    digest = backend.db.docs[(OUTBOX_COLLECTION, "digest")]
+    assert (digest["status"], digest["flipped"]) == ("done", 3)
@@ -0,0 +1,82 @@
+import os
+import sys
+
+# Add the parent directory (job_finder_bot) to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fetch import keyword_matcher
+
+# ✅ Keyword lists chosen to trip up the trie regex: overlaps, shared prefixes, case and regex metacharacters
+KEYWORD_SETS = [
+    ["designer", "design", "product designer", "ux designer"],
+    ["data", "data journalist", "data visualisation", "journalist"],
+    ["ui", "ui/ux", "c++", "c#", ".net", "node.js", "(remote)", "a.b", "[senior]", "r&d", "$100k"],
+    ["Video Producer", "VIDEO", "producer"],
+    ["abc", "ab", "bcd", "b"],
+    ["senior", "seniority"],
+    ["x"],
+    [],
+]
+
+TITLES = [
+    "",
+    "Product Designer",
+    "Senior UX/UI Designer",
+    "UI/UX Lead",
+    "Designers wanted",
+    "Graphic Design Intern",
+    "Data Journalist (Remote)",
+    "Head of Data",
+    "Dat a Analyst",
+    "C++ Engineer",
+    "C# / .NET Developer",
+    "Senior Node.js Developer",
+    "Node-js developer",
+    "axb",
+    "a.b testing",
+    "[Senior] Editor",
+    "Senior Editor",
+    "Seniority Manager",
+    "R&D Scientist",
+    "$100k+ role",
+    "VIDEO PRODUCER",
+    "video-producer",
+    "abcd",
+    "zzab",
+    "Journalism Fellow",
+    "Ünïcödé Designer",
+    "Nothing relevant here",
+]
+
+def naive_matches(keywords, title):
+    """The scrapers' old check, which the matcher replaced."""
+    return any(keyword.lower() in title.lower() for keyword in keywords)
+
+def test_substring_matcher_agrees_with_naive_check():
+    for keywords in KEYWORD_SETS:
+        matcher = keyword_matcher.KeywordMatcher(keywords)
+        for title in TITLES:
+            assert matcher.matches(title) == naive_matches(keywords, title), (keywords, title)
+
+def test_find_returns_a_configured_keyword_present_in_the_title():
+    for keywords in KEYWORD_SETS:
+        matcher = keyword_matcher.KeywordMatcher(keywords)
+        for title in TITLES:
+            found = matcher.find(title)
+            if found is not None:
+                assert found in keywords and found.lower() in title.lower(), (keywords, title, found)
+
+def test_find_all_lists_each_keyword_once():
+    matcher = keyword_matcher.KeywordMatcher(["data", "journalist"])
+    assert matcher.find_all("Data Journalist, data desk") == ["data", "journalist"]
+
+def test_word_mode_needs_whole_words():
+    matcher = keyword_matcher.KeywordMatcher(["senior", "c++"], mode=keyword_matcher.WORD)
+    assert matcher.matches("Senior Editor")
+    assert matcher.matches("C++ Engineer")
+    assert not matcher.matches("Seniority Manager")
+
+def test_exact_mode_needs_the_whole_title():
+    matcher = keyword_matcher.KeywordMatcher(["Product Designer"], mode=keyword_matcher.EXACT)
+    assert matcher.matches("product designer")
+    assert not matcher.matches("Senior Product Designer")
@@ -0,0 +1,27 @@
+import os
+import sys
+
+# Add the parent directory (job_finder_bot) to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import profiling
+from fetch import deadline
+
+def _stack_in(module):
+    """A function defined as if in `module` that returns its own stack (innermost frame first)."""
+    namespace = {"__name__": module, "sys": sys}
+    exec("def current_stack():\n"
+         "    frames, frame = [], sys._getframe()\n"
+         "    while frame is not None:\n"
+         "        frames.append(frame)\n"
+         "        frame = frame.f_back\n"
+         "    return frames\n", namespace)
+    return namespace["current_stack"]
+
+def test_work_under_deadline_propagate_keeps_its_stage():
+    # ✅ Browser pool tasks and async LinkedIn requests all run inside deadline.propagate
+    assert profiling._stage(deadline.propagate(_stack_in("selenium.webdriver.remote.webdriver"))()) == "webdriver"
+    assert profiling._stage(deadline.propagate(_stack_in("urllib3.connectionpool"))()) == "http"
+
+def test_rate_limiter_waits_are_throttle():
+    assert profiling._stage(deadline.propagate(_stack_in("fetch.rate_limiter"))()) == "throttle"
@@ -0,0 +1,61 @@
+import os
+import sys
+
+# Add the parent directory (job_finder_bot) to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+from datetime import datetime, timedelta
+import fetch
+from fetch import http_cache, high_water, replay
+
+# ✅ Synthetic fixtures, not captures of linkedin.com: saved through SCRAPER_TRANSPORT=record from pages cut out of
+#    benchmarks/samples/linkedin.html, at the URLs the query planner builds for config.JOB_KEYWORDS in London.
+#    The first merged query has two pages, the second one page that shares ten listings with the first's page 2.
+RECORDINGS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "recordings")
+
+@pytest.fixture
+def replaying(monkeypatch):
+    """Replay mode against the committed recordings, with the caches that would make runs differ turned off."""
+    monkeypatch.setattr(replay, "MODE", "replay")
+    monkeypatch.setattr(replay, "FIXTURE_DIR", RECORDINGS)
+    monkeypatch.setattr(replay, "REPLAY_TODAY", None)
+    monkeypatch.setattr(http_cache, "ENABLED", False)
+    monkeypatch.setattr(high_water, "ENABLED", False)
+    replay._recorded_at.cache_clear()
+    yield
+    replay._recorded_at.cache_clear()
+
+def _replay_linkedin():
+    jobs = fetch.scraper("linkedin")()  # ✅ The production path: planned, merged queries run concurrently
+    return [{key: value for key, value in job.items() if key != "date_added"} for job in jobs]
+
+def test_replay_is_pinned_to_the_recording_date(replaying):
+    assert replay.today() == datetime(2026, 10, 18, 7, 33, 48)
+
+def test_linkedin_replays_offline(replaying):
+    jobs = _replay_linkedin()
+
+    assert jobs
+    assert all("London" in job["location"] for job in jobs)
+    assert all(job["date_posted"] >= "2026-10-04" for job in jobs)  # ✅ 14 days before the recording
+    assert len({job["url"] for job in jobs}) == len(jobs)  # ✅ The two queries' shared listings are kept once
+
+    # ✅ Concurrent queries may claim a shared listing in either order, so compare as sets
+    def by_url(jobs):
+        return sorted(jobs, key=lambda job: job["url"])
+    assert by_url(jobs) == by_url(_replay_linkedin())
+
+def test_linkedin_replay_does_not_depend_on_the_real_clock(replaying, monkeypatch):
+    jobs = _replay_linkedin()
+
+    # ✅ Pinning "today" to the recording date explicitly gives the same jobs...
+    monkeypatch.setattr(replay, "REPLAY_TODAY", "2026-10-18")
+    replay._recorded_at.cache_clear()
+    assert [job["url"] for job in _replay_linkedin()] == [job["url"] for job in jobs]
+
+    # ✅ ...while a month later the dated listings fall outside the 14-day window
+    later = (datetime(2026, 10, 18) + timedelta(days=30)).strftime("%Y-%m-%d")
+    monkeypatch.setattr(replay, "REPLAY_TODAY", later)
+    replay._recorded_at.cache_clear()
+    assert len(_replay_linkedin()) < len(jobs)
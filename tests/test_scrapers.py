@@ -7,7 +7,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from fetch.ifyoucould import fetch_ifyoucould_jobs
 from fetch.unjobs import fetch_unjobs
 from fetch.workable import fetch_workable_jobs
-from store.store_jobs import store_jobs
+from fetch import replay
 
 def test_all_scrapers():
     all_jobs = []
@@ -27,8 +27,11 @@ def test_all_scrapers():
     print(f"✅ {len(workable_jobs)} jobs found.")
     all_jobs.extend(workable_jobs)
 
-    # Store jobs in Firestore
-    if all_jobs:
+    # Store jobs in Firestore (never when replaying recorded fixtures offline)
+    if replay.replaying():
+        print(f"\n📼 Replay mode: {len(all_jobs)} jobs parsed from fixtures, skipping Firestore.")
+    elif all_jobs:
+        from store.store_jobs import store_jobs
         print(f"\n💾 Storing {len(all_jobs)} total jobs in Firestore...")
         store_jobs(all_jobs)
     else: